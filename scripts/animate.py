@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Animated avatars for legendary and rare traits
+Generators list the traits that have per-frame variants (laser eyes, the
+halo, the glitch and matrix backgrounds). Each frame re-composites only the
+region those layers can touch on top of a cached static render, and the
+loop is written as APNG or GIF, whose encoders store just the rectangle
+that differs from the previous frame
+"""
+
+from functools import lru_cache
+from math import lcm
+import importlib
+import json
+import os
+
+from build_assets import GENERATORS
+from generate_random_punks import (
+    BACKGROUNDS,
+    LAYER_ORDER,
+    OUTPUT_DIR,
+    SIZE,
+    composite_layers,
+    create_canvas,
+    load_layer,
+)
+from layer_store import OPAQUE_CATEGORIES
+from lazy_import import lazy_import
+from rasterizer import Grid
+
+argparse = lazy_import('argparse')
+
+ANIMATED_DIR = os.path.join(OUTPUT_DIR, 'animated')
+
+# Delay between frames
+FRAME_MS = 120
+
+@lru_cache(maxsize=None)
+def animations():
+    """{(category, filename): (draw function, args, frames)} for every animated trait"""
+    found = {}
+    for module_name in GENERATORS:
+        module = importlib.import_module(module_name)
+        if not hasattr(module, 'animations'):
+            continue
+        category = os.path.basename(module.OUTPUT_DIR)
+        for filename, func, args, frames in module.animations():
+            found[(category, filename)] = (func, args, frames)
+    return found
+
+@lru_cache(maxsize=256)
+def frame_sprite(category, filename, frame):
+    """Return (image, (x, y)) for one frame of an animated trait, or None if empty
+
+    Cropped to the visible area like every other layer; treat as read-only.
+    """
+    func, args, frames = animations()[(category, filename)]
+    img = func(*args, frame=frame % frames)
+    img = img.to_image() if isinstance(img, Grid) else img.convert('RGBA')
+    if category in OPAQUE_CATEGORIES:
+        return img, (0, 0)
+    bbox = img.getbbox()
+    return (img.crop(bbox), bbox[:2]) if bbox else None
+
+def paint_order(metadata):
+    """(category, filename) of every layer of a punk, bottom to top"""
+    traits = metadata['traits']
+    return ([('backgrounds', metadata['background']), ('base', metadata['base'])] +
+            [(category, traits[category]) for category in LAYER_ORDER if traits.get(category)])
+
+def animated_layers(metadata):
+    """The layers of a punk that have per-frame variants"""
+    return [key for key in paint_order(metadata) if key in animations()]
+
+def layer_box(layer):
+    """Canvas rectangle covered by the visible pixels of a (image, (x, y)) layer"""
+    img, (x, y) = layer
+    bbox = img.getbbox()
+    if bbox is None:
+        return None
+    return (x + bbox[0], y + bbox[1], x + bbox[2], y + bbox[3])
+
+def changing_region(metadata, source=None):
+    """Bounding box of every pixel an animated layer can touch, in any frame"""
+    boxes = []
+    for key in animated_layers(metadata):
+        frames = animations()[key][2]
+        layers = [load_layer(*key, source)] + [frame_sprite(*key, f) for f in range(frames)]
+        boxes += [layer_box(layer) for layer in layers if layer]
+    boxes = [box for box in boxes if box]
+    if not boxes:
+        return None
+    return (max(0, min(b[0] for b in boxes)), max(0, min(b[1] for b in boxes)),
+            min(SIZE, max(b[2] for b in boxes)), min(SIZE, max(b[3] for b in boxes)))
+
+def render_frames(metadata, source=None):
+    """Every frame of a punk's animation loop (one frame if nothing in it moves)"""
+    background = metadata['background']
+    bg_filename, bg_color = (None, background) if background in BACKGROUNDS else (background, None)
+    static = composite_layers(metadata['base'], metadata['traits'], bg_filename=bg_filename,
+                              bg_color=bg_color, source=source)
+    moving = animated_layers(metadata)
+    region = changing_region(metadata, source)
+    if region is None:
+        return [static]
+
+    count = lcm(*(animations()[key][2] for key in moving))
+    rx, ry, rx1, ry1 = region
+    stack = paint_order(metadata)
+    canvas = None if stack[0] in moving else create_canvas(bg_filename, bg_color, source)
+    # Static layers are the same in every frame; fetch the ones inside the region once
+    still = {}
+    for key in stack[1:]:
+        layer = None if key in moving else load_layer(*key, source)
+        box = layer_box(layer) if layer else None
+        if box and box[0] < rx1 and box[2] > rx and box[1] < ry1 and box[3] > ry:
+            still[key] = layer
+
+    frames = []
+    for frame in range(count):
+        if canvas is None:
+            patch = frame_sprite(*stack[0], frame)[0].crop(region)
+        else:
+            patch = canvas.crop(region)
+        for key in stack[1:]:
+            layer = frame_sprite(*key, frame) if key in moving else still.get(key)
+            if layer:
+                img, (x, y) = layer
+                patch.paste(img, (x - rx, y - ry), img)
+        img = static.copy()
+        img.paste(patch, (rx, ry))
+        frames.append(img)
+    return frames
+
+def save_animation(frames, path, duration=FRAME_MS):
+    """Write frames as APNG (.png) or GIF (.gif), or a plain PNG for one frame
+
+    Both encoders compare each frame with the previous one and store only
+    the rectangle that changed.
+    """
+    fmt = 'GIF' if path.lower().endswith('.gif') else 'PNG'
+    if fmt == 'GIF':
+        # Avatars are opaque; RGB avoids GIF's single-color transparency
+        frames = [frame.convert('RGB') for frame in frames]
+    if len(frames) == 1:
+        frames[0].save(path, format=fmt)
+        return
+    frames[0].save(path, format=fmt, save_all=True, append_images=frames[1:],
+                   duration=duration, loop=0)
+
+def main(ids=None, fmt='apng', metadata_path=os.path.join(OUTPUT_DIR, 'metadata.json')):
+    with open(metadata_path) as f:
+        punks = json.load(f)
+    if ids:
+        punks = [punk for punk in punks if punk['id'] in ids]
+    else:
+        punks = [punk for punk in punks if animated_layers(punk)]
+
+    print(f"Animating {len(punks)} punks ({fmt})...")
+    os.makedirs(ANIMATED_DIR, exist_ok=True)
+    ext = 'gif' if fmt == 'gif' else 'png'
+    for punk in punks:
+        frames = render_frames(punk)
+        filename = f"punk_{punk['id']:04d}.{ext}"
+        path = os.path.join(ANIMATED_DIR, filename)
+        save_animation(frames, path)
+        moving = ', '.join(name for _, name in animated_layers(punk)) or 'static'
+        print(f"  ✓ {filename} - {len(frames)} frames, {os.path.getsize(path) / 1024:.1f} KB ({moving})")
+
+    print(f"\nDone! Animations saved to {ANIMATED_DIR}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Write animated versions of generated punks')
+    parser.add_argument('ids', nargs='*', type=int,
+                        help='punk IDs to animate (default: every punk with an animated trait)')
+    parser.add_argument('--format', choices=['apng', 'gif'], default='apng')
+    parser.add_argument('--metadata', default=os.path.join(OUTPUT_DIR, 'metadata.json'),
+                        help='metadata.json written by generate_random_punks')
+    args = parser.parse_args()
+    main(args.ids, fmt=args.format, metadata_path=args.metadata)
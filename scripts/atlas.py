@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Sprite-sheet atlas of every trait layer
+Packs each cropped trait sprite into one texture with a JSON index giving
+its rect, anchor offset on the 256x256 canvas, category and rarity, so the
+whole catalog loads with a single PNG decode
+"""
+
+import json
+import os
+
+from layer_store import LayerCache
+from lazy_import import lazy_import
+
+argparse = lazy_import('argparse')
+Image = lazy_import('PIL.Image')
+
+ATLAS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces')
+ATLAS_IMAGE = 'atlas.png'
+ATLAS_INDEX = 'atlas.json'
+ATLAS_VERSION = 1
+
+# Same categories as generate_random_punks.load_catalog()
+CATEGORIES = ['backgrounds', 'base', 'eyes', 'hair', 'eyewear', 'headwear', 'mouth', 'accessories']
+
+# Atlas width; sprites are at most 256 wide so shelves hold several each
+WIDTH = 2048
+
+# Transparent gap around each sprite so filtered sampling never bleeds
+PADDING = 1
+
+def pack_shelves(sizes, width=WIDTH, padding=PADDING):
+    """Shelf-pack (w, h) sizes, tallest first; returns ([(x, y), ...], height)"""
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        w, h = sizes[i][0] + padding * 2, sizes[i][1] + padding * 2
+        if x + w > width:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        positions[i] = (x + padding, y + padding)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions, y + shelf_height
+
+def build_atlas(source, categories=CATEGORIES, width=WIDTH):
+    """Pack every sprite of a layer source into (atlas image, index dict)"""
+    entries = []
+    sprites = []
+    for category in categories:
+        for trait in source.traits(category):
+            layer = source.sprite(category, trait['filename'])
+            entries.append((category, trait, layer))
+            if layer:
+                sprites.append(layer[0])
+
+    positions, height = pack_shelves([img.size for img in sprites], width)
+    atlas = Image.new('RGBA', (width, max(height, 1)), (0, 0, 0, 0))
+    for img, position in zip(sprites, positions):
+        atlas.paste(img, position)
+
+    index = {category: [] for category in categories}
+    placed = iter(zip(sprites, positions))
+    for category, trait, layer in entries:
+        entry = {'filename': trait['filename'], 'rarity': trait['rarity'], 'weight': trait['weight']}
+        if layer:
+            img, (x, y) = next(placed)
+            entry['rect'] = [x, y, img.width, img.height]
+            entry['offset'] = list(layer[1])
+        else:
+            # Traits with no visible pixels stay in the catalog but have no rect
+            entry['rect'] = None
+            entry['offset'] = [0, 0]
+        index[category].append(entry)
+
+    return atlas, {
+        'version': ATLAS_VERSION,
+        'image': ATLAS_IMAGE,
+        'size': [atlas.width, atlas.height],
+        'sprites': index,
+    }
+
+def save_atlas(atlas, index, out_dir=ATLAS_DIR):
+    """Write the atlas PNG and its JSON index, returning the index path"""
+    os.makedirs(out_dir, exist_ok=True)
+    atlas.save(os.path.join(out_dir, index['image']), optimize=True)
+    index_path = os.path.join(out_dir, ATLAS_INDEX)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+def load_atlas(index_path=os.path.join(ATLAS_DIR, ATLAS_INDEX)):
+    """Load the whole trait catalog from an atlas as a LayerCache (one decode)"""
+    with open(index_path) as f:
+        index = json.load(f)
+    if index.get('version') != ATLAS_VERSION:
+        raise ValueError(f"unsupported atlas version: {index.get('version')}")
+    atlas = Image.open(os.path.join(os.path.dirname(index_path), index['image']))
+    atlas = atlas.convert('RGBA')
+
+    catalog = {}
+    sprites = {}
+    for category, entries in index['sprites'].items():
+        catalog[category] = sorted(
+            ({'filename': e['filename'], 'rarity': e['rarity'], 'weight': e['weight']} for e in entries),
+            key=lambda t: t['filename'])
+        for e in entries:
+            if e['rect']:
+                x, y, w, h = e['rect']
+                sprites[(category, e['filename'])] = (atlas.crop((x, y, x + w, y + h)), tuple(e['offset']))
+    return LayerCache(catalog, sprites)
+
+def main(out_dir=ATLAS_DIR, from_code=False):
+    # Imported here because generate_random_punks imports this module
+    from generate_random_punks import ASSETS_DIR, load_catalog
+    from sprite_registry import SpriteRegistry
+
+    print("Building trait atlas...")
+    source = SpriteRegistry() if from_code else LayerCache.load(ASSETS_DIR, load_catalog())
+    atlas, index = build_atlas(source)
+    index_path = save_atlas(atlas, index, out_dir)
+
+    count = sum(1 for entries in index['sprites'].values() for e in entries if e['rect'])
+    packed = sum(e['rect'][2] * e['rect'][3] for entries in index['sprites'].values()
+                 for e in entries if e['rect'])
+    print(f"  {count} sprites in {atlas.width}x{atlas.height} "
+          f"({packed / (atlas.width * atlas.height):.0%} used)")
+    print(f"\nDone! Atlas saved to {index_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Pack all trait layers into one sprite sheet')
+    parser.add_argument('--out', default=ATLAS_DIR, help='output directory')
+    parser.add_argument('--from-code', action='store_true',
+                        help='draw the layers from the generator scripts instead of asset files')
+    args = parser.parse_args()
+    main(args.out, from_code=args.from_code)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Audit stored avatars against re-renders from their traits
+Streams an export of the avatars table (JSON lines with at least id,
+traits and image_data, base64 of a PNG or of the avatar_codec encoding)
+and re-renders every row on a process pool. A row passes when the stored
+image and the re-render have the same RGBA pixels, so a clean audit shows
+image_data can be dropped and avatars rendered on read. Export with e.g.
+
+  psql "$DATABASE_URL" -Atc "SELECT row_to_json(a) FROM avatars a" > avatars.jsonl
+"""
+
+from collections import deque
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+
+from avatar_codec import load
+from fingerprint import fingerprint, to_hex
+from generate_random_punks import ASSETS_DIR, composite_metadata, load_catalog
+from layer_store import SharedLayerStore
+from lazy_import import lazy_import
+from render_worker import traits_metadata
+
+Image = lazy_import('PIL.Image')
+argparse = lazy_import('argparse')
+futures = lazy_import('concurrent.futures')
+np = lazy_import('numpy')
+
+# Rows in flight per worker; bounds memory however large the export is
+WINDOW = 16
+
+def pixel_hash(pixels):
+    return hashlib.sha256(pixels.tobytes()).hexdigest()
+
+def rgba(img):
+    return np.asarray(img if img.mode == 'RGBA' else img.convert('RGBA'))
+
+# Layer store attached once by each pool worker
+_worker_store = None
+
+def _init_worker(store_handle):
+    global _worker_store
+    _worker_store = SharedLayerStore.attach(store_handle)
+
+def audit_row(line):
+    """Compare one exported row with its re-render; returns a small result dict"""
+    row = json.loads(line)
+    result = {'id': row.get('id')}
+    try:
+        stored = load(base64.b64decode(row['image_data']), _worker_store)
+        stored_pixels = rgba(stored)
+        rendered_pixels = rgba(composite_metadata(traits_metadata(row['traits'], _worker_store),
+                                                  _worker_store))
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+        return result
+    result['match'] = pixel_hash(stored_pixels) == pixel_hash(rendered_pixels)
+    if not result['match']:
+        result['traits'] = row['traits']
+        if stored_pixels.shape != rendered_pixels.shape:
+            result['detail'] = f'size {stored_pixels.shape[1::-1]} vs {rendered_pixels.shape[1::-1]}'
+        else:
+            diff = np.abs(stored_pixels.astype(np.int16) - rendered_pixels.astype(np.int16))
+            result['detail'] = (f'{int(diff.any(axis=2).sum())} pixels differ, '
+                                f'max channel delta {int(diff.max())}')
+        # Equal fingerprints mean the difference is invisible on the logical grid
+        result['same_fingerprint'] = (to_hex(fingerprint(Image.fromarray(stored_pixels))) ==
+                                      to_hex(fingerprint(Image.fromarray(rendered_pixels))))
+    return result
+
+def audit(lines, workers):
+    """Yield audit results in input order, keeping at most workers * WINDOW rows in flight"""
+    store = SharedLayerStore.create(ASSETS_DIR, load_catalog())
+    try:
+        with futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(store.handle,)) as pool:
+            pending = deque()
+            for line in lines:
+                if not line.strip():
+                    continue
+                pending.append(pool.submit(audit_row, line))
+                if len(pending) >= workers * WINDOW:
+                    yield pending.popleft().result()
+            for future in pending:
+                yield future.result()
+    finally:
+        store.close()
+
+def main(dump_path, workers=None, report_path=None):
+    workers = workers or os.cpu_count()
+    counts = {'match': 0, 'mismatch': 0, 'error': 0}
+    report = open(report_path, 'w') if report_path else None
+    print(f"Auditing {dump_path} on {workers} workers...")
+    start = time.perf_counter()
+    with open(dump_path) as f:
+        for result in audit(f, workers):
+            if 'error' in result:
+                counts['error'] += 1
+                print(f"  ✗ {result['id']}: {result['error']}")
+            elif result['match']:
+                counts['match'] += 1
+                continue
+            else:
+                counts['mismatch'] += 1
+                visible = 'same fingerprint' if result['same_fingerprint'] else 'looks different'
+                print(f"  ≠ {result['id']}: {result['detail']} ({visible})")
+            if report:
+                report.write(json.dumps(result) + '\n')
+    if report:
+        report.close()
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+
+    print(f"\n{total} avatars in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f}/s): "
+          f"{counts['match']} match, {counts['mismatch']} differ, {counts['error']} could not be rendered")
+    return 0 if total and counts['match'] == total else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Re-render stored avatars from their traits and compare pixels')
+    parser.add_argument('dump', help='JSON lines export of the avatars table')
+    parser.add_argument('--workers', type=int, default=None, help='render processes (default: CPU count)')
+    parser.add_argument('--report', metavar='PATH', default=None,
+                        help='write every mismatch and error as JSON lines')
+    args = parser.parse_args()
+    sys.exit(main(args.dump, args.workers, args.report))
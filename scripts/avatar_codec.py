@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Compact binary encoding for composited avatars
+Avatars are block art, so the 256x256 canvas is fully described by its
+26x26 logical grid. The grid is stored as a palette plus run-length encoded
+palette indices in raster order, deflated, which usually comes to about
+130 bytes against about 1.2 KB for the PNG. Decoding expands the grid back
+to exactly the original pixels.
+
+Layout: format byte, grid size, block size, canvas size (uint16), flags
+(bit 0: palette is RGB because every color is opaque), palette length - 1,
+then raw deflate of the palette followed by (index, run length - 1) byte
+pairs.
+
+Patterned and procedural backgrounds are not block-aligned. Given the
+background the avatar was composited on (as metadata records it), those
+avatars are stored as the background reference (a length byte and the
+UTF-8 name after the header, then an 8-byte BLAKE2b digest of the
+background's RGBA pixels) plus the grid of the cells the base and traits
+cover; cells left transparent show the background, which is rendered
+again on decode. If the background no longer renders to the same pixels
+(rebuilt assets, a changed generator), decode raises ValueError instead of
+returning a different avatar. Anything else is stored as its PNG. Each
+form has its own format byte
+"""
+
+from functools import lru_cache
+import hashlib
+import io
+import random
+import statistics
+import struct
+import time
+import zlib
+
+from lazy_import import lazy_import
+from rasterizer import BLOCK, Grid
+
+argparse = lazy_import('argparse')
+Image = lazy_import('PIL.Image')
+np = lazy_import('numpy')
+
+FORMAT_GRID = 1
+FORMAT_PNG = 2
+FORMAT_LAYERED = 3
+
+HEADER = struct.Struct('>BBBHBB')
+
+OPAQUE = 1
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+DIGEST_SIZE = 8
+
+def _deflate(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+def encode_png(img):
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
+
+def background_canvas(background, source=None):
+    """The RGBA canvas a background reference stands for"""
+    # Imported here so importing the codec does not load the renderer
+    from generate_random_punks import background_canvas
+    canvas = background_canvas(background, source)
+    return canvas if canvas.mode == 'RGBA' else canvas.convert('RGBA')
+
+def background_digest(canvas):
+    """Short hash of a background canvas's RGBA pixels"""
+    return hashlib.blake2b(canvas.tobytes(), digest_size=DIGEST_SIZE).digest()
+
+def _pack_grid(fmt, cells, block, size, extra=b''):
+    """Header, extra bytes, then the deflated palette and runs for a grid of RGBA cells"""
+    colors, indices = np.unique(cells.reshape(-1, 4).view(np.uint32).ravel(), return_inverse=True)
+    if len(colors) > 256:
+        return None
+    palette = colors.view(np.uint8).reshape(-1, 4)
+    flags = OPAQUE if (palette[:, 3] == 255).all() else 0
+    if flags & OPAQUE:
+        palette = palette[:, :3]
+
+    # Runs of equal indices, split so each fits in a byte
+    indices = indices.ravel()
+    starts = np.flatnonzero(np.diff(indices, prepend=-1))
+    lengths = np.diff(starts, append=len(indices))
+    runs = bytearray()
+    for index, length in zip(indices[starts].tolist(), lengths.tolist()):
+        while length:
+            n = min(length, 256)
+            runs += bytes((index, n - 1))
+            length -= n
+
+    header = HEADER.pack(fmt, cells.shape[0], block, size, flags, len(colors) - 1)
+    return header + extra + _deflate(np.ascontiguousarray(palette).tobytes() + bytes(runs))
+
+def covered_cells(img, background, source=None, block=BLOCK):
+    """Grid of the cells a punk covers over its background, with every other cell transparent
+
+    None unless painting that grid over the background gives back exactly
+    the same pixels.
+    """
+    return _covered_cells(np.asarray(img.convert('RGBA')),
+                          np.asarray(background_canvas(background, source)), block)
+
+def _covered_cells(pixels, bg, block):
+    """covered_cells() for RGBA arrays of the avatar and its background"""
+    if bg.shape != pixels.shape:
+        return None
+    # Cells where any pixel differs from the background are covered by the punk
+    starts = np.arange(0, pixels.shape[0], block)
+    differs = (pixels != bg).any(axis=2)
+    covered = np.logical_or.reduceat(np.logical_or.reduceat(differs, starts, axis=0), starts, axis=1)
+    grid = Grid(len(starts))
+    grid.pixels[:] = pixels[::block, ::block]
+    grid.pixels[~covered] = 0
+    if (grid.pixels[covered, 3] == 0).any():
+        return None
+    # Exact only if every covered cell is a single color
+    under = cell_map(len(starts), block, pixels.shape[0])
+    restored = np.where(covered.ravel()[under], grid.pixels.reshape(-1, 4).view(np.uint32).ravel()[under],
+                        np.ascontiguousarray(bg).view(np.uint32).ravel())
+    if not np.array_equal(restored, np.ascontiguousarray(pixels).view(np.uint32).ravel()):
+        return None
+    return grid
+
+def _encode_layered(img, background, source, block):
+    """Background reference and digest plus the grid of covered cells, or None if that is not lossless"""
+    name = background.encode()
+    if len(name) > 255:
+        return None
+    canvas = background_canvas(background, source)
+    grid = _covered_cells(np.asarray(img.convert('RGBA')), np.asarray(canvas), block)
+    if grid is None:
+        return None
+    extra = bytes([len(name)]) + name + background_digest(canvas)
+    return _pack_grid(FORMAT_LAYERED, grid.pixels, block, img.width, extra)
+
+def encode(img, background=None, source=None, block=BLOCK):
+    """Pack a composited avatar
+
+    Block art with <= 256 colors is stored as its grid. Otherwise, given the
+    background it was composited on (a file, procedural spec or color name,
+    as metadata records it, looked up in source if given), it is stored as
+    that reference plus the grid of the cells the punk covers. Anything else
+    falls back to PNG.
+    """
+    try:
+        grid = Grid.from_image(img, block, strict=True)
+    except ValueError:
+        data = _encode_layered(img, background, source, block) if background else None
+    else:
+        data = _pack_grid(FORMAT_GRID, grid.pixels, block, img.width)
+    return data or bytes([FORMAT_PNG]) + encode_png(img)
+
+@lru_cache(maxsize=None)
+def cell_map(grid_size, block, size):
+    """Flat index of the grid cell under every canvas pixel, in raster order"""
+    cells = np.arange(size) // block
+    return (cells[:, None] * grid_size + cells[None, :]).ravel()
+
+def _unpack_grid(data, offset):
+    """(packed RGBA value of every cell, its cell_map, canvas size) for a grid stored after offset"""
+    _, grid_size, block, size, flags, colors = HEADER.unpack_from(data)
+    body = zlib.decompress(data[offset:], -15)
+    channels = 3 if flags & OPAQUE else 4
+    palette = np.frombuffer(body, np.uint8, (colors + 1) * channels).reshape(-1, channels)
+    if channels == 3:
+        palette = np.concatenate([palette, np.full((len(palette), 1), 255, np.uint8)], axis=1)
+    runs = np.frombuffer(body, np.uint8, offset=(colors + 1) * channels).reshape(-1, 2)
+    indices = np.repeat(runs[:, 0], runs[:, 1].astype(np.intp) + 1)
+    cells = np.ascontiguousarray(palette).view(np.uint32).ravel()[indices]
+    return cells, cell_map(grid_size, block, size), size
+
+def decode(data, source=None):
+    """Expand encoded bytes back to the full RGBA canvas
+
+    Layered avatars render their background again, from source if given,
+    and raise ValueError if it no longer has the pixels it was encoded on.
+    """
+    if data[0] == FORMAT_PNG:
+        img = Image.open(io.BytesIO(data[1:]))
+        return img if img.mode == 'RGBA' else img.convert('RGBA')
+    if data[0] == FORMAT_GRID:
+        cells, under, size = _unpack_grid(data, HEADER.size)
+        # One gather of packed RGBA values straight to canvas pixels
+        pixels = cells[under]
+    elif data[0] == FORMAT_LAYERED:
+        length = data[HEADER.size]
+        offset = HEADER.size + 1 + length
+        background = data[HEADER.size + 1:offset].decode()
+        canvas = background_canvas(background, source)
+        if background_digest(canvas) != data[offset:offset + DIGEST_SIZE]:
+            raise ValueError(f'background {background} has changed since the avatar was encoded')
+        cells, under, size = _unpack_grid(data, offset + DIGEST_SIZE)
+        bg = np.ascontiguousarray(canvas).view(np.uint32).ravel()
+        # Transparent cells (all four bytes zero) show the background
+        pixels = cells[under]
+        pixels = np.where(pixels == 0, bg, pixels)
+    else:
+        raise ValueError(f'unknown avatar encoding {data[0]}')
+    return Image.frombuffer('RGBA', (size, size), pixels, 'raw', 'RGBA', 0, 1)
+
+def load(data, source=None):
+    """An avatar image from either a PNG or this encoding"""
+    if data.startswith(PNG_SIGNATURE):
+        return Image.open(io.BytesIO(data))
+    return decode(data, source)
+
+def to_png(data, source=None):
+    """PNG bytes for encoded data (stored PNGs are returned as they are)"""
+    if data[0] == FORMAT_PNG:
+        return data[1:]
+    return encode_png(decode(data, source))
+
+def main(count=500, seed=None, unique_backgrounds=False):
+    from generate_random_punks import ASSETS_DIR, generate_punk, load_catalog
+    from layer_store import LayerCache
+
+    source = LayerCache.load(ASSETS_DIR, load_catalog())
+    rng = random.Random(seed)
+    sizes, png_sizes, encode_times, decode_times = [], [], [], []
+    formats = {FORMAT_GRID: 0, FORMAT_LAYERED: 0, FORMAT_PNG: 0}
+    print(f"Encoding {count} random punks...")
+    for punk_id in range(count):
+        img, metadata = generate_punk(punk_id=rng.getrandbits(64) if unique_backgrounds else None,
+                                      source=source, rng=rng, unique_background=unique_backgrounds)
+        start = time.perf_counter()
+        data = encode(img, metadata['background'], source)
+        encode_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        decoded = decode(data, source)
+        decode_times.append(time.perf_counter() - start)
+        if decoded.tobytes() != img.convert('RGBA').tobytes():
+            raise SystemExit("decoded avatar differs from the original")
+        formats[data[0]] += 1
+        sizes.append(len(data))
+        png_sizes.append(len(encode_png(img)))
+
+    print(f"  {statistics.mean(sizes):.0f} bytes on average (max {max(sizes)}), "
+          f"against {statistics.mean(png_sizes):.0f} for PNG and "
+          f"{statistics.mean(png_sizes) * 4 / 3:.0f} for base64 PNG")
+    print(f"  encode {statistics.median(encode_times) * 1e6:.0f} µs, "
+          f"decode {statistics.median(decode_times) * 1e6:.0f} µs (median)")
+    print(f"  every avatar decoded to identical pixels; {formats[FORMAT_GRID]} stored as a grid, "
+          f"{formats[FORMAT_LAYERED]} over a background reference, {formats[FORMAT_PNG]} as PNG")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the compact avatar encoding')
+    parser.add_argument('count', nargs='?', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--unique-backgrounds', action='store_true',
+                        help='composite onto procedural backgrounds instead of background files')
+    args = parser.parse_args()
+    main(args.count, args.seed, args.unique_backgrounds)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+On-demand procedural backgrounds
+A stable seed (e.g. derived from the avatar ID) picks a unique pattern
+instance, rendered on request and kept in an LRU keyed by
+(pattern, palette, seed) instead of being stored as thousands of files
+"""
+
+from functools import lru_cache
+import hashlib
+import re
+import time
+
+from generate_backgrounds import (
+    COLORS,
+    create_circuit,
+    create_constellation,
+    create_dots,
+    create_geometric,
+    create_glitch,
+    create_grid,
+    create_noise,
+    create_scanlines,
+    create_topographic,
+)
+from lazy_import import lazy_import
+
+argparse = lazy_import('argparse')
+
+# Pattern name -> (render function, rarity, palettes it is drawn in)
+PATTERNS = {
+    'circuit': (create_circuit, 'rare', ('dark', 'navy', 'green')),
+    'constellation': (create_constellation, 'rare', ('dark', 'navy', 'purple')),
+    'topographic': (create_topographic, 'rare', ('cream', 'blue', 'green')),
+    'glitch': (create_glitch, 'legendary', ('dark', 'black')),
+    'geometric': (create_geometric, 'uncommon', ('purple', 'blue', 'pink')),
+    'noise': (create_noise, 'common', ('gray', 'dark')),
+    'dots': (create_dots, 'common', ('cream', 'pink', 'blue')),
+    'grid': (create_grid, 'uncommon', ('gray', 'dark', 'cyan')),
+    'scanlines': (create_scanlines, 'uncommon', ('dark', 'navy', 'purple')),
+}
+
+# Same weights as generate_random_punks.RARITY_WEIGHTS
+RARITY_WEIGHTS = {
+    'common': 60,
+    'uncommon': 25,
+    'rare': 12,
+    'legendary': 3,
+}
+
+CACHE_SIZE = 512
+
+# Palettes may also be given directly as a hex color, e.g. '#1a1a2e' (hex_to_rgb drops the '#')
+HEX_COLOR = re.compile(r'#?[0-9a-fA-F]{6}')
+
+def seed_for(avatar_id):
+    """Stable 64-bit seed for an avatar ID (same in every process and run)"""
+    digest = hashlib.blake2b(str(avatar_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+def format_spec(pattern, palette, seed):
+    """Background spec string, e.g. 'circuit:dark:1234'"""
+    return f'{pattern}:{palette}:{seed}'
+
+def parse_spec(spec):
+    """Split a background spec into (pattern, palette, seed)
+
+    Raises ValueError for anything that could not be rendered.
+    """
+    parts = spec.split(':')
+    if len(parts) != 3:
+        raise ValueError(f'background spec must be pattern:palette:seed, got {spec!r}')
+    pattern, palette, seed = parts
+    if pattern not in PATTERNS:
+        raise ValueError(f'unknown background pattern: {pattern}')
+    if palette not in COLORS and not HEX_COLOR.fullmatch(palette):
+        raise ValueError(f'unknown background palette: {palette}')
+    if not (seed.isascii() and seed.isdigit()):
+        raise ValueError(f'background seed must be a non-negative integer: {seed}')
+    return pattern, palette, int(seed)
+
+def is_spec(name):
+    """True for procedural background specs (filenames never contain ':')"""
+    return ':' in name
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_background(pattern, palette, seed):
+    """Render (or fetch from the LRU) one background; treat the result as read-only"""
+    func, _, _ = PATTERNS[pattern]
+    color = COLORS.get(palette, palette)
+    return func(color, palette, seed=seed)
+
+def render_spec(spec):
+    """Render a background from its spec string"""
+    return render_background(*parse_spec(spec))
+
+def choose_background(seed):
+    """Pick a (pattern, palette, seed) for a seed, weighted by pattern rarity"""
+    # Derive independent choices from the seed without touching global random
+    h = hashlib.blake2b(seed.to_bytes(8, 'big'), digest_size=16).digest()
+    names = list(PATTERNS)
+    weights = [RARITY_WEIGHTS[PATTERNS[name][1]] for name in names]
+    pick = int.from_bytes(h[:8], 'big') % sum(weights)
+    for pattern, weight in zip(names, weights):
+        if pick < weight:
+            break
+        pick -= weight
+    palettes = PATTERNS[pattern][2]
+    palette = palettes[int.from_bytes(h[8:], 'big') % len(palettes)]
+    return pattern, palette, seed
+
+def background_for(avatar_id):
+    """Spec string of the unique background belonging to an avatar ID"""
+    return format_spec(*choose_background(seed_for(avatar_id)))
+
+def benchmark(count=200):
+    """Time cold renders for every pattern"""
+    print(f"Rendering {count} seeds per pattern (cold cache)...")
+    for pattern in PATTERNS:
+        palette = PATTERNS[pattern][2][0]
+        start = time.perf_counter()
+        for seed in range(count):
+            render_background.__wrapped__(pattern, palette, seed)
+        elapsed = (time.perf_counter() - start) / count
+        print(f"  {pattern:14s} {elapsed * 1000:6.3f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Procedural background engine')
+    parser.add_argument('avatar_ids', nargs='*', help='print the background spec for these IDs')
+    parser.add_argument('--bench', action='store_true', help='time every pattern')
+    parser.add_argument('--save', metavar='DIR', help='also save each background as a PNG in DIR')
+    args = parser.parse_args()
+    if args.bench:
+        benchmark()
+    for avatar_id in args.avatar_ids:
+        spec = background_for(avatar_id)
+        print(f"{avatar_id}: {spec}")
+        if args.save:
+            render_spec(spec).save(f"{args.save}/{spec.replace(':', '_')}.png")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the render library
+Imports each module in a fresh interpreter and reports the best of several
+runs, flagging any module over the budget. Bytecode is compiled up front so
+the numbers reflect a deployed server rather than a first run
+"""
+
+import argparse
+import compileall
+import os
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules a render server imports
+MODULES = [
+    'rasterizer',
+    'layer_store',
+    'frame_ring',
+    'sprite_registry',
+    'background_engine',
+    'generate_random_punks',
+    'composite',
+    'build_assets',
+]
+
+BUDGET_MS = 50
+
+PROBE = '''
+import time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+'''
+
+def import_time(module, runs=5):
+    """Best import time of module in milliseconds over several fresh interpreters"""
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                             cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+def main(modules=MODULES, runs=5, budget=BUDGET_MS):
+    compileall.compile_dir(SCRIPTS_DIR, maxlevels=0, quiet=1)
+    print(f"Import time, best of {runs} (budget {budget} ms):")
+    over = []
+    for module in modules:
+        ms = import_time(module, runs)
+        mark = '✓' if ms < budget else '✗'
+        print(f"  {mark} {module:24s} {ms:6.1f} ms")
+        if ms >= budget:
+            over.append(module)
+    return over
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure render library import times')
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=BUDGET_MS, help='milliseconds per module')
+    args = parser.parse_args()
+    sys.exit(1 if main(args.modules, args.runs, args.budget) else 0)
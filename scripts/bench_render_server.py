@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Local load test for the HTTP render service
+Starts render_server on a free port and drives it from keep-alive
+connections that each send requests back to back. Seeds are drawn from a
+fixed pool so some renders repeat, and a share of requests revalidate with
+the ETag of an earlier response. The same load runs twice, first against
+cold caches and then warm, reporting throughput and latency percentiles
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+async def fetch(reader, writer, path, etag=None):
+    """One GET on a keep-alive connection: (status, etag)"""
+    request = f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+    if etag:
+        request += f'If-None-Match: {etag}\r\n'
+    writer.write((request + '\r\n').encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode().partition(':')
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers.get('etag')
+
+async def client(host, port, count, seeds, revalidate, latencies, statuses, etags):
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(count):
+        seed = random.choice(seeds)
+        etag = etags.get(seed) if random.random() < revalidate else None
+        start = time.perf_counter()
+        status, etag = await fetch(reader, writer, f'/render/seed/{seed}', etag)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+        if etag:
+            etags[seed] = etag
+    writer.close()
+
+async def load_test(host, port, requests, concurrency, distinct, revalidate):
+    seeds = random.sample(range(1 << 30), distinct)
+    per_client = max(1, requests // concurrency)
+    for phase in ('cold', 'warm'):
+        latencies, statuses, etags = [], {}, {}
+        start = time.perf_counter()
+        await asyncio.gather(*(client(host, port, per_client, seeds, revalidate,
+                                      latencies, statuses, etags)
+                               for _ in range(concurrency)))
+        report(phase, latencies, statuses, concurrency, time.perf_counter() - start)
+
+def report(phase, latencies, statuses, concurrency, elapsed):
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"{phase}: {len(latencies)} requests over {concurrency} connections in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} req/s)")
+    print(f"  statuses: {', '.join(f'{code}: {n}' for code, n in sorted(statuses.items()))}")
+    print(f"  latency p50 {cuts[49] * 1000:.1f} ms, p90 {cuts[89] * 1000:.1f} ms, "
+          f"p99 {cuts[98] * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms")
+
+def main(requests=20000, concurrency=200, distinct=2000, revalidate=0.3, threads=None):
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, 'render_server.py'), '--port', '0']
+    if threads:
+        command += ['--threads', str(threads)]
+    server = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    try:
+        line = server.stderr.readline()
+        if 'http://' not in line:
+            raise SystemExit(f"render server failed to start: {line}{server.stderr.read()}")
+        host, port = line.rsplit('http://', 1)[1].strip().rsplit(':', 1)
+        print(f"Load testing {line.split()[-1]} ...")
+        asyncio.run(load_test(host, int(port), requests, concurrency, distinct, revalidate))
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load test the HTTP render service')
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--distinct', type=int, default=2000, help='size of the seed pool')
+    parser.add_argument('--revalidate', type=float, default=0.3,
+                        help='share of requests sent with If-None-Match')
+    parser.add_argument('--threads', type=int, default=None, help='server render threads')
+    args = parser.parse_args()
+    main(args.requests, args.concurrency, args.distinct, args.revalidate, args.threads)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Build every trait asset in one go
+Gathers the (draw function, args, output file) jobs from all generate_*
+scripts and renders them on a process pool, reporting per-job timing.
+Builds are incremental: a manifest records a hash of each output's inputs
+and only outputs whose inputs changed are rendered again
+"""
+
+from functools import lru_cache
+import hashlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import types
+
+from lazy_import import lazy_import
+from rasterizer import Grid
+
+argparse = lazy_import('argparse')
+futures = lazy_import('concurrent.futures')
+inspect = lazy_import('inspect')
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', '.build_manifest.json')
+MANIFEST_VERSION = 1
+
+# Generator modules, in the order they used to be run by hand
+GENERATORS = [
+    'generate_punk_faces',
+    'generate_eyes',
+    'generate_hair',
+    'generate_headwear',
+    'generate_mouth',
+    'generate_accessories',
+    'generate_eyewear',
+    'generate_facial_hair',
+    'generate_backgrounds',
+]
+
+def collect_jobs(generators=GENERATORS):
+    """Gather (output path, draw function, args) for every asset"""
+    all_jobs = []
+    for module_name in generators:
+        module = importlib.import_module(module_name)
+        for filename, func, args in module.jobs():
+            all_jobs.append((os.path.join(module.OUTPUT_DIR, filename), func, args))
+    return all_jobs
+
+def code_names(code):
+    """Global names referenced by a code object and any nested functions"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= code_names(const)
+    return names
+
+def is_local(value):
+    """True for functions and classes defined in this scripts directory"""
+    module = sys.modules.get(getattr(value, '__module__', None))
+    path = getattr(module, '__file__', None) or ''
+    return os.path.dirname(os.path.abspath(path)) == SCRIPTS_DIR
+
+SIMPLE_TYPES = (str, int, float, bool, tuple, list, dict, type(None))
+
+def dependency_hash(func, seen=None):
+    """Hash a function's source and default arguments plus every local helper, class and constant it uses"""
+    seen = set() if seen is None else seen
+    h = hashlib.sha256()
+    h.update(inspect.getsource(func).encode())
+    # Defaults are bound at definition time (e.g. size=GRID), so GRID never shows up in co_names
+    h.update(f'defaults={func.__defaults__!r} kwdefaults={func.__kwdefaults__!r}'.encode())
+    for name in sorted(code_names(func.__code__)):
+        key = (func.__module__, name)
+        if key in seen or name not in func.__globals__:
+            continue
+        seen.add(key)
+        value = getattr(func.__globals__[name], '__wrapped__', func.__globals__[name])
+        if isinstance(value, types.FunctionType) and is_local(value):
+            h.update(f'{name}:'.encode() + dependency_hash(value, seen).encode())
+        elif isinstance(value, type) and is_local(value):
+            # Classes (e.g. rasterizer.Grid): hash each method and what it uses
+            for attr in sorted(vars(value)):
+                method = vars(value)[attr]
+                if isinstance(method, (staticmethod, classmethod)):
+                    method = method.__func__
+                if isinstance(method, types.FunctionType):
+                    h.update(f'{name}.{attr}:'.encode() + dependency_hash(method, seen).encode())
+        elif isinstance(value, SIMPLE_TYPES):
+            h.update(f'{name}={value!r}'.encode())
+    return h.hexdigest()
+
+@lru_cache(maxsize=None)
+def runner_hash():
+    """Hash of run_job and what it uses, e.g. Grid.to_image for draw functions returning a Grid"""
+    return dependency_hash(run_job)
+
+def job_hash(func, args):
+    """Hash of everything an output depends on: draw function, helpers, args and the runner"""
+    return hashlib.sha256(f'{dependency_hash(func)}|{runner_hash()}|{args!r}'.encode()).hexdigest()
+
+def load_manifest(path=MANIFEST_PATH):
+    """Read the build manifest ({label: input hash}), empty if missing or stale"""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('outputs', {})
+
+def save_manifest(outputs, path=MANIFEST_PATH):
+    """Write the build manifest atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'outputs': outputs}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def run_job(path, func, args):
+    """Render one asset, returning (path, seconds, written)
+
+    The file is only rewritten when the encoded bytes actually differ, so
+    outputs whose pixels did not change keep their mtime.
+    """
+    start = time.perf_counter()
+    img = func(*args)
+    if isinstance(img, Grid):
+        img = img.to_image()
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    data = buf.getvalue()
+    written = True
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            written = f.read() != data
+    if written:
+        with open(path, 'wb') as f:
+            f.write(data)
+    return path, time.perf_counter() - start, written
+
+def label(path):
+    """Short category/filename label for a job"""
+    return os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+
+def build(generators=GENERATORS, workers=None, force=False):
+    """Render every stale asset from the given generators on a process pool"""
+    all_jobs = collect_jobs(generators)
+    for path in {os.path.dirname(path) for path, _, _ in all_jobs}:
+        os.makedirs(path, exist_ok=True)
+
+    manifest = {} if force else load_manifest()
+    hashes = {}
+    stale = []
+    for path, func, args in all_jobs:
+        key = label(path)
+        hashes[key] = job_hash(func, args)
+        if manifest.get(key) != hashes[key] or not os.path.exists(path):
+            stale.append((path, func, args))
+
+    print(f"Building {len(stale)} of {len(all_jobs)} assets from {len(generators)} generators...")
+    start = time.perf_counter()
+    timings = []
+    unchanged = 0
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = [pool.submit(run_job, path, func, args) for path, func, args in stale]
+        for future in futures.as_completed(pending):
+            path, seconds, written = future.result()
+            timings.append((seconds, path))
+            manifest[label(path)] = hashes[label(path)]
+            if written:
+                print(f"  ✓ {label(path)} ({seconds * 1000:.1f} ms)")
+            else:
+                unchanged += 1
+                print(f"  = {label(path)} ({seconds * 1000:.1f} ms, bytes unchanged)")
+    elapsed = time.perf_counter() - start
+    save_manifest(manifest)
+
+    total = sum(seconds for seconds, _ in timings)
+    print(f"\nDone! {len(timings)} assets in {elapsed:.2f}s "
+          f"({total:.2f}s of job time, {total / max(elapsed, 1e-9):.1f}x parallel)")
+    print(f"{len(all_jobs) - len(stale)} up to date, {unchanged} re-rendered without changes")
+    if timings:
+        print("Slowest jobs:")
+        for seconds, path in sorted(timings, reverse=True)[:5]:
+            print(f"  {seconds * 1000:8.1f} ms  {label(path)}")
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build all trait assets in parallel')
+    parser.add_argument('generators', nargs='*', default=GENERATORS,
+                        help='generator modules to run (default: all)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='process pool size (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the build manifest and render everything')
+    args = parser.parse_args()
+    build(args.generators, workers=args.workers, force=args.force)
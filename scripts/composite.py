@@ -3,12 +3,14 @@
 Composite punk layers together for preview
 """
 
-from PIL import Image
 import os
 
+from lazy_import import lazy_import
+
+Image = lazy_import('PIL.Image')
+
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'previews')
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # Background colors
 BACKGROUNDS = {
@@ -91,6 +93,7 @@ def composite_punk(base_name, eyes_name=None, hair_name=None, eyewear_name=None,
 
 def main():
     print("Creating preview composites...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     # Generate some sample combinations
     samples = [
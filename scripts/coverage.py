@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Per-layer coverage bitmasks on the logical grid
+Each layer gets two masks with one bit per grid cell: cells where any of
+its pixels show, and cells it paints fully opaque. A layer whose visible
+cells are all painted opaque by layers above it cannot affect the result,
+so the compositor can skip it
+"""
+
+from lazy_import import lazy_import
+from rasterizer import BLOCK, GRID, SIZE
+
+np = lazy_import('numpy')
+
+def pack(mask):
+    """Boolean grid as an int bitmask (bit order is irrelevant, only & and | are used)"""
+    return int.from_bytes(np.packbits(mask.ravel()).tobytes(), 'big')
+
+def cell_masks(img, origin):
+    """(visible, opaque) bitmasks for a layer image placed at origin on the canvas"""
+    span = GRID * BLOCK
+    x, y = origin
+    # Converting gives opaque modes a solid alpha and palette transparency a real one
+    img = img if img.mode == 'RGBA' else img.convert('RGBA')
+    alpha = np.asarray(img.getchannel('A'))[:SIZE - y, :SIZE - x]
+    placed = np.zeros((span, span), dtype=np.uint8)
+    placed[y:y + alpha.shape[0], x:x + alpha.shape[1]] = alpha
+    visible = placed.reshape(GRID, BLOCK, GRID, BLOCK).max(axis=(1, 3)) > 0
+    # Pixels past the canvas edge never show, so they count as covered
+    placed[SIZE:, :] = 255
+    placed[:, SIZE:] = 255
+    opaque = placed.reshape(GRID, BLOCK, GRID, BLOCK).min(axis=(1, 3)) == 255
+    return pack(visible), pack(opaque)
+
+def sprite_masks(sprites):
+    """(visible, opaque) bitmasks for every (image, origin) layer in a {key: layer} mapping"""
+    return {key: cell_masks(*layer) for key, layer in sprites.items()}
+
+def layer_masks(source, category, filename, layer):
+    """(visible, opaque) bitmasks of a loaded layer
+
+    Layer sources compute these once when they are built; layers loaded
+    from disk (source None) are measured as they come.
+    """
+    if source is not None:
+        return source.masks(category, filename)
+    return cell_masks(*layer)
+
+def visible_layers(source, stack):
+    """The ((category, filename), layer) entries of a bottom-to-top stack that can still be seen"""
+    kept = []
+    covered = 0
+    for entry in reversed(stack):
+        (category, filename), layer = entry
+        visible, opaque = layer_masks(source, category, filename, layer)
+        if visible & ~covered:
+            kept.append(entry)
+        covered |= opaque
+    kept.reverse()
+    return kept
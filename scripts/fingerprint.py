@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Rendered-pixel fingerprints for visual duplicate detection
+A fingerprint is a 64-bit hash of the composited logical grid (one pixel
+per block), so two trait tuples that render identically, e.g. when the
+headwear hides the hair, get the same value. FingerprintSet keeps millions
+of them in a sorted uint64 array at 8 bytes each
+"""
+
+import hashlib
+import os
+import threading
+
+from lazy_import import lazy_import
+from rasterizer import BLOCK
+
+np = lazy_import('numpy')
+
+def fingerprint(img, block=BLOCK):
+    """64-bit fingerprint of a rendered avatar
+
+    The first 8 bytes of SHA-256 over the RGBA cells sampled every block
+    pixels, which is easy to reproduce outside Python (server.js does).
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    cells = np.ascontiguousarray(np.asarray(img)[::block, ::block])
+    return int.from_bytes(hashlib.sha256(cells.tobytes()).digest()[:8], 'big')
+
+def to_hex(fp):
+    """Fixed-width hex form used in metadata"""
+    return f'{fp:016x}'
+
+class FingerprintSet:
+    """A set of fingerprints: a sorted uint64 array plus a small pending set
+
+    New fingerprints go into the pending set and are merged into the array
+    in batches, so adds stay cheap and lookups are a binary search. add()
+    holds a lock so check-and-insert is atomic across render threads.
+    """
+
+    # Pending fingerprints merged into the sorted array at a time
+    MERGE_AT = 4096
+
+    def __init__(self, fingerprints=()):
+        self._sorted = np.unique(np.asarray(fingerprints, dtype=np.uint64))
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sorted) + len(self._pending)
+
+    def __contains__(self, fp):
+        if fp in self._pending:
+            return True
+        i = np.searchsorted(self._sorted, np.uint64(fp))
+        return bool(i < len(self._sorted) and self._sorted[i] == fp)
+
+    def add(self, fp):
+        """Add a fingerprint; False if it was already present (a visual duplicate)"""
+        with self._lock:
+            if fp in self:
+                return False
+            self._pending.add(fp)
+            if len(self._pending) >= self.MERGE_AT:
+                self._merge()
+            return True
+
+    def _merge(self):
+        pending = np.fromiter(self._pending, dtype=np.uint64, count=len(self._pending))
+        self._sorted = np.union1d(self._sorted, pending)
+        self._pending.clear()
+
+    def save(self, path):
+        """Write the set as a .npy array atomically"""
+        with self._lock:
+            self._merge()
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, self._sorted)
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved set, or start an empty one if the file does not exist"""
+        if not os.path.exists(path):
+            return cls()
+        return cls(np.load(path))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared-memory frame slots for handing rendered punks back from pool workers
+Workers write finished frames into a preallocated slot and return only the
+slot index, so no image bytes are pickled across process boundaries
+"""
+
+
+from lazy_import import lazy_import
+
+Image = lazy_import('PIL.Image')
+shared_memory = lazy_import('multiprocessing.shared_memory')
+np = lazy_import('numpy')
+
+class FrameRing:
+    """A fixed ring of RGBA frame slots in one shared memory segment
+
+    The parent owns the slots: it hands a free slot index to each render job
+    and returns the slot to the free list once the frame has been encoded.
+    """
+
+    def __init__(self, shm, slots, size, owner=False):
+        self.shm = shm
+        self.slots = slots
+        self.size = size
+        self.owner = owner
+        self.frames = np.ndarray((slots, size, size, 4), dtype=np.uint8, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, slots, size=256):
+        """Allocate a new ring with the given number of slots"""
+        shm = shared_memory.SharedMemory(create=True, size=slots * size * size * 4)
+        return cls(shm, slots, size, owner=True)
+
+    @classmethod
+    def attach(cls, handle):
+        """Attach to a ring created in another process"""
+        name, slots, size = handle
+        return cls(shared_memory.SharedMemory(name=name), slots, size)
+
+    @property
+    def handle(self):
+        """Picklable (name, slots, size) tuple for attach()"""
+        return (self.shm.name, self.slots, self.size)
+
+    def write(self, slot, img):
+        """Copy a rendered RGBA image into a slot"""
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        self.frames[slot] = np.asarray(img)
+
+    def image(self, slot):
+        """Read-only image view of a slot (no copy)"""
+        return Image.frombuffer('RGBA', (self.size, self.size), self.frames[slot], 'raw', 'RGBA', 0, 1)
+
+    def close(self):
+        """Release the segment (and unlink it if this process created it)"""
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -4,265 +4,236 @@ Generate accessory trait layers for CryptoPunks-style faces
 256x256 with transparency - earrings, piercings, etc.
 """
 
-from PIL import Image, ImageDraw
 import os
 
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', 'accessories')
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-SIZE = 256
-BLOCK = 10
+from rasterizer import Grid
 
-def draw_block(draw, x, y, color, block_size=BLOCK):
-    """Draw a single pixel block"""
-    draw.rectangle([x * block_size, y * block_size, 
-                   (x + 1) * block_size - 1, (y + 1) * block_size - 1], 
-                  fill=color)
-
-def create_canvas():
-    return Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', 'accessories')
 
 # Ears are around x=7 (left) and x=18 (right), y=10-12
 
 def draw_earring_stud(color='#FFD700'):
     """Simple stud earring"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Single stud on left ear
-    draw_block(draw, 6, 11, color)
+    grid.block(6, 11, color)
     
-    return img
+    return grid
 
 def draw_earring_both_studs(color='#FFD700'):
     """Studs on both ears"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
-    draw_block(draw, 6, 11, color)
-    draw_block(draw, 19, 11, color)
+    grid.block(6, 11, color)
+    grid.block(19, 11, color)
     
-    return img
+    return grid
 
 def draw_earring_hoop(color='#FFD700'):
     """Hoop earring"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Left ear hoop
-    draw_block(draw, 5, 11, color)
-    draw_block(draw, 5, 12, color)
-    draw_block(draw, 5, 13, color)
-    draw_block(draw, 6, 13, color)
-    draw_block(draw, 6, 12, color)
+    grid.block(5, 11, color)
+    grid.block(5, 12, color)
+    grid.block(5, 13, color)
+    grid.block(6, 13, color)
+    grid.block(6, 12, color)
     
-    return img
+    return grid
 
 def draw_earring_both_hoops(color='#FFD700'):
     """Hoops on both ears"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Left hoop
-    draw_block(draw, 5, 11, color)
-    draw_block(draw, 5, 12, color)
-    draw_block(draw, 5, 13, color)
-    draw_block(draw, 6, 13, color)
+    grid.block(5, 11, color)
+    grid.block(5, 12, color)
+    grid.block(5, 13, color)
+    grid.block(6, 13, color)
     
     # Right hoop
-    draw_block(draw, 20, 11, color)
-    draw_block(draw, 20, 12, color)
-    draw_block(draw, 20, 13, color)
-    draw_block(draw, 19, 13, color)
+    grid.block(20, 11, color)
+    grid.block(20, 12, color)
+    grid.block(20, 13, color)
+    grid.block(19, 13, color)
     
-    return img
+    return grid
 
 def draw_earring_dangle(color='#FFD700'):
     """Dangling earring"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Chain and gem
-    draw_block(draw, 6, 11, color)
-    draw_block(draw, 6, 12, '#C0C0C0')  # Silver chain
-    draw_block(draw, 6, 13, '#C0C0C0')
-    draw_block(draw, 5, 14, color)
-    draw_block(draw, 6, 14, color)
-    draw_block(draw, 6, 15, color)
+    grid.block(6, 11, color)
+    grid.block(6, 12, '#C0C0C0')  # Silver chain
+    grid.block(6, 13, '#C0C0C0')
+    grid.block(5, 14, color)
+    grid.block(6, 14, color)
+    grid.block(6, 15, color)
     
-    return img
+    return grid
 
 def draw_earring_cross():
     """Cross earring"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     silver = '#C0C0C0'
     
     # Cross on left ear
-    draw_block(draw, 6, 11, silver)
-    draw_block(draw, 6, 12, silver)
-    draw_block(draw, 5, 12, silver)
-    draw_block(draw, 7, 12, silver)
-    draw_block(draw, 6, 13, silver)
-    draw_block(draw, 6, 14, silver)
+    grid.block(6, 11, silver)
+    grid.block(6, 12, silver)
+    grid.block(5, 12, silver)
+    grid.block(7, 12, silver)
+    grid.block(6, 13, silver)
+    grid.block(6, 14, silver)
     
-    return img
+    return grid
 
 def draw_nose_ring():
     """Nose ring"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     gold = '#FFD700'
     
     # Ring in nose (around y=14-15)
-    draw_block(draw, 12, 15, gold)
-    draw_block(draw, 13, 15, gold)
-    draw_block(draw, 12, 16, gold)
+    grid.block(12, 15, gold)
+    grid.block(13, 15, gold)
+    grid.block(12, 16, gold)
     
-    return img
+    return grid
 
 def draw_nose_stud():
     """Small nose stud"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     diamond = '#E0E0E0'
     
     # Small stud on side of nose
-    draw_block(draw, 11, 14, diamond)
+    grid.block(11, 14, diamond)
     
-    return img
+    return grid
 
 def draw_septum():
     """Septum piercing"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     silver = '#C0C0C0'
     
     # Ring through septum
-    draw_block(draw, 12, 15, silver)
-    draw_block(draw, 13, 15, silver)
-    draw_block(draw, 11, 16, silver)
-    draw_block(draw, 12, 16, silver)
-    draw_block(draw, 13, 16, silver)
-    draw_block(draw, 14, 16, silver)
+    grid.block(12, 15, silver)
+    grid.block(13, 15, silver)
+    grid.block(11, 16, silver)
+    grid.block(12, 16, silver)
+    grid.block(13, 16, silver)
+    grid.block(14, 16, silver)
     
-    return img
+    return grid
 
 def draw_lip_ring():
     """Lip ring piercing"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     silver = '#C0C0C0'
     
     # Ring on lower lip
-    draw_block(draw, 14, 18, silver)
-    draw_block(draw, 14, 19, silver)
-    draw_block(draw, 15, 19, silver)
+    grid.block(14, 18, silver)
+    grid.block(14, 19, silver)
+    grid.block(15, 19, silver)
     
-    return img
+    return grid
 
 def draw_eyebrow_piercing():
     """Eyebrow piercing"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     silver = '#C0C0C0'
     ball = '#FFD700'
     
     # Barbell through eyebrow
-    draw_block(draw, 16, 9, ball)
-    draw_block(draw, 17, 9, silver)
-    draw_block(draw, 18, 9, ball)
+    grid.block(16, 9, ball)
+    grid.block(17, 9, silver)
+    grid.block(18, 9, ball)
     
-    return img
+    return grid
 
 def draw_clown_nose():
     """Red clown nose"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     red = '#FF0000'
     highlight = '#FF6666'
     
     # Big red nose
-    draw_block(draw, 12, 13, red)
-    draw_block(draw, 13, 13, red)
-    draw_block(draw, 11, 14, red)
-    draw_block(draw, 12, 14, red)
-    draw_block(draw, 13, 14, red)
-    draw_block(draw, 14, 14, red)
-    draw_block(draw, 12, 15, red)
-    draw_block(draw, 13, 15, red)
+    grid.block(12, 13, red)
+    grid.block(13, 13, red)
+    grid.block(11, 14, red)
+    grid.block(12, 14, red)
+    grid.block(13, 14, red)
+    grid.block(14, 14, red)
+    grid.block(12, 15, red)
+    grid.block(13, 15, red)
     
     # Highlight
-    draw_block(draw, 12, 13, highlight)
+    grid.block(12, 13, highlight)
     
-    return img
+    return grid
 
 def draw_face_tattoo():
     """Face tattoo - teardrop"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     ink = '#1A1A1A'
     
     # Teardrop under eye
-    draw_block(draw, 8, 13, ink)
-    draw_block(draw, 8, 14, ink)
+    grid.block(8, 13, ink)
+    grid.block(8, 14, ink)
     
-    return img
+    return grid
 
 def draw_scar():
     """Facial scar"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     scar = '#D4A574'  # Lighter than skin
     
     # Diagonal scar on cheek
-    draw_block(draw, 16, 12, scar)
-    draw_block(draw, 17, 13, scar)
-    draw_block(draw, 17, 14, scar)
-    draw_block(draw, 18, 15, scar)
+    grid.block(16, 12, scar)
+    grid.block(17, 13, scar)
+    grid.block(17, 14, scar)
+    grid.block(18, 15, scar)
     
-    return img
+    return grid
 
 def draw_blush():
     """Rosy cheeks / blush"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     pink = '#FFB6C1'
     
     # Blush on both cheeks
-    draw_block(draw, 8, 15, pink)
-    draw_block(draw, 9, 15, pink)
-    draw_block(draw, 17, 15, pink)
-    draw_block(draw, 18, 15, pink)
+    grid.block(8, 15, pink)
+    grid.block(9, 15, pink)
+    grid.block(17, 15, pink)
+    grid.block(18, 15, pink)
     
-    return img
+    return grid
 
 def draw_mole():
     """Beauty mark/mole"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     dark = '#3D2314'
     
     # Single mole
-    draw_block(draw, 16, 16, dark)
+    grid.block(16, 16, dark)
     
-    return img
+    return grid
 
 def draw_freckles():
     """Cute freckles"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     freckle = '#B8860B'
     
@@ -272,186 +243,181 @@ def draw_freckles():
         (16, 14), (17, 15), (18, 14),
         (9, 13), (17, 13),
     ]
-    for x, y in positions:
-        draw_block(draw, x, y, freckle)
+    grid.cells(positions, freckle)
     
-    return img
+    return grid
 
 def draw_band_aid():
     """Band-aid on face"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     bandage = '#F5DEB3'
     pad = '#FFFFFF'
     
     # Diagonal band-aid on cheek
-    draw_block(draw, 15, 13, bandage)
-    draw_block(draw, 16, 14, bandage)
-    draw_block(draw, 17, 15, bandage)
-    draw_block(draw, 18, 16, bandage)
+    grid.block(15, 13, bandage)
+    grid.block(16, 14, bandage)
+    grid.block(17, 15, bandage)
+    grid.block(18, 16, bandage)
     
     # White pad in middle
-    draw_block(draw, 16, 14, pad)
-    draw_block(draw, 17, 15, pad)
+    grid.block(16, 14, pad)
+    grid.block(17, 15, pad)
     
-    return img
+    return grid
 
 def draw_face_paint_star():
     """Star face paint"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     yellow = '#FFD700'
     
     # Star on cheek
-    draw_block(draw, 17, 13, yellow)
-    draw_block(draw, 16, 14, yellow)
-    draw_block(draw, 17, 14, yellow)
-    draw_block(draw, 18, 14, yellow)
-    draw_block(draw, 17, 15, yellow)
-    draw_block(draw, 16, 16, yellow)
-    draw_block(draw, 18, 16, yellow)
+    grid.block(17, 13, yellow)
+    grid.block(16, 14, yellow)
+    grid.block(17, 14, yellow)
+    grid.block(18, 14, yellow)
+    grid.block(17, 15, yellow)
+    grid.block(16, 16, yellow)
+    grid.block(18, 16, yellow)
     
-    return img
+    return grid
 
 def draw_face_paint_heart():
     """Heart face paint"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     red = '#FF1493'
     
     # Heart on cheek
-    draw_block(draw, 7, 14, red)
-    draw_block(draw, 9, 14, red)
-    draw_block(draw, 7, 15, red)
-    draw_block(draw, 8, 15, red)
-    draw_block(draw, 9, 15, red)
-    draw_block(draw, 8, 16, red)
+    grid.block(7, 14, red)
+    grid.block(9, 14, red)
+    grid.block(7, 15, red)
+    grid.block(8, 15, red)
+    grid.block(9, 15, red)
+    grid.block(8, 16, red)
     
-    return img
+    return grid
 
 def draw_tongue_piercing():
     """Tongue piercing (stud)"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     silver = '#C0C0C0'
     tongue = '#FF6B6B'
     
     # Tongue sticking out with piercing
-    draw_block(draw, 12, 18, tongue)
-    draw_block(draw, 13, 18, tongue)
-    draw_block(draw, 14, 18, tongue)
-    draw_block(draw, 13, 18, silver)  # Stud
+    grid.block(12, 18, tongue)
+    grid.block(13, 18, tongue)
+    grid.block(14, 18, tongue)
+    grid.block(13, 18, silver)  # Stud
     
-    return img
+    return grid
 
 def draw_cheek_piercing():
     """Cheek/dimple piercings"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     silver = '#C0C0C0'
     
     # Studs on both cheeks
-    draw_block(draw, 9, 17, silver)
-    draw_block(draw, 17, 17, silver)
+    grid.block(9, 17, silver)
+    grid.block(17, 17, silver)
     
-    return img
+    return grid
 
 def draw_neck_tattoo():
     """Neck tattoo"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     ink = '#1A1A1A'
     
     # Tribal-ish pattern on neck
-    draw_block(draw, 11, 23, ink)
-    draw_block(draw, 12, 23, ink)
-    draw_block(draw, 13, 23, ink)
-    draw_block(draw, 14, 23, ink)
-    draw_block(draw, 12, 24, ink)
-    draw_block(draw, 13, 24, ink)
+    grid.block(11, 23, ink)
+    grid.block(12, 23, ink)
+    grid.block(13, 23, ink)
+    grid.block(14, 23, ink)
+    grid.block(12, 24, ink)
+    grid.block(13, 24, ink)
     
-    return img
+    return grid
 
 def draw_choker():
     """Choker necklace"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     black = '#1A1A1A'
     gem = '#DC143C'
     
     # Choker band
-    for x in range(9, 17):
-        draw_block(draw, x, 22, black)
+    grid.row(22, 9, 17, black)
     
     # Center gem
-    draw_block(draw, 13, 22, gem)
+    grid.block(13, 22, gem)
     
-    return img
+    return grid
 
 def draw_chain_necklace():
     """Gold chain necklace"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     gold = '#FFD700'
     
     # Chain around neck
-    draw_block(draw, 9, 23, gold)
-    draw_block(draw, 10, 23, gold)
-    draw_block(draw, 11, 24, gold)
-    draw_block(draw, 12, 24, gold)
-    draw_block(draw, 13, 24, gold)
-    draw_block(draw, 14, 24, gold)
-    draw_block(draw, 15, 23, gold)
-    draw_block(draw, 16, 23, gold)
-    
-    return img
+    grid.block(9, 23, gold)
+    grid.block(10, 23, gold)
+    grid.block(11, 24, gold)
+    grid.block(12, 24, gold)
+    grid.block(13, 24, gold)
+    grid.block(14, 24, gold)
+    grid.block(15, 23, gold)
+    grid.block(16, 23, gold)
+    
+    return grid
+
+ACCESSORIES = [
+    ('earring_gold_stud', draw_earring_stud, ('#FFD700',), 'common'),
+    ('earring_silver_stud', draw_earring_stud, ('#C0C0C0',), 'common'),
+    ('earring_diamond_stud', draw_earring_stud, ('#E0E0E0',), 'uncommon'),
+    ('earring_both_gold', draw_earring_both_studs, ('#FFD700',), 'common'),
+    ('earring_both_silver', draw_earring_both_studs, ('#C0C0C0',), 'common'),
+    ('earring_gold_hoop', draw_earring_hoop, ('#FFD700',), 'uncommon'),
+    ('earring_silver_hoop', draw_earring_hoop, ('#C0C0C0',), 'uncommon'),
+    ('earring_both_hoops', draw_earring_both_hoops, ('#FFD700',), 'uncommon'),
+    ('earring_dangle', draw_earring_dangle, ('#FFD700',), 'uncommon'),
+    ('earring_cross', draw_earring_cross, (), 'uncommon'),
+    ('nose_ring', draw_nose_ring, (), 'uncommon'),
+    ('nose_stud', draw_nose_stud, (), 'common'),
+    ('septum', draw_septum, (), 'uncommon'),
+    ('lip_ring', draw_lip_ring, (), 'uncommon'),
+    ('eyebrow_piercing', draw_eyebrow_piercing, (), 'uncommon'),
+    ('clown_nose', draw_clown_nose, (), 'rare'),
+    ('face_tattoo', draw_face_tattoo, (), 'rare'),
+    ('scar', draw_scar, (), 'uncommon'),
+    ('blush', draw_blush, (), 'common'),
+    ('mole', draw_mole, (), 'common'),
+    ('freckles', draw_freckles, (), 'common'),
+    ('band_aid', draw_band_aid, (), 'uncommon'),
+    ('face_paint_star', draw_face_paint_star, (), 'uncommon'),
+    ('face_paint_heart', draw_face_paint_heart, (), 'uncommon'),
+    ('tongue_piercing', draw_tongue_piercing, (), 'uncommon'),
+    ('cheek_piercing', draw_cheek_piercing, (), 'uncommon'),
+    ('neck_tattoo', draw_neck_tattoo, (), 'rare'),
+    ('choker', draw_choker, (), 'uncommon'),
+    ('chain_necklace', draw_chain_necklace, (), 'uncommon'),
+]
+
+def jobs():
+    """Every (filename, draw function, args) this script renders"""
+    return [(f"accessory_{name}_{rarity}.png", func, args) for name, func, args, rarity in ACCESSORIES]
 
 def main():
     print("Generating accessory traits (256x256)...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    accessories = [
-        ('earring_gold_stud', lambda: draw_earring_stud('#FFD700'), 'common'),
-        ('earring_silver_stud', lambda: draw_earring_stud('#C0C0C0'), 'common'),
-        ('earring_diamond_stud', lambda: draw_earring_stud('#E0E0E0'), 'uncommon'),
-        ('earring_both_gold', lambda: draw_earring_both_studs('#FFD700'), 'common'),
-        ('earring_both_silver', lambda: draw_earring_both_studs('#C0C0C0'), 'common'),
-        ('earring_gold_hoop', lambda: draw_earring_hoop('#FFD700'), 'uncommon'),
-        ('earring_silver_hoop', lambda: draw_earring_hoop('#C0C0C0'), 'uncommon'),
-        ('earring_both_hoops', lambda: draw_earring_both_hoops('#FFD700'), 'uncommon'),
-        ('earring_dangle', lambda: draw_earring_dangle('#FFD700'), 'uncommon'),
-        ('earring_cross', draw_earring_cross, 'uncommon'),
-        ('nose_ring', draw_nose_ring, 'uncommon'),
-        ('nose_stud', draw_nose_stud, 'common'),
-        ('septum', draw_septum, 'uncommon'),
-        ('lip_ring', draw_lip_ring, 'uncommon'),
-        ('eyebrow_piercing', draw_eyebrow_piercing, 'uncommon'),
-        ('clown_nose', draw_clown_nose, 'rare'),
-        ('face_tattoo', draw_face_tattoo, 'rare'),
-        ('scar', draw_scar, 'uncommon'),
-        ('blush', draw_blush, 'common'),
-        ('mole', draw_mole, 'common'),
-        ('freckles', draw_freckles, 'common'),
-        ('band_aid', draw_band_aid, 'uncommon'),
-        ('face_paint_star', draw_face_paint_star, 'uncommon'),
-        ('face_paint_heart', draw_face_paint_heart, 'uncommon'),
-        ('tongue_piercing', draw_tongue_piercing, 'uncommon'),
-        ('cheek_piercing', draw_cheek_piercing, 'uncommon'),
-        ('neck_tattoo', draw_neck_tattoo, 'rare'),
-        ('choker', draw_choker, 'uncommon'),
-        ('chain_necklace', draw_chain_necklace, 'uncommon'),
-    ]
-    
-    for name, func, rarity in accessories:
-        img = func()
-        filename = f"accessory_{name}_{rarity}.png"
+    accessories = jobs()
+    for filename, func, args in accessories:
+        img = func(*args).to_image()
         img.save(os.path.join(OUTPUT_DIR, filename))
         print(f"  ✓ {filename}")
     
@@ -3,13 +3,19 @@
 Generate patterned backgrounds for agent avatars
 """
 
-from PIL import Image, ImageDraw
+from functools import lru_cache
 import os
 import random
 import math
+import zlib
 
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', 'backgrounds')
-os.makedirs(ASSETS_DIR, exist_ok=True)
+from lazy_import import lazy_import
+
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+np = lazy_import('numpy')
+
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', 'backgrounds')
 
 SIZE = 256
 
@@ -43,57 +49,77 @@ def lighten(color, factor=1.2):
     r, g, b = hex_to_rgb(color) if isinstance(color, str) else color
     return (min(255, int(r * factor)), min(255, int(g * factor)), min(255, int(b * factor)))
 
+def stable_seed(name, salt=0):
+    """Seed derived from a name that is the same in every process
+
+    The built-in hash() of a str is salted per interpreter, so seeding with
+    it gave different patterns on every run.
+    """
+    return salt + zlib.crc32(name.encode())
+
+def fill(rgb):
+    """Solid SIZE x SIZE x 3 pixel array"""
+    # Repeating the bytes is many times faster than broadcasting with np.full
+    return np.frombuffer(bytearray(bytes(rgb) * (SIZE * SIZE)), np.uint8).reshape(SIZE, SIZE, 3)
+
 def create_solid(color, name):
     """Create a solid color background"""
     img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(color))
-    img.save(os.path.join(ASSETS_DIR, f'solid_{name}_common.png'))
-    print(f"  ✓ solid_{name}_common.png")
+    return img
 
 def create_gradient_vertical(color1, color2, name):
     """Create a vertical gradient"""
-    img = Image.new('RGB', (SIZE, SIZE))
-    draw = ImageDraw.Draw(img)
+    c1 = np.array(hex_to_rgb(color1) if isinstance(color1, str) else color1, dtype=np.float64)
+    c2 = np.array(hex_to_rgb(color2) if isinstance(color2, str) else color2, dtype=np.float64)
     
-    r1, g1, b1 = hex_to_rgb(color1) if isinstance(color1, str) else color1
-    r2, g2, b2 = hex_to_rgb(color2) if isinstance(color2, str) else color2
+    # One color per row, truncated like int() did, then broadcast across
+    ratio = np.arange(SIZE)[:, None] / SIZE
+    rows = (c1 + (c2 - c1) * ratio).astype(np.uint8)
+    pixels = np.broadcast_to(rows[:, None, :], (SIZE, SIZE, 3))
     
-    for y in range(SIZE):
-        ratio = y / SIZE
-        r = int(r1 + (r2 - r1) * ratio)
-        g = int(g1 + (g2 - g1) * ratio)
-        b = int(b1 + (b2 - b1) * ratio)
-        draw.line([(0, y), (SIZE, y)], fill=(r, g, b))
-    
-    img.save(os.path.join(ASSETS_DIR, f'gradient_{name}_uncommon.png'))
-    print(f"  ✓ gradient_{name}_uncommon.png")
+    return Image.fromarray(np.ascontiguousarray(pixels))
 
-def create_scanlines(base_color, name):
-    """Create horizontal scanlines pattern"""
-    img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
-    draw = ImageDraw.Draw(img)
-    
-    line_color = darken(base_color, 0.85)
-    
-    for y in range(0, SIZE, 4):
-        draw.line([(0, y), (SIZE, y)], fill=line_color, width=1)
-    
-    img.save(os.path.join(ASSETS_DIR, f'scanlines_{name}_uncommon.png'))
-    print(f"  ✓ scanlines_{name}_uncommon.png")
+def shades(base_color, rng, count, low=0.78, high=0.92):
+    """count darkened copies of base_color, each by a random factor in [low, high)"""
+    factors = rng.uniform(low, high, count)
+    return (np.array(hex_to_rgb(base_color)) * factors[:, None]).astype(np.uint8)
 
-def create_grid(base_color, name, spacing=16):
-    """Create a grid pattern"""
-    img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
-    draw = ImageDraw.Draw(img)
-    
-    line_color = darken(base_color, 0.85)
-    
-    for x in range(0, SIZE, spacing):
-        draw.line([(x, 0), (x, SIZE)], fill=line_color, width=1)
-    for y in range(0, SIZE, spacing):
-        draw.line([(0, y), (SIZE, y)], fill=line_color, width=1)
-    
-    img.save(os.path.join(ASSETS_DIR, f'grid_{name}_uncommon.png'))
-    print(f"  ✓ grid_{name}_uncommon.png")
+def create_scanlines(base_color, name, seed=None):
+    """Create horizontal scanlines pattern
+
+    With a seed the line spacing, phase and the shade of every line vary.
+    """
+    pixels = fill(hex_to_rgb(base_color))
+    if seed is None:
+        pixels[::4] = darken(base_color, 0.85)
+        return Image.fromarray(pixels)
+    rng = np.random.default_rng(seed)
+    spacing = int(rng.integers(3, 7))
+    rows = np.arange(int(rng.integers(spacing)), SIZE, spacing)
+    pixels[rows] = shades(base_color, rng, len(rows))[:, None, :]
+    return Image.fromarray(pixels)
+
+def create_grid(base_color, name, spacing=16, seed=None):
+    """Create a grid pattern
+
+    With a seed the spacing, the offsets and the shade of every line vary.
+    """
+    pixels = fill(hex_to_rgb(base_color))
+    
+    if seed is None:
+        line_color = darken(base_color, 0.85)
+        pixels[:, ::spacing] = line_color
+        pixels[::spacing] = line_color
+        return Image.fromarray(pixels)
+    
+    rng = np.random.default_rng(seed)
+    spacing = int(rng.integers(12, 21))
+    cols = np.arange(int(rng.integers(spacing)), SIZE, spacing)
+    rows = np.arange(int(rng.integers(spacing)), SIZE, spacing)
+    pixels[:, cols] = shades(base_color, rng, len(cols))[None, :, :]
+    pixels[rows] = shades(base_color, rng, len(rows))[:, None, :]
+    
+    return Image.fromarray(pixels)
 
 def create_hex_grid(base_color, name):
     """Create a hexagonal grid pattern"""
@@ -119,10 +145,9 @@ def create_hex_grid(base_color, name):
             cy = row * h + (col % 2) * h / 2
             draw_hexagon(cx, cy, hex_size)
     
-    img.save(os.path.join(ASSETS_DIR, f'hexgrid_{name}_rare.png'))
-    print(f"  ✓ hexgrid_{name}_rare.png")
+    return img
 
-def create_circuit(base_color, name):
+def create_circuit(base_color, name, seed=None):
     """Create a circuit board pattern"""
     img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
     draw = ImageDraw.Draw(img)
@@ -130,35 +155,34 @@ def create_circuit(base_color, name):
     line_color = darken(base_color, 0.7)
     node_color = lighten(base_color, 1.3)
     
-    random.seed(42 + hash(name))  # Deterministic but unique per color
+    rng = random.Random(stable_seed(name, 42) if seed is None else seed)  # Deterministic but unique per color
     
     # Draw circuit traces
     grid_size = 16
     for _ in range(30):
-        x = random.randint(0, SIZE // grid_size) * grid_size
-        y = random.randint(0, SIZE // grid_size) * grid_size
+        x = rng.randint(0, SIZE // grid_size) * grid_size
+        y = rng.randint(0, SIZE // grid_size) * grid_size
         
         # Random path
-        for _ in range(random.randint(2, 6)):
-            direction = random.choice(['h', 'v'])
-            length = random.randint(1, 4) * grid_size
+        for _ in range(rng.randint(2, 6)):
+            direction = rng.choice(['h', 'v'])
+            length = rng.randint(1, 4) * grid_size
             
             if direction == 'h':
-                new_x = max(0, min(SIZE, x + random.choice([-1, 1]) * length))
+                new_x = max(0, min(SIZE, x + rng.choice([-1, 1]) * length))
                 draw.line([(x, y), (new_x, y)], fill=line_color, width=2)
                 x = new_x
             else:
-                new_y = max(0, min(SIZE, y + random.choice([-1, 1]) * length))
+                new_y = max(0, min(SIZE, y + rng.choice([-1, 1]) * length))
                 draw.line([(x, y), (x, new_y)], fill=line_color, width=2)
                 y = new_y
         
         # Node at end
         draw.ellipse([x-3, y-3, x+3, y+3], fill=node_color)
     
-    img.save(os.path.join(ASSETS_DIR, f'circuit_{name}_rare.png'))
-    print(f"  ✓ circuit_{name}_rare.png")
+    return img
 
-def create_constellation(base_color, name):
+def create_constellation(base_color, name, seed=None):
     """Create a constellation/network pattern"""
     img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
     draw = ImageDraw.Draw(img)
@@ -166,10 +190,10 @@ def create_constellation(base_color, name):
     line_color = darken(base_color, 0.75)
     star_color = lighten(base_color, 1.4)
     
-    random.seed(123 + hash(name))
+    rng = random.Random(stable_seed(name, 123) if seed is None else seed)
     
     # Generate star positions
-    stars = [(random.randint(10, SIZE-10), random.randint(10, SIZE-10)) for _ in range(25)]
+    stars = [(rng.randint(10, SIZE-10), rng.randint(10, SIZE-10)) for _ in range(25)]
     
     # Connect nearby stars
     for i, (x1, y1) in enumerate(stars):
@@ -183,122 +207,160 @@ def create_constellation(base_color, name):
     
     # Draw stars
     for x, y in stars:
-        size = random.choice([2, 3, 4])
+        size = rng.choice([2, 3, 4])
         draw.ellipse([x-size, y-size, x+size, y+size], fill=star_color)
     
-    img.save(os.path.join(ASSETS_DIR, f'constellation_{name}_rare.png'))
-    print(f"  ✓ constellation_{name}_rare.png")
+    return img
 
-def create_topographic(base_color, name):
+@lru_cache(maxsize=None)
+def contour_offsets():
+    """Unit-circle (cos, sin) and radius noise for each contour point"""
+    angles = np.arange(0, 365, 5)  # closed loop: the last point repeats 0 degrees
+    rad = np.radians(angles)
+    # Add some noise to radius
+    noise = np.sin(angles * 0.1) * 10 + np.cos(angles * 0.15) * 8
+    noise[-1] = noise[0]
+    return np.cos(rad), np.sin(rad), noise
+
+def create_topographic(base_color, name, seed=None):
     """Create topographic contour lines"""
     img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
     draw = ImageDraw.Draw(img)
     
     line_color = darken(base_color, 0.8)
     
-    random.seed(456 + hash(name))
+    rng = random.Random(stable_seed(name, 456) if seed is None else seed)
     
     # Generate contour centers
-    centers = [(random.randint(0, SIZE), random.randint(0, SIZE)) for _ in range(3)]
-    
-    for cx, cy in centers:
-        for radius in range(20, 200, 15):
-            # Draw wavy circles
-            points = []
-            for angle in range(0, 360, 5):
-                rad = math.radians(angle)
-                # Add some noise to radius
-                noise = math.sin(angle * 0.1) * 10 + math.cos(angle * 0.15) * 8
-                r = radius + noise
-                x = cx + r * math.cos(rad)
-                y = cy + r * math.sin(rad)
-                points.append((x, y))
-            
-            if len(points) > 2:
-                draw.line(points + [points[0]], fill=line_color, width=1)
-    
-    img.save(os.path.join(ASSETS_DIR, f'topographic_{name}_rare.png'))
-    print(f"  ✓ topographic_{name}_rare.png")
-
-def create_geometric(base_color, name):
-    """Create geometric triangle tessellation"""
-    img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
-    draw = ImageDraw.Draw(img)
-    
-    base_rgb = hex_to_rgb(base_color)
+    centers = [(rng.randint(0, SIZE), rng.randint(0, SIZE)) for _ in range(3)]
     
-    random.seed(789 + hash(name))
+    # Every wavy circle for every center at once: (center, radius, point, xy)
+    cos, sin, noise = contour_offsets()
+    radii = np.arange(20, 200, 15)[:, None] + noise
+    xy = np.empty((len(centers), len(radii), len(noise), 2))
+    for i, (cx, cy) in enumerate(centers):
+        xy[i, :, :, 0] = cx + radii * cos
+        xy[i, :, :, 1] = cy + radii * sin
     
-    tri_size = 40
+    for points in xy.reshape(-1, len(noise) * 2).tolist():
+        draw.line(points, fill=line_color, width=1)
     
-    for row in range(-1, SIZE // tri_size + 2):
-        for col in range(-1, SIZE // tri_size + 2):
-            x = col * tri_size + (row % 2) * (tri_size // 2)
-            y = row * tri_size * 0.866
-            
-            # Random shade variation
-            shade = random.uniform(0.85, 1.15)
-            color = (
-                min(255, int(base_rgb[0] * shade)),
-                min(255, int(base_rgb[1] * shade)),
-                min(255, int(base_rgb[2] * shade))
-            )
-            
-            # Draw triangle
-            points = [
-                (x, y),
-                (x + tri_size, y),
-                (x + tri_size // 2, y + tri_size * 0.866)
-            ]
-            draw.polygon(points, fill=color)
-    
-    img.save(os.path.join(ASSETS_DIR, f'geometric_{name}_uncommon.png'))
-    print(f"  ✓ geometric_{name}_uncommon.png")
-
-def create_dots(base_color, name):
-    """Create polka dot pattern"""
-    img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
-    draw = ImageDraw.Draw(img)
+    return img
+
+@lru_cache(maxsize=None)
+def triangle_layout(tri_size=40):
+    """Palette index of the downward triangle under every pixel (seed independent)
+
+    Index 0 is the base color showing through the gaps; triangle (row, col),
+    counted from -1, is 1 + (row + 1) * count + (col + 1).
+    """
+    tri_height = tri_size * 0.866
+    count = SIZE // tri_size + 3
+    
+    # Locate each pixel's triangle row/col and its position inside the row
+    y, x = np.mgrid[0:SIZE, 0:SIZE].astype(np.float64)
+    row = np.floor(y / tri_height).astype(np.int64)
+    depth = (y - row * tri_height) / tri_height
+    u = x - (row % 2) * (tri_size // 2)
+    col = np.floor(u / tri_size).astype(np.int64)
+    local = u - col * tri_size
+    
+    # Downward triangles narrow with depth; the gaps keep the base color
+    inside = (local >= depth * tri_size / 2) & (local <= tri_size - depth * tri_size / 2)
+    index = np.where(inside, 1 + (row + 1) * count + (col + 1), 0).astype(np.uint8)
+    return Image.fromarray(index), count
+
+def create_geometric(base_color, name, seed=None):
+    """Create geometric triangle tessellation"""
+    base_rgb = np.array(hex_to_rgb(base_color), dtype=np.float64)
     
-    dot_color = darken(base_color, 0.85)
+    rng = np.random.default_rng(stable_seed(name, 789) if seed is None else seed)
     
-    spacing = 24
-    radius = 4
+    layout, count = triangle_layout(40)
     
-    for y in range(0, SIZE + spacing, spacing):
-        offset = (y // spacing % 2) * (spacing // 2)
-        for x in range(0, SIZE + spacing, spacing):
-            draw.ellipse([x + offset - radius, y - radius, x + offset + radius, y + radius], fill=dot_color)
+    # Random shade variation per downward triangle, rows and cols from -1
+    shades = rng.uniform(0.85, 1.15, size=count * count)
+    colors = np.minimum(255, (base_rgb * shades[:, None]).astype(np.int64)).astype(np.uint8)
+    palette = np.vstack([np.array(hex_to_rgb(base_color), dtype=np.uint8), colors])
     
-    img.save(os.path.join(ASSETS_DIR, f'dots_{name}_common.png'))
-    print(f"  ✓ dots_{name}_common.png")
+    img = layout.copy()
+    img.putpalette(palette.tobytes())
+    return img.convert('RGB')
+
+@lru_cache(maxsize=None)
+@lru_cache(maxsize=None)
+def dot_slots(spacing=24, radius=4):
+    """Grid center (cy, cx) of every dot slot, indexed row * n + column, and the (dy, dx) offsets of a dot's disc"""
+    # Same slots as dot_centers: odd rows offset by half a step, one spare column on the left
+    n = SIZE // spacing + 3
+    rows, cols = np.divmod(np.arange(n * n), n)
+    cy = rows * spacing
+    cx = (cols - 1) * spacing + rows % 2 * (spacing // 2)
+    dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    # r * (r + 0.5) matches the disc ImageDraw.ellipse rasterizes
+    disc = dx ** 2 + dy ** 2 <= radius * (radius + 0.5)
+    return cy, cx, dy[disc], dx[disc]
+
+def dot_centers(spacing=24):
+    """Pixel coordinates and the nearest dot center of every pixel in the staggered grid"""
+    # Odd rows are offset by half a step
+    y, x = np.mgrid[0:SIZE, 0:SIZE]
+    cy = np.rint(y / spacing).astype(np.int64) * spacing
+    offset = (cy // spacing % 2) * (spacing // 2)
+    cx = np.rint((x - offset) / spacing).astype(np.int64) * spacing + offset
+    return y, x, cy, cx
+
+@lru_cache(maxsize=None)
+def dot_mask(spacing=24, radius=4):
+    """Boolean mask of the staggered polka dot grid"""
+    y, x, cy, cx = dot_centers(spacing)
+    # r * (r + 0.5) matches the disc ImageDraw.ellipse rasterizes
+    return (x - cx) ** 2 + (y - cy) ** 2 <= radius * (radius + 0.5)
 
-def create_noise(base_color, name):
+def create_dots(base_color, name, seed=None, spacing=24, radius=4):
+    """Create polka dot pattern
+
+    With a seed every dot is nudged off its grid position by up to a few
+    pixels and gets its own shade.
+    """
+    pixels = fill(hex_to_rgb(base_color))
+    if seed is None:
+        pixels[dot_mask(spacing, radius)] = darken(base_color, 0.85)
+        return Image.fromarray(pixels)
+    rng = np.random.default_rng(seed)
+    cy, cx, dy, dx = dot_slots(spacing, radius)
+    # Stamp each dot's disc around its jittered center; jitter never moves
+    # a disc out of its own slot, so discs never overlap
+    jitter = rng.integers(-3, 4, (2, len(cy)))
+    colors = shades(base_color, rng, len(cy))
+    ys = (cy + jitter[1])[:, None] + dy
+    xs = (cx + jitter[0])[:, None] + dx
+    inside = (ys >= 0) & (ys < SIZE) & (xs >= 0) & (xs < SIZE)
+    dots, _ = np.nonzero(inside)
+    pixels[ys[inside], xs[inside]] = colors[dots]
+    return Image.fromarray(pixels)
+
+def create_noise(base_color, name, seed=None):
     """Create a subtle noise/grain texture"""
     base_rgb = hex_to_rgb(base_color)
-    img = Image.new('RGB', (SIZE, SIZE))
     
-    random.seed(111 + hash(name))
+    rng = np.random.default_rng(stable_seed(name, 111) if seed is None else seed)
     
-    for y in range(SIZE):
-        for x in range(SIZE):
-            noise = random.randint(-15, 15)
-            color = (
-                max(0, min(255, base_rgb[0] + noise)),
-                max(0, min(255, base_rgb[1] + noise)),
-                max(0, min(255, base_rgb[2] + noise))
-            )
-            img.putpixel((x, y), color)
+    # One random byte per pixel, shared by all channels; each channel's lookup
+    # table folds it to a -15..15 grain offset and clamps
+    grain = Image.frombytes('L', (SIZE, SIZE), rng.bytes(SIZE * SIZE))
+    bands = [grain.point([max(0, min(255, c + b % 31 - 15)) for b in range(256)]) for c in base_rgb]
     
-    img.save(os.path.join(ASSETS_DIR, f'noise_{name}_common.png'))
-    print(f"  ✓ noise_{name}_common.png")
+    return Image.merge('RGB', bands)
 
-def create_glitch(base_color, name):
-    """Create a glitchy/distorted pattern"""
+def create_glitch(base_color, name, seed=None, frame=None):
+    """Create a glitchy/distorted pattern (frame jitters the bars sideways)"""
     img = Image.new('RGB', (SIZE, SIZE), hex_to_rgb(base_color))
     draw = ImageDraw.Draw(img)
     
-    random.seed(222 + hash(name))
+    seed = stable_seed(name, 222) if seed is None else seed
+    rng = random.Random(seed)
+    jitter = random.Random(f'{seed}:{frame}') if frame is not None else None
     
     glitch_colors = [
         (255, 0, 100),   # Magenta
@@ -308,94 +370,107 @@ def create_glitch(base_color, name):
     
     # Draw glitch bars
     for _ in range(15):
-        y = random.randint(0, SIZE)
-        height = random.randint(2, 8)
-        offset = random.randint(-20, 20)
-        color = random.choice(glitch_colors)
+        y = rng.randint(0, SIZE)
+        height = rng.randint(2, 8)
+        offset = rng.randint(-20, 20)
+        color = rng.choice(glitch_colors)
+        if jitter:
+            offset += jitter.randint(-12, 12)
         
         draw.rectangle([offset, y, SIZE + offset, y + height], fill=color)
     
-    img.save(os.path.join(ASSETS_DIR, f'glitch_{name}_legendary.png'))
-    print(f"  ✓ glitch_{name}_legendary.png")
+    return img
 
-def create_matrix(name):
-    """Create matrix rain effect"""
+def create_matrix(name, seed=None, frame=None):
+    """Create matrix rain effect (each frame the rain falls 32px, wrapping)"""
     img = Image.new('RGB', (SIZE, SIZE), (0, 10, 0))
     draw = ImageDraw.Draw(img)
     
-    random.seed(333)
+    rng = random.Random(333 if seed is None else seed)
     
     for x in range(0, SIZE, 12):
-        column_height = random.randint(50, SIZE)
-        start_y = random.randint(0, SIZE - 50)
+        column_height = rng.randint(50, SIZE)
+        start_y = rng.randint(0, SIZE - 50)
         
-        for y in range(start_y, min(start_y + column_height, SIZE), 12):
+        if frame is None:
+            rows = range(start_y, min(start_y + column_height, SIZE), 12)
+        else:
+            rows = range(start_y, start_y + column_height, 12)
+        for y in rows:
             brightness = 255 - int((y - start_y) / column_height * 200)
             color = (0, brightness, 0)
+            if frame is not None:
+                y = (y + frame * 32) % SIZE
             
             # Draw a simple block instead of text
             draw.rectangle([x, y, x+8, y+10], fill=color)
     
-    img.save(os.path.join(ASSETS_DIR, f'matrix_{name}_legendary.png'))
-    print(f"  ✓ matrix_{name}_legendary.png")
+    return img
 
-def main():
-    print("Generating patterned backgrounds...")
-    print()
+def jobs():
+    """Every (filename, render function, args) this script renders"""
+    backgrounds = []
     
-    # Generate solid backgrounds
-    print("Solid colors:")
+    # Solid colors
     for name, color in COLORS.items():
-        create_solid(color, name)
-    print()
-    
-    # Generate gradients
-    print("Gradients:")
-    create_gradient_vertical(COLORS['purple'], COLORS['pink'], 'sunset')
-    create_gradient_vertical(COLORS['dark'], COLORS['purple'], 'night')
-    create_gradient_vertical(COLORS['cyan'], COLORS['blue'], 'ocean')
-    create_gradient_vertical(COLORS['orange'], COLORS['pink'], 'peach')
-    create_gradient_vertical(COLORS['black'], COLORS['navy'], 'abyss')
+        backgrounds.append((f'solid_{name}_common.png', create_solid, (color, name)))
+    
+    # Gradients
+    for name, color1, color2 in [
+        ('sunset', 'purple', 'pink'),
+        ('night', 'dark', 'purple'),
+        ('ocean', 'cyan', 'blue'),
+        ('peach', 'orange', 'pink'),
+        ('abyss', 'black', 'navy'),
+    ]:
+        backgrounds.append((f'gradient_{name}_uncommon.png', create_gradient_vertical,
+                            (COLORS[color1], COLORS[color2], name)))
+    
+    # Patterns
+    patterns = [
+        ('scanlines', create_scanlines, 'uncommon', ['dark', 'navy', 'purple']),
+        ('grid', create_grid, 'uncommon', ['gray', 'dark', 'cyan']),
+        ('hexgrid', create_hex_grid, 'rare', ['dark', 'navy', 'purple']),
+        ('circuit', create_circuit, 'rare', ['dark', 'navy', 'green']),
+        ('constellation', create_constellation, 'rare', ['dark', 'navy', 'purple']),
+        ('topographic', create_topographic, 'rare', ['cream', 'blue', 'green']),
+        ('geometric', create_geometric, 'uncommon', ['purple', 'blue', 'pink']),
+        ('dots', create_dots, 'common', ['cream', 'pink', 'blue']),
+        ('noise', create_noise, 'common', ['gray', 'dark']),
+    ]
+    for pattern, func, rarity, names in patterns:
+        for name in names:
+            backgrounds.append((f'{pattern}_{name}_{rarity}.png', func, (COLORS[name], name)))
+    
+    # Special effects
+    backgrounds += [
+        ('glitch_dark_legendary.png', create_glitch, (COLORS['dark'], 'dark')),
+        ('glitch_black_legendary.png', create_glitch, (COLORS['black'], 'black')),
+        ('matrix_green_legendary.png', create_matrix, ('green',)),
+    ]
+    return backgrounds
+
+def animations():
+    """Every (filename, render function, args, frames) that can be animated
+
+    The render function takes frame=0..frames-1 as a keyword argument.
+    """
+    return [(filename, func, args, 8) for filename, func, args in jobs()
+            if func in (create_glitch, create_matrix)]
+
+def main():
+    print("Generating patterned backgrounds...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     print()
     
-    # Generate patterns
-    print("Patterns:")
-    for name, color in [('dark', COLORS['dark']), ('navy', COLORS['navy']), ('purple', COLORS['purple'])]:
-        create_scanlines(color, name)
-    
-    for name, color in [('gray', COLORS['gray']), ('dark', COLORS['dark']), ('cyan', COLORS['cyan'])]:
-        create_grid(color, name)
-    
-    for name, color in [('dark', COLORS['dark']), ('navy', COLORS['navy']), ('purple', COLORS['purple'])]:
-        create_hex_grid(color, name)
-    
-    for name, color in [('dark', COLORS['dark']), ('navy', COLORS['navy']), ('green', COLORS['green'])]:
-        create_circuit(color, name)
-    
-    for name, color in [('dark', COLORS['dark']), ('navy', COLORS['navy']), ('purple', COLORS['purple'])]:
-        create_constellation(color, name)
-    
-    for name, color in [('cream', COLORS['cream']), ('blue', COLORS['blue']), ('green', COLORS['green'])]:
-        create_topographic(color, name)
-    
-    for name, color in [('purple', COLORS['purple']), ('blue', COLORS['blue']), ('pink', COLORS['pink'])]:
-        create_geometric(color, name)
-    
-    for name, color in [('cream', COLORS['cream']), ('pink', COLORS['pink']), ('blue', COLORS['blue'])]:
-        create_dots(color, name)
-    
-    for name, color in [('gray', COLORS['gray']), ('dark', COLORS['dark'])]:
-        create_noise(color, name)
-    
-    print()
-    print("Special effects:")
-    create_glitch(COLORS['dark'], 'dark')
-    create_glitch(COLORS['black'], 'black')
-    create_matrix('green')
+    backgrounds = jobs()
+    for filename, func, args in backgrounds:
+        img = func(*args)
+        img.save(os.path.join(OUTPUT_DIR, filename))
+        print(f"  ✓ {filename}")
     
     print()
-    print(f"Done! Backgrounds saved to {ASSETS_DIR}")
-    print(f"Total files: {len(os.listdir(ASSETS_DIR))}")
+    print(f"Done! {len(backgrounds)} backgrounds saved to {OUTPUT_DIR}")
 
 if __name__ == "__main__":
     main()
@@ -4,9 +4,13 @@ Generate base body pixel art for Agent Avatars.
 Simple programmatic pixel art generation.
 """
 
-from PIL import Image, ImageDraw
 import os
 
+from lazy_import import lazy_import
+
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+
 # Canvas size
 WIDTH = 256
 HEIGHT = 256
@@ -4,14 +4,11 @@ Generate hair trait layers for CryptoPunks-style faces
 256x256 with transparency
 """
 
-from PIL import Image, ImageDraw
 import os
 
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', 'hair')
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+from rasterizer import Grid
 
-SIZE = 256
-BLOCK = 10
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', 'hair')
 
 # Hair colors
 HAIR_COLORS = {
@@ -30,129 +27,102 @@ HAIR_COLORS = {
     'orange': '#F97316',
 }
 
-def draw_block(draw, x, y, color, block_size=BLOCK):
-    """Draw a single pixel block"""
-    draw.rectangle([x * block_size, y * block_size, 
-                   (x + 1) * block_size - 1, (y + 1) * block_size - 1], 
-                  fill=color)
-
-def create_canvas():
-    return Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-
 def draw_bald():
     """Bald with shine"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Shiny bald spot highlight
     shine = '#FFFFFF'
-    draw_block(draw, 11, 5, shine)
-    draw_block(draw, 12, 5, shine)
-    draw_block(draw, 11, 6, shine)
+    grid.block(11, 5, shine)
+    grid.block(12, 5, shine)
+    grid.block(11, 6, shine)
     
-    return img
+    return grid
 
 def draw_buzz(color):
     """Short buzz cut"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Short stubble on top of head
-    for x in range(8, 18):
-        draw_block(draw, x, 4, color)
-        draw_block(draw, x, 5, color)
-    for x in range(9, 17):
-        draw_block(draw, x, 3, color)
+    grid.row(4, 8, 18, color)
+    grid.row(5, 8, 18, color)
+    grid.row(3, 9, 17, color)
     
-    return img
+    return grid
 
 def draw_short(color):
     """Short regular hair"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Darker shade
     r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
     dark = f'#{max(0,r-30):02x}{max(0,g-30):02x}{max(0,b-30):02x}'
     
     # Top of head coverage
-    for x in range(7, 19):
-        draw_block(draw, x, 4, color)
-        draw_block(draw, x, 5, color)
-    for x in range(8, 18):
-        draw_block(draw, x, 3, color)
-    for x in range(9, 17):
-        draw_block(draw, x, 2, color)
+    grid.row(4, 7, 19, color)
+    grid.row(5, 7, 19, color)
+    grid.row(3, 8, 18, color)
+    grid.row(2, 9, 17, color)
     
     # Sides
-    for y in range(5, 9):
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 19, y, color)
+    grid.col(6, 5, 9, color)
+    grid.col(19, 5, 9, color)
     
-    return img
+    return grid
 
 def draw_spiky(color):
     """Spiky punk hair"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Base hair
-    for x in range(7, 19):
-        draw_block(draw, x, 4, color)
-        draw_block(draw, x, 5, color)
+    grid.row(4, 7, 19, color)
+    grid.row(5, 7, 19, color)
     
     # Spikes going up
     spikes = [8, 10, 12, 14, 16]
     for spike_x in spikes:
-        draw_block(draw, spike_x, 3, color)
-        draw_block(draw, spike_x, 2, color)
-        draw_block(draw, spike_x, 1, color)
+        grid.block(spike_x, 3, color)
+        grid.block(spike_x, 2, color)
+        grid.block(spike_x, 1, color)
     
     # Side spikes
-    draw_block(draw, 6, 5, color)
-    draw_block(draw, 5, 4, color)
-    draw_block(draw, 19, 5, color)
-    draw_block(draw, 20, 4, color)
+    grid.block(6, 5, color)
+    grid.block(5, 4, color)
+    grid.block(19, 5, color)
+    grid.block(20, 4, color)
     
-    return img
+    return grid
 
 def draw_mohawk(color):
     """Classic mohawk"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Tall center strip
-    for y in range(0, 6):
-        draw_block(draw, 12, y, color)
-        draw_block(draw, 13, y, color)
+    grid.col(12, 0, 6, color)
+    grid.col(13, 0, 6, color)
     
     # Wider at base
-    for x in range(11, 15):
-        draw_block(draw, x, 5, color)
-        draw_block(draw, x, 6, color)
+    grid.row(5, 11, 15, color)
+    grid.row(6, 11, 15, color)
     
-    return img
+    return grid
 
 def draw_mohawk_tall(color):
     """Extra tall mohawk"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Very tall center strip
-    for y in range(0, 6):
-        for x in range(11, 15):
-            draw_block(draw, x, y, color)
+    grid.rect(11, 0, 15, 6, color)
     
     # Pointed top
-    draw_block(draw, 12, -1 if -1 >= 0 else 0, color)  # Can't go negative, skip
-    draw_block(draw, 13, 0, color)
+    grid.block(12, -1 if -1 >= 0 else 0, color)  # Can't go negative, skip
+    grid.block(13, 0, color)
     
-    return img
+    return grid
 
 def draw_messy(color):
     """Messy/wild hair"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Irregular clumps
     positions = [
@@ -162,284 +132,235 @@ def draw_messy(color):
         (6, 6), (19, 6), (5, 7), (20, 7),
     ]
     
-    for x, y in positions:
-        draw_block(draw, x, y, color)
+    grid.cells(positions, color)
     
     # Fill base
-    for x in range(7, 19):
-        draw_block(draw, x, 4, color)
-        draw_block(draw, x, 5, color)
+    grid.row(4, 7, 19, color)
+    grid.row(5, 7, 19, color)
     
-    return img
+    return grid
 
 def draw_long_male(color):
     """Long flowing hair - for wider male head"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Top - covers male head (face_left=6, face_right=20)
-    for x in range(7, 19):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, color)
-        draw_block(draw, x, 5, color)
+    grid.row(3, 7, 19, color)
+    grid.row(4, 7, 19, color)
+    grid.row(5, 7, 19, color)
     
     # Sides going down
-    for y in range(5, 20):
-        draw_block(draw, 5, y, color)
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 19, y, color)
-        draw_block(draw, 20, y, color)
+    grid.col(5, 5, 20, color)
+    grid.col(6, 5, 20, color)
+    grid.col(19, 5, 20, color)
+    grid.col(20, 5, 20, color)
     
     # Widens at bottom
-    for y in range(18, 22):
-        draw_block(draw, 4, y, color)
-        draw_block(draw, 21, y, color)
+    grid.col(4, 18, 22, color)
+    grid.col(21, 18, 22, color)
     
-    return img
+    return grid
 
 def draw_long_female(color):
     """Long flowing hair - for female head. Touches face at x=7 and x=18."""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Top - covers female head crown
-    for x in range(9, 17):
-        draw_block(draw, x, 2, color)
-    for x in range(8, 18):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, color)
+    grid.row(2, 9, 17, color)
+    grid.row(3, 8, 18, color)
+    grid.row(4, 8, 18, color)
     
     # Sides going down - TIGHT against face (touching x=7 and x=18)
-    for y in range(4, 19):
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 7, y, color)  # Touch face left
-        draw_block(draw, 18, y, color)  # Touch face right
-        draw_block(draw, 19, y, color)
+    grid.col(6, 4, 19, color)
+    grid.col(7, 4, 19, color)  # Touch face left
+    grid.col(18, 4, 19, color)  # Touch face right
+    grid.col(19, 4, 19, color)
     
     # Widens at shoulders/ends
-    for y in range(16, 21):
-        draw_block(draw, 5, y, color)
-        draw_block(draw, 20, y, color)
+    grid.col(5, 16, 21, color)
+    grid.col(20, 16, 21, color)
     
     # Ends taper
     for x in [6, 7, 18, 19]:
-        draw_block(draw, x, 20, color)
+        grid.block(x, 20, color)
     
-    return img
+    return grid
 
 def draw_afro_male(color):
     """Big afro - for wider male head"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Large round shape for male head
-    for x in range(9, 17):
-        draw_block(draw, x, 0, color)
-    for x in range(7, 19):
-        draw_block(draw, x, 1, color)
-    for x in range(5, 21):
-        draw_block(draw, x, 2, color)
-    for x in range(4, 22):
-        for y in range(3, 6):
-            draw_block(draw, x, y, color)
+    grid.row(0, 9, 17, color)
+    grid.row(1, 7, 19, color)
+    grid.row(2, 5, 21, color)
+    grid.rect(4, 3, 22, 6, color)
     
     # Sides frame the wider face
-    for y in range(6, 11):
-        draw_block(draw, 4, y, color)
-        draw_block(draw, 5, y, color)
-        draw_block(draw, 20, y, color)
-        draw_block(draw, 21, y, color)
+    grid.col(4, 6, 11, color)
+    grid.col(5, 6, 11, color)
+    grid.col(20, 6, 11, color)
+    grid.col(21, 6, 11, color)
     
-    return img
+    return grid
 
 def draw_afro_female(color):
     """Big afro - for female head. Hair touches face at x=7 and x=18."""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Big round afro shape - top dome
-    for x in range(10, 16):
-        draw_block(draw, x, 0, color)
-    for x in range(8, 18):
-        draw_block(draw, x, 1, color)
-    for x in range(6, 20):
-        draw_block(draw, x, 2, color)
-    for x in range(5, 21):
-        draw_block(draw, x, 3, color)
-    for x in range(4, 22):
-        draw_block(draw, x, 4, color)
+    grid.row(0, 10, 16, color)
+    grid.row(1, 8, 18, color)
+    grid.row(2, 6, 20, color)
+    grid.row(3, 5, 21, color)
+    grid.row(4, 4, 22, color)
     
     # Connect to sides - touching face edges
-    for x in range(4, 22):
-        draw_block(draw, x, 5, color)
+    grid.row(5, 4, 22, color)
     
     # Side puffs - TOUCH the face (x=7 left edge, x=18 right edge)
-    for y in range(6, 10):
-        draw_block(draw, 4, y, color)
-        draw_block(draw, 5, y, color)
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 7, y, color)  # Touch face left edge
-        draw_block(draw, 18, y, color)  # Touch face right edge
-        draw_block(draw, 19, y, color)
-        draw_block(draw, 20, y, color)
-        draw_block(draw, 21, y, color)
-    
-    return img
+    grid.col(4, 6, 10, color)
+    grid.col(5, 6, 10, color)
+    grid.col(6, 6, 10, color)
+    grid.col(7, 6, 10, color)  # Touch face left edge
+    grid.col(18, 6, 10, color)  # Touch face right edge
+    grid.col(19, 6, 10, color)
+    grid.col(20, 6, 10, color)
+    grid.col(21, 6, 10, color)
+    
+    return grid
 
 def draw_ponytail_female(color):
     """Ponytail - for female head"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Top pulled back - fits female head
-    for x in range(8, 18):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, color)
+    grid.row(3, 8, 18, color)
+    grid.row(4, 8, 18, color)
     
     # Sides slicked
-    draw_block(draw, 7, 5, color)
-    draw_block(draw, 18, 5, color)
+    grid.block(7, 5, color)
+    grid.block(18, 5, color)
     
     # Ponytail in back (visible on side)
-    for y in range(6, 17):
-        draw_block(draw, 19, y, color)
-        draw_block(draw, 20, y, color)
+    grid.col(19, 6, 17, color)
+    grid.col(20, 6, 17, color)
     
     # Tie
-    draw_block(draw, 19, 7, '#4A4A4A')
-    draw_block(draw, 20, 7, '#4A4A4A')
+    grid.block(19, 7, '#4A4A4A')
+    grid.block(20, 7, '#4A4A4A')
     
-    return img
+    return grid
 
 def draw_ponytail_male(color):
     """Ponytail/man bun - for male head"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Top pulled back - fits male head
-    for x in range(7, 19):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, color)
+    grid.row(3, 7, 19, color)
+    grid.row(4, 7, 19, color)
     
     # Sides slicked
-    draw_block(draw, 6, 5, color)
-    draw_block(draw, 19, 5, color)
+    grid.block(6, 5, color)
+    grid.block(19, 5, color)
     
     # Man bun at back
-    for y in range(5, 10):
-        draw_block(draw, 20, y, color)
-        draw_block(draw, 21, y, color)
-    draw_block(draw, 20, 4, color)
+    grid.col(20, 5, 10, color)
+    grid.col(21, 5, 10, color)
+    grid.block(20, 4, color)
     
     # Tie
-    draw_block(draw, 20, 6, '#4A4A4A')
+    grid.block(20, 6, '#4A4A4A')
     
-    return img
+    return grid
 
 def draw_pigtails_female(color):
     """Pigtails - female only. Hair touches face at x=7 and x=18."""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Top hair covers crown
-    for x in range(7, 19):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, color)
+    grid.row(3, 7, 19, color)
+    grid.row(4, 7, 19, color)
     
     # Hair flows to sides - touching face
-    for x in range(5, 9):  # Goes to x=8, touching face at x=7-8
-        draw_block(draw, x, 5, color)
-    for x in range(17, 21):  # Goes to x=17, touching face at x=17-18
-        draw_block(draw, x, 5, color)
+    grid.row(5, 5, 9, color)  # Goes to x=8, touching face at x=7-8
+    grid.row(5, 17, 21, color)  # Goes to x=17, touching face at x=17-18
     
     # Left pigtail - touches face edge
-    for y in range(6, 15):
-        draw_block(draw, 5, y, color)
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 7, y, color)  # Touch face
+    grid.col(5, 6, 15, color)
+    grid.col(6, 6, 15, color)
+    grid.col(7, 6, 15, color)  # Touch face
     # Puff at end
-    draw_block(draw, 4, 12, color)
-    draw_block(draw, 4, 13, color)
-    draw_block(draw, 4, 14, color)
-    draw_block(draw, 5, 15, color)
-    draw_block(draw, 6, 15, color)
+    grid.block(4, 12, color)
+    grid.block(4, 13, color)
+    grid.block(4, 14, color)
+    grid.block(5, 15, color)
+    grid.block(6, 15, color)
     
     # Right pigtail - touches face edge
-    for y in range(6, 15):
-        draw_block(draw, 18, y, color)  # Touch face
-        draw_block(draw, 19, y, color)
-        draw_block(draw, 20, y, color)
+    grid.col(18, 6, 15, color)  # Touch face
+    grid.col(19, 6, 15, color)
+    grid.col(20, 6, 15, color)
     # Puff at end
-    draw_block(draw, 21, 12, color)
-    draw_block(draw, 21, 13, color)
-    draw_block(draw, 21, 14, color)
-    draw_block(draw, 19, 15, color)
-    draw_block(draw, 20, 15, color)
+    grid.block(21, 12, color)
+    grid.block(21, 13, color)
+    grid.block(21, 14, color)
+    grid.block(19, 15, color)
+    grid.block(20, 15, color)
     
     # Hair ties (red)
-    draw_block(draw, 6, 6, '#EF4444')
-    draw_block(draw, 7, 6, '#EF4444')
-    draw_block(draw, 18, 6, '#EF4444')
-    draw_block(draw, 19, 6, '#EF4444')
+    grid.block(6, 6, '#EF4444')
+    grid.block(7, 6, '#EF4444')
+    grid.block(18, 6, '#EF4444')
+    grid.block(19, 6, '#EF4444')
     
-    return img
+    return grid
 
 def draw_bangs_female(color):
     """Front bangs - for female head"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Top hair - female width
-    for x in range(8, 18):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, color)
+    grid.row(3, 8, 18, color)
+    grid.row(4, 8, 18, color)
     
     # Bangs hanging over forehead
-    for x in range(8, 17):
-        draw_block(draw, x, 6, color)
-        draw_block(draw, x, 7, color)
-    for x in range(9, 16):
-        draw_block(draw, x, 8, color)
+    grid.row(6, 8, 17, color)
+    grid.row(7, 8, 17, color)
+    grid.row(8, 9, 16, color)
     
     # Sides
-    for y in range(5, 10):
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 7, y, color)
-        draw_block(draw, 18, y, color)
-        draw_block(draw, 19, y, color)
+    grid.col(6, 5, 10, color)
+    grid.col(7, 5, 10, color)
+    grid.col(18, 5, 10, color)
+    grid.col(19, 5, 10, color)
     
-    return img
+    return grid
 
 def draw_bangs_male(color):
     """Front bangs/fringe - for male head"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Top hair - male width
-    for x in range(7, 19):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, color)
+    grid.row(3, 7, 19, color)
+    grid.row(4, 7, 19, color)
     
     # Bangs hanging over forehead
-    for x in range(7, 18):
-        draw_block(draw, x, 6, color)
-        draw_block(draw, x, 7, color)
-    for x in range(8, 17):
-        draw_block(draw, x, 8, color)
+    grid.row(6, 7, 18, color)
+    grid.row(7, 7, 18, color)
+    grid.row(8, 8, 17, color)
     
     # Sides
-    for y in range(5, 9):
-        draw_block(draw, 5, y, color)
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 19, y, color)
-        draw_block(draw, 20, y, color)
+    grid.col(5, 5, 9, color)
+    grid.col(6, 5, 9, color)
+    grid.col(19, 5, 9, color)
+    grid.col(20, 5, 9, color)
     
-    return img
+    return grid
 
 def draw_curly(color):
     """Curly hair"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Puffy curls pattern
     curl_positions = [
@@ -451,118 +372,116 @@ def draw_curly(color):
         (5, 7), (20, 7),
     ]
     
-    for x, y in curl_positions:
-        draw_block(draw, x, y, color)
+    grid.cells(curl_positions, color)
     
     # Fill middle
-    for x in range(9, 17):
-        draw_block(draw, x, 5, color)
+    grid.row(5, 9, 17, color)
     
-    return img
+    return grid
 
 def draw_slicked(color):
     """Slicked back hair"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Darker shade for depth
     r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
     dark = f'#{max(0,r-40):02x}{max(0,g-40):02x}{max(0,b-40):02x}'
     
     # Smooth top swept back
-    for x in range(8, 18):
-        draw_block(draw, x, 3, color)
-        draw_block(draw, x, 4, dark)
+    grid.row(3, 8, 18, color)
+    grid.row(4, 8, 18, dark)
     
     # Lines showing slick direction
-    draw_block(draw, 9, 4, color)
-    draw_block(draw, 12, 4, color)
-    draw_block(draw, 15, 4, color)
+    grid.block(9, 4, color)
+    grid.block(12, 4, color)
+    grid.block(15, 4, color)
     
     # Sides
-    for y in range(5, 8):
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 19, y, color)
+    grid.col(6, 5, 8, color)
+    grid.col(19, 5, 8, color)
     
-    return img
+    return grid
 
 def draw_cap_hair(color):
     """Hair peeking out from under cap (partial)"""
-    img = create_canvas()
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Just sides visible
-    for y in range(8, 14):
-        draw_block(draw, 5, y, color)
-        draw_block(draw, 6, y, color)
-        draw_block(draw, 19, y, color)
-        draw_block(draw, 20, y, color)
+    grid.col(5, 8, 14, color)
+    grid.col(6, 8, 14, color)
+    grid.col(19, 8, 14, color)
+    grid.col(20, 8, 14, color)
     
-    return img
+    return grid
+
+# Unisex styles (work on both)
+UNISEX_STYLES = [
+    ('bald', draw_bald, None, 'common'),
+    ('buzz', draw_buzz, 'black', 'common'),
+    ('buzz', draw_buzz, 'blonde', 'common'),
+    ('short', draw_short, 'black', 'common'),
+    ('short', draw_short, 'brown', 'common'),
+    ('short', draw_short, 'blonde', 'common'),
+    ('short', draw_short, 'gray', 'uncommon'),
+    ('spiky', draw_spiky, 'black', 'uncommon'),
+    ('spiky', draw_spiky, 'blonde', 'uncommon'),
+    ('spiky', draw_spiky, 'purple', 'rare'),
+    ('mohawk', draw_mohawk, 'black', 'uncommon'),
+    ('mohawk', draw_mohawk, 'red', 'rare'),
+    ('mohawk', draw_mohawk, 'green', 'rare'),
+    ('mohawk_tall', draw_mohawk_tall, 'purple', 'rare'),
+    ('messy', draw_messy, 'brown', 'common'),
+    ('messy', draw_messy, 'auburn', 'common'),
+    ('curly', draw_curly, 'brown', 'common'),
+    ('curly', draw_curly, 'blonde', 'common'),
+    ('slicked', draw_slicked, 'black', 'uncommon'),
+    ('cap_hair', draw_cap_hair, 'brown', 'common'),
+]
+
+# Male-specific styles
+MALE_STYLES = [
+    ('long_male', draw_long_male, 'black', 'common'),
+    ('long_male', draw_long_male, 'brown', 'common'),
+    ('afro_male', draw_afro_male, 'black', 'uncommon'),
+    ('afro_male', draw_afro_male, 'brown', 'uncommon'),
+    ('ponytail_male', draw_ponytail_male, 'black', 'common'),
+    ('ponytail_male', draw_ponytail_male, 'brown', 'common'),
+    ('bangs_male', draw_bangs_male, 'black', 'common'),
+    ('bangs_male', draw_bangs_male, 'brown', 'common'),
+]
+
+# Female-specific styles
+FEMALE_STYLES = [
+    ('long_female', draw_long_female, 'black', 'common'),
+    ('long_female', draw_long_female, 'blonde', 'common'),
+    ('long_female', draw_long_female, 'pink', 'rare'),
+    ('afro_female', draw_afro_female, 'black', 'uncommon'),
+    ('afro_female', draw_afro_female, 'brown', 'uncommon'),
+    ('ponytail_female', draw_ponytail_female, 'black', 'common'),
+    ('ponytail_female', draw_ponytail_female, 'brown', 'common'),
+    ('pigtails_female', draw_pigtails_female, 'blonde', 'uncommon'),
+    ('pigtails_female', draw_pigtails_female, 'pink', 'rare'),
+    ('bangs_female', draw_bangs_female, 'black', 'common'),
+    ('bangs_female', draw_bangs_female, 'auburn', 'common'),
+]
+
+def jobs():
+    """Every (filename, draw function, args) this script renders"""
+    hair = []
+    for name, func, color, rarity in UNISEX_STYLES + MALE_STYLES + FEMALE_STYLES:
+        if color:
+            hair.append((f"hair_{name}_{color}_{rarity}.png", func, (HAIR_COLORS[color],)))
+        else:
+            hair.append((f"hair_{name}_{rarity}.png", func, ()))
+    return hair
 
 def main():
     print("Generating hair traits (256x256)...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    # Unisex styles (work on both)
-    unisex = [
-        ('bald', draw_bald, None, 'common'),
-        ('buzz', draw_buzz, 'black', 'common'),
-        ('buzz', draw_buzz, 'blonde', 'common'),
-        ('short', draw_short, 'black', 'common'),
-        ('short', draw_short, 'brown', 'common'),
-        ('short', draw_short, 'blonde', 'common'),
-        ('short', draw_short, 'gray', 'uncommon'),
-        ('spiky', draw_spiky, 'black', 'uncommon'),
-        ('spiky', draw_spiky, 'blonde', 'uncommon'),
-        ('spiky', draw_spiky, 'purple', 'rare'),
-        ('mohawk', draw_mohawk, 'black', 'uncommon'),
-        ('mohawk', draw_mohawk, 'red', 'rare'),
-        ('mohawk', draw_mohawk, 'green', 'rare'),
-        ('mohawk_tall', draw_mohawk_tall, 'purple', 'rare'),
-        ('messy', draw_messy, 'brown', 'common'),
-        ('messy', draw_messy, 'auburn', 'common'),
-        ('curly', draw_curly, 'brown', 'common'),
-        ('curly', draw_curly, 'blonde', 'common'),
-        ('slicked', draw_slicked, 'black', 'uncommon'),
-        ('cap_hair', draw_cap_hair, 'brown', 'common'),
-    ]
-    
-    # Male-specific styles
-    male = [
-        ('long_male', draw_long_male, 'black', 'common'),
-        ('long_male', draw_long_male, 'brown', 'common'),
-        ('afro_male', draw_afro_male, 'black', 'uncommon'),
-        ('afro_male', draw_afro_male, 'brown', 'uncommon'),
-        ('ponytail_male', draw_ponytail_male, 'black', 'common'),
-        ('ponytail_male', draw_ponytail_male, 'brown', 'common'),
-        ('bangs_male', draw_bangs_male, 'black', 'common'),
-        ('bangs_male', draw_bangs_male, 'brown', 'common'),
-    ]
-    
-    # Female-specific styles
-    female = [
-        ('long_female', draw_long_female, 'black', 'common'),
-        ('long_female', draw_long_female, 'blonde', 'common'),
-        ('long_female', draw_long_female, 'pink', 'rare'),
-        ('afro_female', draw_afro_female, 'black', 'uncommon'),
-        ('afro_female', draw_afro_female, 'brown', 'uncommon'),
-        ('ponytail_female', draw_ponytail_female, 'black', 'common'),
-        ('ponytail_female', draw_ponytail_female, 'brown', 'common'),
-        ('pigtails_female', draw_pigtails_female, 'blonde', 'uncommon'),
-        ('pigtails_female', draw_pigtails_female, 'pink', 'rare'),
-        ('bangs_female', draw_bangs_female, 'black', 'common'),
-        ('bangs_female', draw_bangs_female, 'auburn', 'common'),
-    ]
-    
-    all_styles = unisex + male + female
-    
-    for name, func, color, rarity in all_styles:
-        if color:
-            img = func(HAIR_COLORS[color])
-            filename = f"hair_{name}_{color}_{rarity}.png"
-        else:
-            img = func()
-            filename = f"hair_{name}_{rarity}.png"
+    all_styles = jobs()
+    for filename, func, args in all_styles:
+        img = func(*args).to_image()
         img.save(os.path.join(OUTPUT_DIR, filename))
         print(f"  ✓ {filename}")
     
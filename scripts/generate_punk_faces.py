@@ -4,18 +4,12 @@ Generate CryptoPunks-style base faces at 256x256
 Chunky pixel blocks (~10-12px per "pixel") for that iconic look
 """
 
-from PIL import Image, ImageDraw
 import os
 
+from rasterizer import Grid
+
 # Output directory
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces', 'base')
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-# Canvas size
-SIZE = 256
-
-# Pixel block size (for chunky pixel art look)
-BLOCK = 10  # Each "pixel" is 10x10 real pixels
 
 # Skin tones (from ART_SPECS.md)
 SKIN_TONES = {
@@ -37,16 +31,9 @@ SPECIAL_SKINS = {
     'alien': '#7ED321',   # Bright green
 }
 
-def draw_block(draw, x, y, color, block_size=BLOCK):
-    """Draw a single pixel block"""
-    draw.rectangle([x * block_size, y * block_size, 
-                   (x + 1) * block_size - 1, (y + 1) * block_size - 1], 
-                  fill=color)
-
 def draw_male_face(skin_color, variant='default'):
     """Draw a male punk face"""
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Darker shade for outline/shadow
     r, g, b = int(skin_color[1:3], 16), int(skin_color[3:5], 16), int(skin_color[5:7], 16)
@@ -60,49 +47,37 @@ def draw_male_face(skin_color, variant='default'):
     face_bottom = 23
     
     # Draw main face block
-    for y in range(face_top + 2, face_bottom - 1):
-        for x in range(face_left + 1, face_right - 1):
-            draw_block(draw, x, y, skin_color)
+    grid.rect(face_left + 1, face_top + 2, face_right - 1, face_bottom - 1, skin_color)
     
     # Top of head (slightly narrower)
-    for y in range(face_top, face_top + 2):
-        for x in range(face_left + 2, face_right - 2):
-            draw_block(draw, x, y, skin_color)
+    grid.rect(face_left + 2, face_top, face_right - 2, face_top + 2, skin_color)
     
     # Forehead sides
     for x in [face_left + 1, face_right - 2]:
-        for y in range(face_top + 1, face_top + 3):
-            draw_block(draw, x, y, skin_color)
+        grid.col(x, face_top + 1, face_top + 3, skin_color)
     
     # Jaw (slightly narrower at bottom)
-    for y in range(face_bottom - 2, face_bottom):
-        for x in range(face_left + 2, face_right - 2):
-            draw_block(draw, x, y, skin_color)
+    grid.rect(face_left + 2, face_bottom - 2, face_right - 2, face_bottom, skin_color)
     
     # Chin
-    for x in range(face_left + 3, face_right - 3):
-        draw_block(draw, x, face_bottom, skin_color)
+    grid.row(face_bottom, face_left + 3, face_right - 3, skin_color)
     
     # Ears
-    for y in range(10, 14):
-        draw_block(draw, face_left, y, skin_color)
-        draw_block(draw, face_right - 1, y, skin_color)
+    grid.col(face_left, 10, 14, skin_color)
+    grid.col(face_right - 1, 10, 14, skin_color)
     
     # Ear inner shadow
-    draw_block(draw, face_left, 11, shadow)
-    draw_block(draw, face_right - 1, 11, shadow)
+    grid.block(face_left, 11, shadow)
+    grid.block(face_right - 1, 11, shadow)
     
     # Neck
-    for y in range(face_bottom + 1, 25):
-        for x in range(10, 16):
-            draw_block(draw, x, y, skin_color)
+    grid.rect(10, face_bottom + 1, 16, 25, skin_color)
     
-    return img
+    return grid
 
 def draw_female_face(skin_color, variant='default'):
     """Draw a female punk face - slightly softer/rounder shape"""
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Darker shade for outline/shadow
     r, g, b = int(skin_color[1:3], 16), int(skin_color[3:5], 16), int(skin_color[5:7], 16)
@@ -115,47 +90,37 @@ def draw_female_face(skin_color, variant='default'):
     face_bottom = 22
     
     # Draw main face block
-    for y in range(face_top + 2, face_bottom - 1):
-        for x in range(face_left + 1, face_right - 1):
-            draw_block(draw, x, y, skin_color)
+    grid.rect(face_left + 1, face_top + 2, face_right - 1, face_bottom - 1, skin_color)
     
     # Top of head (rounder)
-    for y in range(face_top, face_top + 2):
-        for x in range(face_left + 2, face_right - 2):
-            draw_block(draw, x, y, skin_color)
+    grid.rect(face_left + 2, face_top, face_right - 2, face_top + 2, skin_color)
     
     # Sides near top
     for x in [face_left + 1, face_right - 2]:
-        draw_block(draw, x, face_top + 1, skin_color)
+        grid.block(x, face_top + 1, skin_color)
     
     # Jaw (more tapered for female)
-    for x in range(face_left + 2, face_right - 2):
-        draw_block(draw, x, face_bottom - 1, skin_color)
+    grid.row(face_bottom - 1, face_left + 2, face_right - 2, skin_color)
     
     # Chin (smaller/pointer)
-    for x in range(face_left + 4, face_right - 4):
-        draw_block(draw, x, face_bottom, skin_color)
+    grid.row(face_bottom, face_left + 4, face_right - 4, skin_color)
     
     # Ears (smaller)
-    for y in range(10, 13):
-        draw_block(draw, face_left, y, skin_color)
-        draw_block(draw, face_right - 1, y, skin_color)
+    grid.col(face_left, 10, 13, skin_color)
+    grid.col(face_right - 1, 10, 13, skin_color)
     
     # Ear inner shadow
-    draw_block(draw, face_left, 11, shadow)
-    draw_block(draw, face_right - 1, 11, shadow)
+    grid.block(face_left, 11, shadow)
+    grid.block(face_right - 1, 11, shadow)
     
     # Neck (thinner)
-    for y in range(face_bottom + 1, 24):
-        for x in range(11, 15):
-            draw_block(draw, x, y, skin_color)
+    grid.rect(11, face_bottom + 1, 15, 24, skin_color)
     
-    return img
+    return grid
 
 def draw_zombie_face(variant='default'):
     """Draw a zombie punk face - green, decayed look"""
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     skin = SPECIAL_SKINS['zombie']
     shadow = '#5A8A5A'  # Darker green
@@ -168,48 +133,36 @@ def draw_zombie_face(variant='default'):
     face_bottom = 23
     
     # Main face
-    for y in range(face_top + 2, face_bottom - 1):
-        for x in range(face_left + 1, face_right - 1):
-            draw_block(draw, x, y, skin)
+    grid.rect(face_left + 1, face_top + 2, face_right - 1, face_bottom - 1, skin)
     
     # Top of head
-    for y in range(face_top, face_top + 2):
-        for x in range(face_left + 2, face_right - 2):
-            draw_block(draw, x, y, skin)
+    grid.rect(face_left + 2, face_top, face_right - 2, face_top + 2, skin)
     
     # Jaw
-    for y in range(face_bottom - 2, face_bottom):
-        for x in range(face_left + 2, face_right - 2):
-            draw_block(draw, x, y, skin)
+    grid.rect(face_left + 2, face_bottom - 2, face_right - 2, face_bottom, skin)
     
     # Chin
-    for x in range(face_left + 3, face_right - 3):
-        draw_block(draw, x, face_bottom, skin)
+    grid.row(face_bottom, face_left + 3, face_right - 3, skin)
     
     # Ears
-    for y in range(10, 14):
-        draw_block(draw, face_left, y, skin)
-        draw_block(draw, face_right - 1, y, skin)
+    grid.col(face_left, 10, 14, skin)
+    grid.col(face_right - 1, 10, 14, skin)
     
     # Decay patches (darker areas)
     decay_spots = [(8, 8), (17, 12), (9, 18), (16, 7)]
-    for dx, dy in decay_spots:
-        draw_block(draw, dx, dy, shadow)
+    grid.cells(decay_spots, shadow)
     
     # Exposed bone on cheek
-    draw_block(draw, 15, 15, bone)
+    grid.block(15, 15, bone)
     
     # Neck
-    for y in range(face_bottom + 1, 25):
-        for x in range(10, 16):
-            draw_block(draw, x, y, skin)
+    grid.rect(10, face_bottom + 1, 16, 25, skin)
     
-    return img
+    return grid
 
 def draw_ape_face(variant='default'):
     """Draw an ape punk face - CryptoPunks style primate"""
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Brown fur tones
     fur_main = '#8B6914'      # Golden brown fur
@@ -225,72 +178,56 @@ def draw_ape_face(variant='default'):
     face_bottom = 22
     
     # Main fur/head area
-    for y in range(face_top, face_bottom):
-        for x in range(face_left + 1, face_right - 1):
-            draw_block(draw, x, y, fur_main)
+    grid.rect(face_left + 1, face_top, face_right - 1, face_bottom, fur_main)
     
     # Top of head - furry, slightly domed
-    for x in range(face_left + 2, face_right - 2):
-        draw_block(draw, x, face_top - 1, fur_main)
-    for x in range(face_left + 3, face_right - 3):
-        draw_block(draw, x, face_top - 2, fur_dark)
+    grid.row(face_top - 1, face_left + 2, face_right - 2, fur_main)
+    grid.row(face_top - 2, face_left + 3, face_right - 3, fur_dark)
     
     # Heavy brow ridge (signature ape feature)
-    for x in range(face_left + 2, face_right - 2):
-        draw_block(draw, x, 9, fur_dark)
-        draw_block(draw, x, 10, fur_dark)
+    grid.row(9, face_left + 2, face_right - 2, fur_dark)
+    grid.row(10, face_left + 2, face_right - 2, fur_dark)
     
     # Face/muzzle area (lighter, skin colored)
-    for y in range(11, 19):
-        for x in range(8, 18):
-            draw_block(draw, x, y, face_skin)
+    grid.rect(8, 11, 18, 19, face_skin)
     
     # Protruding muzzle (lower face sticks out more)
-    for y in range(15, 19):
-        for x in range(7, 19):
-            draw_block(draw, x, y, face_skin)
+    grid.rect(7, 15, 19, 19, face_skin)
     
     # Wide nostrils
-    draw_block(draw, 11, 16, nose_color)
-    draw_block(draw, 14, 16, nose_color)
+    grid.block(11, 16, nose_color)
+    grid.block(14, 16, nose_color)
     
     # Fur around face edges
-    for y in range(11, 18):
-        draw_block(draw, 7, y, fur_main)
-        draw_block(draw, 18, y, fur_main)
+    grid.col(7, 11, 18, fur_main)
+    grid.col(18, 11, 18, fur_main)
     
     # Big round ears (ape style)
-    for y in range(8, 14):
-        draw_block(draw, face_left - 1, y, fur_main)
-        draw_block(draw, face_left, y, fur_main)
-        draw_block(draw, face_right - 1, y, fur_main)
-        draw_block(draw, face_right, y, fur_main)
+    grid.col(face_left - 1, 8, 14, fur_main)
+    grid.col(face_left, 8, 14, fur_main)
+    grid.col(face_right - 1, 8, 14, fur_main)
+    grid.col(face_right, 8, 14, fur_main)
     # Ear centers
-    draw_block(draw, face_left, 10, face_skin)
-    draw_block(draw, face_left, 11, face_skin)
-    draw_block(draw, face_right - 1, 10, face_skin)
-    draw_block(draw, face_right - 1, 11, face_skin)
+    grid.block(face_left, 10, face_skin)
+    grid.block(face_left, 11, face_skin)
+    grid.block(face_right - 1, 10, face_skin)
+    grid.block(face_right - 1, 11, face_skin)
     
     # Jaw/chin
-    for x in range(face_left + 3, face_right - 3):
-        draw_block(draw, x, face_bottom, fur_main)
+    grid.row(face_bottom, face_left + 3, face_right - 3, fur_main)
     
     # Neck (thick, furry)
-    for y in range(face_bottom + 1, 25):
-        for x in range(9, 17):
-            draw_block(draw, x, y, fur_main)
+    grid.rect(9, face_bottom + 1, 17, 25, fur_main)
     
     # Some fur texture highlights
     highlights = [(7, 7), (18, 8), (8, 20), (17, 19)]
-    for hx, hy in highlights:
-        draw_block(draw, hx, hy, fur_light)
+    grid.cells(highlights, fur_light)
     
-    return img
+    return grid
 
 def draw_alien_face(variant='default'):
     """Draw an alien punk face - CryptoPunks style (cyan/blue, big dome)"""
-    img = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    grid = Grid()
     
     # Alien colors - cyan/teal like CryptoPunks
     skin = '#61E786'          # Bright green-cyan
@@ -302,91 +239,64 @@ def draw_alien_face(variant='default'):
     
     # Large cranium (the iconic alien dome)
     # Top of dome
-    for x in range(9, 18):
-        draw_block(draw, x, 2, skin)
-    for x in range(8, 19):
-        draw_block(draw, x, 3, skin)
-    for x in range(7, 20):
-        draw_block(draw, x, 4, skin)
-    for x in range(6, 21):
-        for y in range(5, 10):
-            draw_block(draw, x, y, skin)
+    grid.row(2, 9, 18, skin)
+    grid.row(3, 8, 19, skin)
+    grid.row(4, 7, 20, skin)
+    grid.rect(6, 5, 21, 10, skin)
     
     # Dome highlight (shiny head)
-    draw_block(draw, 10, 3, skin_light)
-    draw_block(draw, 11, 3, skin_light)
-    draw_block(draw, 10, 4, skin_light)
+    grid.block(10, 3, skin_light)
+    grid.block(11, 3, skin_light)
+    grid.block(10, 4, skin_light)
     
     # Face narrows down from the dome
-    for y in range(10, 13):
-        for x in range(7, 20):
-            draw_block(draw, x, y, skin)
+    grid.rect(7, 10, 20, 13, skin)
     
-    for y in range(13, 17):
-        for x in range(8, 19):
-            draw_block(draw, x, y, skin)
+    grid.rect(8, 13, 19, 17, skin)
     
-    for y in range(17, 20):
-        for x in range(9, 18):
-            draw_block(draw, x, y, skin)
+    grid.rect(9, 17, 18, 20, skin)
     
     # Narrow jaw
-    for x in range(10, 17):
-        draw_block(draw, x, 20, skin)
+    grid.row(20, 10, 17, skin)
     
     # Small pointed chin
-    for x in range(11, 16):
-        draw_block(draw, x, 21, skin)
-    for x in range(12, 15):
-        draw_block(draw, x, 22, skin)
+    grid.row(21, 11, 16, skin)
+    grid.row(22, 12, 15, skin)
     
     # Thin elegant neck
-    for y in range(23, 25):
-        for x in range(11, 16):
-            draw_block(draw, x, y, skin)
+    grid.rect(11, 23, 16, 25, skin)
     
     # Subtle shading on sides
-    for y in range(6, 15):
-        draw_block(draw, 6, y, skin_dark)
-        draw_block(draw, 20, y, skin_dark)
+    grid.col(6, 6, 15, skin_dark)
+    grid.col(20, 6, 15, skin_dark)
     
-    return img
+    return grid
+
+def jobs():
+    """Every (filename, draw function, args) this script renders"""
+    faces = []
+    for tone_name, color in SKIN_TONES.items():
+        faces.append((f"male_{tone_name}.png", draw_male_face, (color,)))
+    for tone_name, color in SKIN_TONES.items():
+        faces.append((f"female_{tone_name}.png", draw_female_face, (color,)))
+    faces += [
+        ("zombie.png", draw_zombie_face, ()),
+        ("ape.png", draw_ape_face, ()),
+        ("alien.png", draw_alien_face, ()),
+    ]
+    return faces
 
 def main():
     print("Generating CryptoPunks-style base faces (256x256)...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    # Generate Male faces with all skin tones
-    print("\nMale faces:")
-    for tone_name, color in SKIN_TONES.items():
-        img = draw_male_face(color)
-        filename = f"male_{tone_name}.png"
-        img.save(os.path.join(OUTPUT_DIR, filename))
-        print(f"  ✓ {filename}")
-    
-    # Generate Female faces with all skin tones
-    print("\nFemale faces:")
-    for tone_name, color in SKIN_TONES.items():
-        img = draw_female_face(color)
-        filename = f"female_{tone_name}.png"
+    faces = jobs()
+    for filename, func, args in faces:
+        img = func(*args).to_image()
         img.save(os.path.join(OUTPUT_DIR, filename))
         print(f"  ✓ {filename}")
     
-    # Generate special types
-    print("\nSpecial types:")
-    
-    img = draw_zombie_face()
-    img.save(os.path.join(OUTPUT_DIR, "zombie.png"))
-    print("  ✓ zombie.png")
-    
-    img = draw_ape_face()
-    img.save(os.path.join(OUTPUT_DIR, "ape.png"))
-    print("  ✓ ape.png")
-    
-    img = draw_alien_face()
-    img.save(os.path.join(OUTPUT_DIR, "alien.png"))
-    print("  ✓ alien.png")
-    
-    print(f"\nDone! Faces saved to {OUTPUT_DIR}")
+    print(f"\nDone! {len(faces)} faces saved to {OUTPUT_DIR}")
 
 if __name__ == "__main__":
     main()
@@ -3,17 +3,36 @@
 Random Punk Generator - creates randomized avatar combinations
 """
 
-from PIL import Image
+import io
 import os
+import queue
 import random
+import threading
 import json
 
+from atlas import load_atlas
+from background_engine import choose_background, format_spec, is_spec, render_spec, seed_for
+from coverage import visible_layers
+from fingerprint import FingerprintSet, fingerprint, to_hex
+from frame_ring import FrameRing
+from layer_store import LayerCache, SharedLayerStore
+from lazy_import import lazy_import
+from multires import parse_sizes, render_sizes
+from render_cache import default_cache, render_key
+from sprite_registry import SpriteRegistry
+
+Image = lazy_import('PIL.Image')
+argparse = lazy_import('argparse')
+futures = lazy_import('concurrent.futures')
+
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'generated')
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 SIZE = 256
 
+# Attempts at a visually unique punk before giving up on deduplication
+MAX_REROLLS = 100
+
 # Background colors (legacy fallback)
 BACKGROUNDS = {
     'cream': '#FEF3C7',
@@ -72,17 +91,17 @@ def get_traits(category):
             })
     return traits
 
-def weighted_choice(traits, none_chance=0):
+def weighted_choice(traits, none_chance=0, rng=random):
     """Pick a trait based on rarity weights, with optional chance of None"""
     if not traits:
         return None
     
     # Add chance for no trait
-    if none_chance > 0 and random.randint(1, 100) <= none_chance:
+    if none_chance > 0 and rng.randint(1, 100) <= none_chance:
         return None
     
     weights = [t['weight'] for t in traits]
-    return random.choices(traits, weights=weights, k=1)[0]
+    return rng.choices(traits, weights=weights, k=1)[0]
 
 def is_female_base(base_name):
     """Check if base is female type"""
@@ -128,7 +147,9 @@ def create_background(color):
     return Image.new('RGBA', (SIZE, SIZE), rgb + (255,))
 
 def load_background(bg_filename):
-    """Load a background PNG file"""
+    """Load a background PNG file, or render a procedural background spec"""
+    if is_spec(bg_filename):
+        return render_spec(bg_filename).convert('RGBA')
     bg_path = os.path.join(ASSETS_DIR, 'backgrounds', bg_filename)
     if os.path.exists(bg_path):
         bg = Image.open(bg_path).convert('RGBA')
@@ -136,48 +157,103 @@ def load_background(bg_filename):
     # Fallback to cream
     return create_background('#FEF3C7')
 
-def composite_layers(base, layers, bg_filename=None, bg_color='cream'):
-    """Composite all layers together"""
-    # Start with background
-    if bg_filename:
-        result = load_background(bg_filename)
+def background_canvas(background, source=None):
+    """A fresh canvas for a background as metadata records it: a file, a procedural spec or a color"""
+    # Legacy punks record a color name instead of a background file
+    if background in BACKGROUNDS:
+        return create_canvas(bg_color=background)
+    return create_canvas(background, source=source)
+
+def load_layer(category, filename, source=None):
+    """Load a trait layer as (image, (x, y)), from a layer source or from disk"""
+    if source is not None:
+        return source.sprite(category, filename)
+    layer_path = os.path.join(ASSETS_DIR, category, filename)
+    if os.path.exists(layer_path):
+        return Image.open(layer_path), (0, 0)
+    return None
+
+# Trait layers painted over the base, bottom to top
+LAYER_ORDER = ['eyes', 'mouth', 'accessories', 'hair', 'eyewear', 'headwear']
+
+def create_canvas(bg_filename=None, bg_color='cream', source=None):
+    """A fresh background image to composite a punk onto"""
+    bg_layer = load_layer('backgrounds', bg_filename, source) if bg_filename and source else None
+    if bg_layer:
+        return bg_layer[0].copy()
+    elif bg_filename:
+        return load_background(bg_filename)
     elif bg_color.startswith('#'):
-        result = create_background(bg_color)
+        return create_background(bg_color)
     else:
-        result = create_background(BACKGROUNDS.get(bg_color, BACKGROUNDS['cream']))
-    
-    # Add base
-    base_path = os.path.join(ASSETS_DIR, 'base', base)
-    if os.path.exists(base_path):
-        base_img = Image.open(base_path)
-        result.paste(base_img, (0, 0), base_img)
-    
-    # Layer order
-    layer_order = ['eyes', 'mouth', 'accessories', 'hair', 'eyewear', 'headwear']
+        return create_background(BACKGROUNDS.get(bg_color, BACKGROUNDS['cream']))
+
+def composite_layers(base, layers, bg_filename=None, bg_color='cream', source=None):
+    """Composite all layers together"""
+    # Start with background
+    result = create_canvas(bg_filename, bg_color, source)
     
-    for category in layer_order:
-        if category in layers and layers[category]:
-            layer_path = os.path.join(ASSETS_DIR, category, layers[category])
-            if os.path.exists(layer_path):
-                layer_img = Image.open(layer_path)
-                result.paste(layer_img, (0, 0), layer_img)
+    # Add base and traits, skipping any that later layers hide completely
+    for _, (layer_img, offset) in visible_stack(base, layers, source):
+        result.paste(layer_img, offset, layer_img)
     
     return result
 
-def generate_punk(punk_id=None):
-    """Generate a single random punk"""
+def composite_metadata(metadata, source=None):
+    """Composite a punk from its metadata"""
+    background = metadata['background']
+    # Legacy punks record a color name instead of a background file
+    bg_filename, bg_color = (None, background) if background in BACKGROUNDS else (background, None)
+    return composite_layers(metadata['base'], metadata['traits'], bg_filename=bg_filename,
+                            bg_color=bg_color, source=source)
+
+def layer_stack(base, layers):
+    """(category, filename) of the base and every trait, bottom to top"""
+    return [('base', base)] + [(category, layers[category])
+                               for category in LAYER_ORDER if layers.get(category)]
+
+def visible_stack(base, layers, source=None):
+    """((category, filename), layer) for the base and every trait a later layer does not hide completely"""
+    stack = []
+    for category, filename in layer_stack(base, layers):
+        layer = load_layer(category, filename, source)
+        if layer:
+            stack.append(((category, filename), layer))
+    return visible_layers(source, stack)
+
+def visible_traits(metadata, source=None):
+    """Categories of a punk's traits that are not completely hidden by later layers"""
+    stack = visible_stack(metadata['base'], metadata['traits'], source)
+    return [category for (category, _), _ in stack if category != 'base']
+
+def load_catalog():
+    """Get every trait category, including backgrounds, keyed by category"""
+    categories = ['backgrounds', 'base', 'eyes', 'hair', 'eyewear', 'headwear', 'mouth', 'accessories']
+    # Sorted so a seeded RNG picks the same traits regardless of listdir order
+    return {category: sorted(get_traits(category), key=lambda t: t['filename'])
+            for category in categories}
+
+def pick_traits(punk_id=None, source=None, rng=None, unique_background=False):
+    """Randomly pick a punk's traits without rendering it; metadata minus the fingerprint
+
+    With unique_background the background is a procedural pattern seeded
+    from punk_id (or from rng when there is no ID) instead of one of the
+    background files.
+    """
+    rng = rng or random
     
     # Get all traits
-    bases = get_traits('base')
-    eyes = get_traits('eyes')
-    hair = get_traits('hair')
-    eyewear = get_traits('eyewear')
-    headwear = get_traits('headwear')
-    mouth = get_traits('mouth')
-    accessories = get_traits('accessories')
+    traits_for = source.traits if source is not None else get_traits
+    bases = traits_for('base')
+    eyes = traits_for('eyes')
+    hair = traits_for('hair')
+    eyewear = traits_for('eyewear')
+    headwear = traits_for('headwear')
+    mouth = traits_for('mouth')
+    accessories = traits_for('accessories')
     
     # Pick base (required)
-    base_trait = weighted_choice(bases)
+    base_trait = weighted_choice(bases, rng=rng)
     base = base_trait['filename']
     
     # Filter hair for base type
@@ -187,93 +263,332 @@ def generate_punk(punk_id=None):
     
     # Eyes (always)
     if eyes:
-        eye_trait = weighted_choice(eyes)
+        eye_trait = weighted_choice(eyes, rng=rng)
         layers['eyes'] = eye_trait['filename'] if eye_trait else None
     
     # Mouth (80% chance)
-    if mouth and random.randint(1, 100) <= 80:
-        mouth_trait = weighted_choice(mouth)
+    if mouth and rng.randint(1, 100) <= 80:
+        mouth_trait = weighted_choice(mouth, rng=rng)
         layers['mouth'] = mouth_trait['filename'] if mouth_trait else None
     else:
         layers['mouth'] = None
     
     # Hair (90% chance)
-    if appropriate_hair and random.randint(1, 100) <= 90:
-        hair_trait = weighted_choice(appropriate_hair)
+    if appropriate_hair and rng.randint(1, 100) <= 90:
+        hair_trait = weighted_choice(appropriate_hair, rng=rng)
         layers['hair'] = hair_trait['filename'] if hair_trait else None
     else:
         layers['hair'] = None
     
     # Eyewear (30% chance)
-    if eyewear and random.randint(1, 100) <= 30:
-        eyewear_trait = weighted_choice(eyewear)
+    if eyewear and rng.randint(1, 100) <= 30:
+        eyewear_trait = weighted_choice(eyewear, rng=rng)
         layers['eyewear'] = eyewear_trait['filename'] if eyewear_trait else None
     else:
         layers['eyewear'] = None
     
     # Headwear (40% chance)
-    if headwear and random.randint(1, 100) <= 40:
-        headwear_trait = weighted_choice(headwear)
+    if headwear and rng.randint(1, 100) <= 40:
+        headwear_trait = weighted_choice(headwear, rng=rng)
         layers['headwear'] = headwear_trait['filename'] if headwear_trait else None
     else:
         layers['headwear'] = None
     
     # Accessories (50% chance)
-    if accessories and random.randint(1, 100) <= 50:
-        acc_trait = weighted_choice(accessories)
+    if accessories and rng.randint(1, 100) <= 50:
+        acc_trait = weighted_choice(accessories, rng=rng)
         layers['accessories'] = acc_trait['filename'] if acc_trait else None
     else:
         layers['accessories'] = None
     
     # Pick background (use files if available, else fallback to colors)
-    bg_files = get_background_files()
-    if bg_files:
-        bg_trait = weighted_choice(bg_files)
+    bg_files = source.traits('backgrounds') if source is not None else get_background_files()
+    if unique_background:
+        seed = seed_for(punk_id) if punk_id is not None else rng.getrandbits(64)
+        bg_filename = format_spec(*choose_background(seed))
+        bg_color = None
+    elif bg_files:
+        bg_trait = weighted_choice(bg_files, rng=rng)
         bg_filename = bg_trait['filename'] if bg_trait else None
         bg_color = None
     else:
         bg_filename = None
-        bg_color = random.choice(list(BACKGROUNDS.keys()))
-    
-    # Composite
-    punk_img = composite_layers(base, layers, bg_filename=bg_filename, bg_color=bg_color)
+        bg_color = rng.choice(list(BACKGROUNDS.keys()))
     
-    # Build metadata
-    metadata = {
+    return {
         'id': punk_id,
         'base': base,
         'background': bg_filename or bg_color,
-        'traits': {k: v for k, v in layers.items() if v}
+        'traits': {k: v for k, v in layers.items() if v},
     }
-    
+
+def generate_punk(punk_id=None, source=None, rng=None, unique_background=False):
+    """Generate a single random punk: pick_traits(), composite the result and record which traits show"""
+    metadata = pick_traits(punk_id, source, rng, unique_background)
+    punk_img = composite_metadata(metadata, source)
+    metadata['visible_traits'] = visible_traits(metadata, source)
+    metadata['fingerprint'] = to_hex(fingerprint(punk_img))
     return punk_img, metadata
 
-def generate_batch(count=20):
-    """Generate a batch of random punks"""
+def generate_unique_punk(seen, **kwargs):
+    """generate_punk() until the render is not a visual duplicate of one in seen
+
+    seen is a FingerprintSet (or None to accept the first punk); the
+    accepted punk's fingerprint is added to it.
+    """
+    for _ in range(MAX_REROLLS):
+        punk_img, metadata = generate_punk(**kwargs)
+        if seen is None or seen.add(int(metadata['fingerprint'], 16)):
+            return punk_img, metadata
+    raise RuntimeError(f"no visually unique punk after {MAX_REROLLS} attempts")
+
+def save_punk(punk_img, punk_id, sizes=(SIZE,)):
+    """Save a punk at every size, returning {size: filename relative to OUTPUT_DIR}
+
+    The canvas size keeps its usual place; other sizes go in a directory per size.
+    """
+    files = {}
+    for size, img in render_sizes(punk_img, sizes).items():
+        name = f"punk_{punk_id:04d}.png"
+        if size != SIZE:
+            os.makedirs(os.path.join(OUTPUT_DIR, str(size)), exist_ok=True)
+            name = f"{size}/{name}"
+        img.save(os.path.join(OUTPUT_DIR, name))
+        files[size] = name
+    return files
+
+def record_files(metadata, files):
+    """Add the saved filename(s) to a punk's metadata"""
+    metadata['filename'] = files.get(SIZE, next(iter(files.values())))
+    if list(files) != [SIZE]:
+        metadata['sizes'] = {str(size): name for size, name in files.items()}
+
+def render_pngs(metadata, sizes=(SIZE,), source=None, cache=None, punk_img=None):
+    """Render a punk from its metadata at the given sizes, as {size: PNG bytes}
+
+    Sizes already in the render cache are read from it; the punk is
+    composited at most once for all the missing ones, which are then stored.
+    Pass punk_img if the canvas has already been composited.
+    """
+    cache = cache or default_cache()
+    keys = {size: render_key(metadata, size) for size in sizes}
+    pngs = {size: cache.get(key) for size, key in keys.items()}
+    missing = [size for size, data in pngs.items() if data is None]
+    if missing:
+        if punk_img is None:
+            punk_img = composite_metadata(metadata, source)
+        for size, img in render_sizes(punk_img, missing).items():
+            buf = io.BytesIO()
+            img.save(buf, format='PNG')
+            pngs[size] = buf.getvalue()
+            cache.put(keys[size], pngs[size])
+    return pngs
+
+def render_avatar(metadata, sizes=(SIZE,), source=None, cache=None):
+    """Render a punk from its metadata at the given sizes, as {size: image}"""
+    return {size: Image.open(io.BytesIO(data))
+            for size, data in render_pngs(metadata, sizes, source, cache).items()}
+
+# Per-process layer store and frame ring, attached once by each pool worker
+_worker_store = None
+_worker_ring = None
+
+def _init_worker(store_handle, ring_handle):
+    """Pool initializer: attach to the shared layer store and frame ring, and reseed
+
+    Without a store handle each worker draws its layers from generator code.
+    """
+    global _worker_store, _worker_ring
+    _worker_store = SharedLayerStore.attach(store_handle) if store_handle else SpriteRegistry()
+    _worker_ring = FrameRing.attach(ring_handle)
+    # Forked workers inherit the parent's RNG state, so reseed from the OS
+    random.seed()
+
+def _render_worker(punk_id, slot, unique_background=False):
+    """Render one punk inside a pool worker, straight into a shared frame slot"""
+    punk_img, metadata = generate_punk(punk_id=punk_id, source=_worker_store,
+                                       unique_background=unique_background)
+    _worker_ring.write(slot, punk_img)
+    return metadata
+
+def _generate_parallel(count, workers, encoders=None, unique_backgrounds=False, from_code=False,
+                       atlas=None, sizes=(SIZE,), seen=None):
+    """Render on a process pool; the parent encodes and writes from the frame ring"""
+    encoders = encoders or min(4, os.cpu_count() or 1)
+    if from_code:
+        store = None
+    elif atlas:
+        store = SharedLayerStore.from_source(load_atlas(atlas), load_catalog())
+    else:
+        store = SharedLayerStore.create(ASSETS_DIR, load_catalog())
+    # Two slots per worker keeps every worker busy while frames are encoded
+    ring = FrameRing.create(slots=workers * 2, size=SIZE)
+    if store:
+        print(f"  Shared layer store: {store.nbytes / 1024 / 1024:.1f} MB for {workers} workers")
+    
+    free_slots = queue.Queue()
+    for slot in range(ring.slots):
+        free_slots.put(slot)
+    results = {}
+    errors = []
+    attempts = {}
+    
+    def submit(punk_id, slot):
+        future = pool.submit(_render_worker, punk_id, slot, unique_backgrounds)
+        future.add_done_callback(lambda f: encoder.submit(encode, slot, f))
+    
+    def encode(slot, future):
+        try:
+            metadata = future.result()
+            if seen is not None and not seen.add(int(metadata['fingerprint'], 16)):
+                # Visual duplicate: render this punk again into the same slot
+                attempts[metadata['id']] = attempts.get(metadata['id'], 1) + 1
+                if attempts[metadata['id']] > MAX_REROLLS:
+                    raise RuntimeError(f"no visually unique punk after {MAX_REROLLS} attempts")
+                submit(metadata['id'], slot)
+                return
+            img = ring.image(slot)
+            record_files(metadata, save_punk(img, metadata['id'], sizes))
+            del img
+            results[metadata['id']] = metadata
+            trait_count = len([v for v in metadata['traits'].values() if v])
+            print(f"  ✓ {metadata['filename']} - {metadata['base'].split('_')[0]} with {trait_count} traits")
+        except Exception as e:
+            errors.append(e)
+        free_slots.put(slot)
+    
+    try:
+        with futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(store and store.handle, ring.handle)) as pool, \
+                futures.ThreadPoolExecutor(max_workers=encoders) as encoder:
+            for punk_id in range(1, count + 1):
+                if errors:
+                    break
+                submit(punk_id, free_slots.get())
+            # Wait for every slot to come back before tearing down the ring
+            for _ in range(ring.slots):
+                free_slots.get()
+    finally:
+        if store:
+            store.close()
+        ring.close()
+    
+    if errors:
+        raise errors[0]
+    return [results[i] for i in sorted(results)]
+
+# Per-thread render state for the thread-pool path (nothing shared is mutated)
+_thread_state = threading.local()
+
+def _init_thread():
+    """Thread initializer: give each render thread its own RNG"""
+    _thread_state.rng = random.Random()
+
+def _render_thread(cache, punk_id, unique_background=False, sizes=(SIZE,), seen=None):
+    """Render and save one punk on a pool thread"""
+    punk_img, metadata = generate_unique_punk(seen, punk_id=punk_id, source=cache,
+                                              rng=_thread_state.rng,
+                                              unique_background=unique_background)
+    record_files(metadata, save_punk(punk_img, punk_id, sizes))
+    return metadata
+
+def _generate_threaded(count, threads, unique_backgrounds=False, from_code=False, atlas=None,
+                       sizes=(SIZE,), seen=None):
+    """Render on a thread pool over one immutable layer cache
+
+    Scales across cores on free-threaded (no-GIL) builds; on a regular build
+    only PNG encoding and PIL compositing run in parallel.
+    """
+    if from_code:
+        # Drawn up front, so the threads share nothing that is filled in while they run
+        cache = SpriteRegistry().snapshot()
+    else:
+        cache = load_atlas(atlas) if atlas else LayerCache.load(ASSETS_DIR, load_catalog())
+    print(f"  Layer cache: {cache.nbytes / 1024 / 1024:.1f} MB shared by {threads} threads")
+    
+    all_metadata = []
+    with futures.ThreadPoolExecutor(max_workers=threads, initializer=_init_thread) as pool:
+        render = lambda punk_id: _render_thread(cache, punk_id, unique_backgrounds, sizes, seen)
+        for metadata in pool.map(render, range(1, count + 1)):
+            all_metadata.append(metadata)
+            trait_count = len([v for v in metadata['traits'].values() if v])
+            print(f"  ✓ {metadata['filename']} - {metadata['base'].split('_')[0]} with {trait_count} traits")
+    return all_metadata
+
+def generate_batch(count=20, workers=None, threads=None, unique_backgrounds=False, from_code=False,
+                   atlas=None, sizes=(SIZE,), dedupe=False, seen_path=None):
+    """Generate a batch of random punks
+
+    With from_code the trait layers are drawn by the generator scripts in
+    memory, so no asset files are needed; with atlas (a path to atlas.json)
+    every layer comes from one sprite sheet. Each punk is rendered once and
+    saved at every size in sizes.
+    
+    With dedupe, punks that render identically to one already generated are
+    rolled again; seen_path keeps those fingerprints across runs.
+    """
     print(f"Generating {count} random punks...")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    if seen_path:
+        seen = FingerprintSet.load(seen_path)
+    else:
+        seen = FingerprintSet() if dedupe else None
     
     all_metadata = []
     
-    for i in range(count):
-        punk_img, metadata = generate_punk(punk_id=i+1)
-        
-        # Save image
-        filename = f"punk_{i+1:04d}.png"
-        punk_img.save(os.path.join(OUTPUT_DIR, filename))
-        
-        metadata['filename'] = filename
-        all_metadata.append(metadata)
-        
-        # Count traits
-        trait_count = len([v for v in metadata['traits'].values() if v])
-        print(f"  ✓ {filename} - {metadata['base'].split('_')[0]} with {trait_count} traits")
+    if workers:
+        all_metadata = _generate_parallel(count, workers, unique_backgrounds=unique_backgrounds,
+                                          from_code=from_code, atlas=atlas, sizes=sizes, seen=seen)
+    elif threads:
+        all_metadata = _generate_threaded(count, threads, unique_backgrounds=unique_backgrounds,
+                                          from_code=from_code, atlas=atlas, sizes=sizes, seen=seen)
+    else:
+        if from_code:
+            source = SpriteRegistry()
+        else:
+            source = load_atlas(atlas) if atlas else None
+        for i in range(count):
+            punk_img, metadata = generate_unique_punk(seen, punk_id=i+1, source=source,
+                                                      unique_background=unique_backgrounds)
+            
+            # Save image
+            record_files(metadata, save_punk(punk_img, i+1, sizes))
+            all_metadata.append(metadata)
+            
+            # Count traits
+            trait_count = len([v for v in metadata['traits'].values() if v])
+            print(f"  ✓ {metadata['filename']} - {metadata['base'].split('_')[0]} with {trait_count} traits")
     
     # Save metadata
     with open(os.path.join(OUTPUT_DIR, 'metadata.json'), 'w') as f:
         json.dump(all_metadata, f, indent=2)
     
+    if seen_path:
+        seen.save(seen_path)
+    
     print(f"\nDone! {count} punks saved to {OUTPUT_DIR}")
     print(f"Metadata saved to {OUTPUT_DIR}/metadata.json")
 
 if __name__ == "__main__":
-    generate_batch(20)
+    parser = argparse.ArgumentParser(description='Generate random punks')
+    parser.add_argument('count', nargs='?', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='render on a process pool sharing one copy of the layers')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='render on a thread pool (scales on free-threaded Python builds)')
+    parser.add_argument('--unique-backgrounds', action='store_true',
+                        help='give every punk its own procedural background')
+    parser.add_argument('--from-code', action='store_true',
+                        help='draw trait layers from the generator scripts instead of asset files')
+    parser.add_argument('--atlas', metavar='INDEX', default=None,
+                        help='load every trait layer from an atlas.json sprite sheet')
+    parser.add_argument('--sizes', type=parse_sizes, default=(SIZE,),
+                        help='comma-separated output sizes, e.g. 32,64,256,1024 (integer scales of 256)')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='re-roll punks that render identically to one already generated')
+    parser.add_argument('--seen', metavar='PATH', default=None,
+                        help='fingerprint file to dedupe against and update (implies --dedupe)')
+    args = parser.parse_args()
+    generate_batch(args.count, workers=args.workers, threads=args.threads,
+                   unique_backgrounds=args.unique_backgrounds, from_code=args.from_code,
+                   atlas=args.atlas, sizes=args.sizes, dedupe=args.dedupe, seen_path=args.seen)
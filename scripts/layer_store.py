@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Read-only trait layer stores for parallel rendering
+Every trait layer is decoded once and cropped to its visible area. LayerCache
+keeps them in-process for thread pools; SharedLayerStore packs them into a
+single shared memory segment that worker processes attach to zero-copy
+"""
+
+from types import MappingProxyType
+import os
+
+from coverage import sprite_masks
+from lazy_import import lazy_import
+
+Image = lazy_import('PIL.Image')
+shared_memory = lazy_import('multiprocessing.shared_memory')
+np = lazy_import('numpy')
+
+# Background images are opaque, everything else is cropped to its alpha bbox
+OPAQUE_CATEGORIES = ('backgrounds',)
+
+def decode_layer(path, crop=True):
+    """Decode a layer PNG to RGBA, returning (pixels, (x, y)) or None if empty"""
+    img = Image.open(path).convert('RGBA')
+    if not crop:
+        return np.asarray(img), (0, 0)
+    bbox = img.getbbox()
+    if bbox is None:
+        return None
+    return np.asarray(img.crop(bbox)), (bbox[0], bbox[1])
+
+def freeze_catalog(catalog):
+    """Immutable copy of a {category: [trait, ...]} catalog"""
+    return MappingProxyType({
+        category: tuple(MappingProxyType(dict(trait)) for trait in traits)
+        for category, traits in catalog.items()
+    })
+
+class LayerCache:
+    """Immutable in-process layer cache, safe to share between threads
+
+    Everything is decoded, and every layer's coverage masks computed, up
+    front and never modified afterwards, so render threads only ever read
+    from it and need no locking.
+    """
+
+    def __init__(self, catalog, sprites):
+        self.catalog = freeze_catalog(catalog)
+        self._sprites = MappingProxyType(sprites)
+        self._masks = MappingProxyType(sprite_masks(sprites))
+
+    @classmethod
+    def load(cls, assets_dir, catalog):
+        """Decode every layer in catalog ({category: [trait, ...]})"""
+        sprites = {}
+        for category, traits in catalog.items():
+            for trait in traits:
+                path = os.path.join(assets_dir, category, trait['filename'])
+                if not os.path.exists(path):
+                    continue
+                layer = decode_layer(path, crop=category not in OPAQUE_CATEGORIES)
+                if layer is None:
+                    continue
+                pixels, origin = layer
+                sprites[(category, trait['filename'])] = (Image.fromarray(pixels), origin)
+        return cls(catalog, sprites)
+
+    @property
+    def nbytes(self):
+        return sum(img.width * img.height * 4 for img, _ in self._sprites.values())
+
+    def traits(self, category):
+        """Traits in a category, same shape as get_traits()"""
+        return self.catalog.get(category, ())
+
+    def sprite(self, category, filename):
+        """Return (image, (x, y)) for a layer, or None if it has no pixels
+
+        The image is shared; callers must only read from it.
+        """
+        return self._sprites.get((category, filename))
+
+    def masks(self, category, filename):
+        """(visible, opaque) coverage bitmasks of a layer; (0, 0) if it has no pixels"""
+        return self._masks.get((category, filename), (0, 0))
+
+class SharedLayerStore:
+    """Decoded trait layers living in one shared memory segment
+
+    The process that builds the store owns the segment and must call close()
+    when done; workers attach() with the handle and only ever read from it.
+    """
+
+    def __init__(self, shm, catalog, entries, masks, owner=False):
+        self.shm = shm
+        self.catalog = catalog
+        self.entries = entries
+        self.layer_masks = masks
+        self.owner = owner
+        self._sprites = {}
+        for key, (offset, shape, origin) in entries.items():
+            pixels = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+            pixels.flags.writeable = False
+            self._sprites[key] = (pixels, origin)
+
+    @classmethod
+    def create(cls, assets_dir, catalog):
+        """Decode every layer in catalog ({category: [trait, ...]}) into a new segment"""
+        decoded = {}
+        for category, traits in catalog.items():
+            for trait in traits:
+                path = os.path.join(assets_dir, category, trait['filename'])
+                if not os.path.exists(path):
+                    continue
+                layer = decode_layer(path, crop=category not in OPAQUE_CATEGORIES)
+                if layer is None:
+                    continue
+                decoded[(category, trait['filename'])] = layer
+        return cls.pack(catalog, decoded)
+
+    @classmethod
+    def from_source(cls, source, categories):
+        """Copy every sprite of another layer source (e.g. an atlas) into a new segment"""
+        catalog = {category: [dict(trait) for trait in source.traits(category)]
+                   for category in categories}
+        decoded = {}
+        for category, traits in catalog.items():
+            for trait in traits:
+                layer = source.sprite(category, trait['filename'])
+                if layer is not None:
+                    img, origin = layer
+                    decoded[(category, trait['filename'])] = (np.asarray(img.convert('RGBA')), origin)
+        return cls.pack(catalog, decoded)
+
+    @classmethod
+    def pack(cls, catalog, decoded):
+        """Lay out {(category, filename): (pixels, origin)} in a new segment, measuring coverage once"""
+        total = sum(pixels.nbytes for pixels, _ in decoded.values())
+        shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        entries = {}
+        offset = 0
+        for key, (pixels, origin) in decoded.items():
+            view = np.ndarray(pixels.shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+            view[:] = pixels
+            entries[key] = (offset, pixels.shape, origin)
+            offset += pixels.nbytes
+        masks = sprite_masks({key: (Image.fromarray(pixels), origin)
+                              for key, (pixels, origin) in decoded.items()})
+        return cls(shm, catalog, entries, masks, owner=True)
+
+    @classmethod
+    def attach(cls, handle):
+        """Attach to a store created in another process"""
+        name, catalog, entries, masks = handle
+        return cls(shared_memory.SharedMemory(name=name), catalog, entries, masks)
+
+    @property
+    def handle(self):
+        """Picklable (name, catalog, entries, masks) tuple for attach()"""
+        return (self.shm.name, self.catalog, self.entries, self.layer_masks)
+
+    @property
+    def nbytes(self):
+        return sum(pixels.nbytes for pixels, _ in self._sprites.values())
+
+    def traits(self, category):
+        """Traits in a category, same shape as get_traits()"""
+        return self.catalog.get(category, [])
+
+    def sprite(self, category, filename):
+        """Return (image, (x, y)) for a layer, or None if it has no pixels"""
+        entry = self._sprites.get((category, filename))
+        if entry is None:
+            return None
+        pixels, origin = entry
+        h, w = pixels.shape[:2]
+        return Image.frombuffer('RGBA', (w, h), pixels, 'raw', 'RGBA', 0, 1), origin
+
+    def masks(self, category, filename):
+        """(visible, opaque) coverage bitmasks of a layer; (0, 0) if it has no pixels"""
+        return self.layer_masks.get((category, filename), (0, 0))
+
+    def close(self):
+        """Release the segment (and unlink it if this process created it)"""
+        self._sprites.clear()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
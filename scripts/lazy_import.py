@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Deferred imports for heavy dependencies
+PIL, numpy and the process pool machinery account for nearly all of the
+render library's import time; modules bind them through lazy_import() so
+they are only loaded the first time an attribute is actually used
+"""
+
+import importlib
+import types
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that imports it on first attribute access
+
+    The real import goes through importlib, whose per-module locks make the
+    first access safe from several threads at once. Afterwards the module's
+    namespace is copied in, so later lookups are plain attribute reads.
+    """
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+def lazy_import(name):
+    """Return a stand-in for module name that imports it when first used"""
+    return LazyModule(name)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Bulk loader for generated collections into the avatars table
+Streams metadata.json (or JSON lines) written by generate_random_punks and
+the PNGs beside it into rows of the avatars schema in server.js. The rows go
+out as PostgreSQL COPY text (to a file, stdout or straight into psql) or
+into a SQLite stand-in with batched inserts in large transactions. Avatar IDs
+are derived from the traits and rows whose ID is already present are
+skipped, so loading the same collection twice adds nothing
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+
+from avatar_codec import encode
+from fingerprint import fingerprint, to_hex
+from generate_random_punks import OUTPUT_DIR
+from lazy_import import lazy_import
+from multires import avatar_key
+from reservoir import mint_traits
+
+Image = lazy_import('PIL.Image')
+argparse = lazy_import('argparse')
+
+COLUMNS = ('id', 'agent_id', 'agent_name', 'filename', 'traits', 'image_data', 'fingerprint')
+
+# SQLite stand-in for the table server.js creates
+SQLITE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS avatars (
+  id TEXT PRIMARY KEY,
+  agent_id TEXT,
+  agent_name VARCHAR(255),
+  filename VARCHAR(255) NOT NULL,
+  traits TEXT NOT NULL,
+  image_data TEXT,
+  fingerprint VARCHAR(16),
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+'''
+
+# Rows per SQLite transaction
+BATCH = 10000
+
+# Namespace for avatar IDs derived from traits
+AVATAR_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'agent-avatars')
+
+def read_punks(path):
+    """Punk metadata from a metadata.json array or a JSON lines file"""
+    with open(path) as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+def avatar_rows(punks, image_dir, compact=False):
+    """A tuple of COLUMNS per punk; agent columns stay NULL until an agent claims it
+
+    image_data is the base64 PNG that server.js serves, or with compact the
+    base64 avatar_codec encoding that the Python tools read.
+    """
+    for punk in punks:
+        path = os.path.join(image_dir, punk['filename'])
+        with open(path, 'rb') as f:
+            png = f.read()
+        fp = punk.get('fingerprint')
+        if compact or fp is None:
+            img = Image.open(path)
+            img.load()
+            fp = fp or to_hex(fingerprint(img))
+            data = encode(img, punk['background']) if compact else png
+        else:
+            data = png
+        avatar_id = str(uuid.uuid5(AVATAR_NAMESPACE, avatar_key(punk)))
+        yield (avatar_id, None, None, f'avatar_{avatar_id}.png',
+               json.dumps(mint_traits(punk), separators=(',', ':')),
+               base64.b64encode(data).decode('ascii'), fp)
+
+def copy_field(value):
+    """A value in PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def write_copy(rows, f):
+    """Write rows as COPY text; returns (rows, bytes) written"""
+    count = size = 0
+    for row in rows:
+        line = '\t'.join(copy_field(value) for value in row) + '\n'
+        f.write(line)
+        count += 1
+        size += len(line)
+    return count, size
+
+def load_psql(rows, dsn):
+    """Stream rows into PostgreSQL in a single transaction; returns (inserted, rows, bytes)
+
+    COPY goes into a temporary staging table that is merged with ON CONFLICT
+    DO NOTHING, so rows already loaded (or repeated in the input) are
+    skipped instead of aborting the load.
+    """
+    columns = ', '.join(COLUMNS)
+    commands = [
+        'BEGIN',
+        'CREATE TEMP TABLE avatars_staging (LIKE avatars INCLUDING DEFAULTS) ON COMMIT DROP',
+        f'\\copy avatars_staging ({columns}) FROM pstdin',
+        f'INSERT INTO avatars ({columns}) SELECT {columns} FROM avatars_staging ON CONFLICT DO NOTHING',
+        'COMMIT',
+    ]
+    command = ['psql', dsn, '-X', '-v', 'ON_ERROR_STOP=1']
+    for sql in commands:
+        command += ['-c', sql]
+    psql = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        written = write_copy(rows, psql.stdin)
+    finally:
+        psql.stdin.close()
+    output = psql.stdout.read()
+    if psql.wait():
+        raise SystemExit(f"psql exited with status {psql.returncode}")
+    # The merge reports "INSERT 0 <rows inserted>"
+    inserted = next(int(line.split()[-1]) for line in output.splitlines() if line.startswith('INSERT '))
+    return (inserted,) + written
+
+def load_sqlite(rows, path, batch=BATCH):
+    """Insert rows into a SQLite stand-in, batch rows per transaction; returns (inserted, rows, bytes)
+
+    Rows whose id or fingerprint is already present are skipped.
+    """
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute('PRAGMA journal_mode = WAL')
+    db.execute('PRAGMA synchronous = NORMAL')
+    db.execute(SQLITE_SCHEMA)
+    # Unique like the index server.js creates, so visual duplicates are skipped too
+    db.execute('DROP INDEX IF EXISTS avatars_fingerprint_idx')
+    db.execute('CREATE UNIQUE INDEX IF NOT EXISTS avatars_fingerprint_key ON avatars (fingerprint)')
+    insert = (f"INSERT OR IGNORE INTO avatars ({', '.join(COLUMNS)}) "
+              f"VALUES ({', '.join('?' * len(COLUMNS))})")
+    changes = db.total_changes
+    count = size = 0
+    pending = []
+    for row in rows:
+        pending.append(row)
+        if len(pending) == batch:
+            size += _insert_batch(db, insert, pending)
+            count += len(pending)
+            pending = []
+    if pending:
+        size += _insert_batch(db, insert, pending)
+        count += len(pending)
+    inserted = db.total_changes - changes
+    db.close()
+    return inserted, count, size
+
+def _insert_batch(db, insert, rows):
+    db.execute('BEGIN')
+    db.executemany(insert, rows)
+    db.execute('COMMIT')
+    return sum(len(value) for row in rows for value in row if value)
+
+def main(metadata_path=os.path.join(OUTPUT_DIR, 'metadata.json'), image_dir=None, copy_path=None,
+         sqlite_path=None, dsn=None, compact=False):
+    image_dir = image_dir or os.path.dirname(metadata_path)
+    rows = avatar_rows(read_punks(metadata_path), image_dir, compact)
+    start = time.perf_counter()
+    inserted = None
+    if sqlite_path:
+        target = sqlite_path
+        inserted, count, size = load_sqlite(rows, sqlite_path)
+    elif dsn:
+        target = 'PostgreSQL'
+        inserted, count, size = load_psql(rows, dsn)
+    elif copy_path and copy_path != '-':
+        target = copy_path
+        with open(copy_path, 'w') as f:
+            count, size = write_copy(rows, f)
+    else:
+        target = 'stdout'
+        count, size = write_copy(rows, sys.stdout)
+    elapsed = time.perf_counter() - start
+
+    if inserted is None:
+        summary = f"Wrote {count} avatars to {target}"
+    else:
+        summary = f"Loaded {inserted} avatars into {target} ({count - inserted} of {count} already present)"
+    print(f"{summary} in {elapsed:.2f}s "
+          f"({count / max(elapsed, 1e-9):.0f} rows/s, {size / 1024 / 1024 / max(elapsed, 1e-9):.1f} MB/s)",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Bulk load a generated collection into the avatars table')
+    parser.add_argument('metadata', nargs='?', default=os.path.join(OUTPUT_DIR, 'metadata.json'),
+                        help='metadata.json or .jsonl written by generate_random_punks')
+    parser.add_argument('--images', default=None, help='directory the filenames are relative to')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--copy', metavar='PATH', default=None,
+                        help='write COPY text to PATH (default: stdout)')
+    target.add_argument('--sqlite', metavar='PATH', default=None, help='load into a SQLite database')
+    target.add_argument('--psql', metavar='DSN', default=None, help='load into PostgreSQL through psql')
+    parser.add_argument('--compact', action='store_true',
+                        help='store image_data in the avatar_codec encoding instead of PNG')
+    args = parser.parse_args()
+    main(args.metadata, args.images, args.copy, args.sqlite, args.psql, args.compact)
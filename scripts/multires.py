@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Multi-resolution avatar output
+Every size is an integer scale of the 256x256 canvas: larger sizes repeat
+each pixel (no blur). Smaller sizes average whole pixel boxes when the
+factor divides the 10px block, so a box never straddles two cells;
+otherwise (64px and 32px) every output pixel takes the color of the cell
+under the center of its box, so cells come out 2-3px wide but colors never
+blend across block edges. avatar_key hashes what an avatar looks like, so
+renders can be cached per size
+"""
+
+import hashlib
+import json
+
+from lazy_import import lazy_import
+from rasterizer import BLOCK
+
+Image = lazy_import('PIL.Image')
+
+CANVAS = 256
+
+# Favicon, chat avatars, thumbnails, the canvas itself and print sizes
+SIZES = (32, 64, 128, 256, 512, 1024)
+
+def check_size(size, canvas=CANVAS):
+    """Raise ValueError unless size is an integer multiple or divisor of the canvas"""
+    if size <= 0 or (size % canvas and canvas % size):
+        raise ValueError(f'{size}px is not an integer scale of the {canvas}px canvas')
+
+def parse_sizes(text):
+    """Parse '32,64,256' into a sorted tuple of validated sizes"""
+    sizes = sorted({int(part) for part in text.split(',') if part.strip()})
+    for size in sizes:
+        check_size(size)
+    return tuple(sizes)
+
+def scale(img, size):
+    """Scale a canvas-sized image to size by an exact integer factor"""
+    check_size(size, img.width)
+    if size == img.width:
+        return img
+    if size > img.width:
+        return img.resize((size, size), Image.Resampling.NEAREST)
+    factor = img.width // size
+    if BLOCK % factor == 0:
+        return img.reduce(factor)
+    # NEAREST samples the center of each factor x factor box
+    return img.resize((size, size), Image.Resampling.NEAREST)
+
+def render_sizes(img, sizes):
+    """{size: image} for every requested size of one rendered canvas"""
+    return {size: scale(img, size) for size in sizes}
+
+def avatar_key(metadata):
+    """Stable hash of everything that determines how an avatar looks"""
+    canonical = json.dumps({
+        'base': metadata['base'],
+        'background': metadata['background'],
+        'traits': {k: v for k, v in metadata['traits'].items() if v},
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
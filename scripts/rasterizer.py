@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Logical-grid rasterizer for the block-art generators
+Sprites are painted one cell per "pixel" into a small RGBA grid with
+vectorized block, row, column and rectangle fills, then expanded to the
+256x256 canvas in a single step
+"""
+
+from functools import lru_cache
+
+from lazy_import import lazy_import
+
+Image = lazy_import('PIL.Image')
+ImageColor = lazy_import('PIL.ImageColor')
+np = lazy_import('numpy')
+
+# Canvas size
+SIZE = 256
+
+# Pixel block size (each logical cell is BLOCK x BLOCK real pixels)
+BLOCK = 10
+
+# Logical grid size; the last row and column are only partly on the canvas
+GRID = -(-SIZE // BLOCK)
+
+@lru_cache(maxsize=None)
+def rgba(color):
+    """Resolve a fill color exactly as ImageDraw does on an RGBA image"""
+    if isinstance(color, str):
+        return ImageColor.getcolor(color, 'RGBA')
+    if len(color) == 3:
+        return tuple(color) + (255,)
+    return tuple(color)
+
+class Grid:
+    """A sprite on the logical block grid
+
+    Fills replace cells outright (no blending), matching ImageDraw.rectangle,
+    and anything outside the grid is clipped the way the canvas clips it.
+    """
+
+    def __init__(self, size=GRID):
+        self.pixels = np.zeros((size, size, 4), dtype=np.uint8)
+
+    @classmethod
+    def from_image(cls, img, block=BLOCK, strict=False):
+        """Sample a block-art image back onto the logical grid (one pixel per cell)
+
+        With strict, raise ValueError unless every cell is a single color,
+        i.e. the image converts back to exactly the same pixels.
+        """
+        pixels = np.asarray(img.convert('RGBA'))
+        grid = cls(-(-pixels.shape[0] // block))
+        grid.pixels[:] = pixels[::block, ::block]
+        if strict:
+            expanded = grid.pixels.repeat(block, axis=0).repeat(block, axis=1)
+            if not np.array_equal(expanded[:pixels.shape[0], :pixels.shape[1]], pixels):
+                raise ValueError(f'image is not aligned to {block}px blocks')
+        return grid
+
+    def rect(self, x0, y0, x1, y1, color):
+        """Fill cells x0 <= x < x1, y0 <= y < y1"""
+        size = self.pixels.shape[0]
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, size), min(y1, size)
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = rgba(color)
+
+    def block(self, x, y, color):
+        """Fill a single cell"""
+        self.rect(x, y, x + 1, y + 1, color)
+
+    def row(self, y, x0, x1, color):
+        """Fill cells x0 <= x < x1 on row y"""
+        self.rect(x0, y, x1, y + 1, color)
+
+    def col(self, x, y0, y1, color):
+        """Fill cells y0 <= y < y1 in column x"""
+        self.rect(x, y0, x + 1, y1, color)
+
+    def cells(self, points, color):
+        """Fill every (x, y) cell in points"""
+        size = self.pixels.shape[0]
+        points = [(x, y) for x, y in points if 0 <= x < size and 0 <= y < size]
+        if points:
+            xs, ys = zip(*points)
+            self.pixels[list(ys), list(xs)] = rgba(color)
+
+    def to_image(self, block=BLOCK, size=SIZE):
+        """Expand to a size x size RGBA image with block x block cells"""
+        expanded = self.pixels.repeat(block, axis=0).repeat(block, axis=1)[:size, :size]
+        return Image.fromarray(np.ascontiguousarray(expanded))
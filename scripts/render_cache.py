@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for rendered avatars
+An avatar is a pure function of its traits, the layer art and the code that
+draws it, so its PNG is stored under a hash of the canonical trait tuple,
+the output size, the asset bundle version and the rendering code. Identical
+avatars share one file, new art or a changed generator or background starts
+a fresh key space, and the store stays under a size limit by evicting the
+least recently used files. Hot entries are also kept in memory
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import os
+import threading
+
+from build_assets import GENERATORS
+from lazy_import import lazy_import
+from multires import avatar_key
+
+argparse = lazy_import('argparse')
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'faces')
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'generated', 'renders')
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules whose code decides what a render looks like besides the layer art:
+# compositing, culling, resizing, backgrounds and (for --from-code) the trait generators
+RENDER_MODULES = [
+    'generate_random_punks',
+    'composite',
+    'coverage',
+    'multires',
+    'layer_store',
+    'atlas',
+    'sprite_registry',
+    'rasterizer',
+    'background_engine',
+    'generate_backgrounds',
+    *GENERATORS,
+]
+
+# Disk and in-memory limits
+MAX_BYTES = 512 * 1024 * 1024
+HOT_BYTES = 32 * 1024 * 1024
+
+def layer_files(assets_dir=ASSETS_DIR):
+    """Path of every layer PNG under assets_dir, by category and filename (none if it is missing)"""
+    paths = []
+    if not os.path.isdir(assets_dir):
+        return paths
+    for category in sorted(os.listdir(assets_dir)):
+        category_dir = os.path.join(assets_dir, category)
+        if not os.path.isdir(category_dir):
+            continue
+        paths += [os.path.join(category_dir, filename) for filename in sorted(os.listdir(category_dir))
+                  if filename.endswith('.png')]
+    return paths
+
+def content_hash(paths, root):
+    """Hash of the files' contents, each named by its path relative to root"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            file_hash = hashlib.sha256(f.read()).hexdigest()
+        digest.update(f'{os.path.relpath(path, root)}:{file_hash}\n'.encode())
+    return digest.hexdigest()[:16]
+
+@lru_cache(maxsize=None)
+def bundle_version(assets_dir=ASSETS_DIR):
+    """Hash of every layer PNG under assets_dir, by category and filename
+
+    Rebuilding identical art keeps the version; changing any layer changes it.
+    """
+    return content_hash(layer_files(assets_dir), assets_dir)
+
+@lru_cache(maxsize=None)
+def code_version():
+    """Hash of the RENDER_MODULES sources, fixed for the life of the process like the code it runs"""
+    return content_hash([os.path.join(SCRIPTS_DIR, f'{name}.py') for name in RENDER_MODULES], SCRIPTS_DIR)
+
+@lru_cache(maxsize=None)
+def render_version(assets_dir=ASSETS_DIR):
+    """Version part of render keys: the asset bundle plus the code that draws and composites it
+
+    Reads every layer PNG and module the first time; long-running services
+    should call it once at startup rather than on a request path.
+    """
+    return hashlib.sha256(f'{bundle_version(assets_dir)}/{code_version()}'.encode()).hexdigest()[:16]
+
+def render_key(metadata, size, version=None):
+    """Content address of an avatar at one size under one asset bundle and renderer"""
+    version = version or render_version()
+    return hashlib.sha256(f'{version}/{size}/{avatar_key(metadata)}'.encode()).hexdigest()[:32]
+
+class RenderCache:
+    """PNG bytes by render key: an LRU hot tier in memory over an LRU store on disk
+
+    Disk recency is the file mtime, touched on every hit, so the store can be
+    shared by several processes; each one tracks the total size it has seen
+    and evicts the oldest files when it goes over max_bytes.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES, hot_bytes=HOT_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hot_bytes = hot_bytes
+        self.hits = self.misses = 0
+        self._hot = OrderedDict()
+        self._hot_size = 0
+        self._disk_size = None
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], f'{key}.png')
+
+    def get(self, key):
+        """Stored PNG bytes for key, or None"""
+        with self._lock:
+            data = self._hot.get(key)
+            if data is not None:
+                self._hot.move_to_end(key)
+                self.hits += 1
+                return data
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Missing, or evicted by another process between open and utime
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        """Store PNG bytes atomically (concurrent writers of one key are harmless)"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._remember(key, data)
+            if self._disk_size is None:
+                self._disk_size = self._scan()[1]
+            else:
+                self._disk_size += len(data)
+            if self._disk_size > self.max_bytes:
+                self.prune()
+
+    def _remember(self, key, data):
+        if key in self._hot:
+            self._hot_size -= len(self._hot.pop(key))
+        if len(data) > self.hot_bytes:
+            return
+        self._hot[key] = data
+        self._hot_size += len(data)
+        while self._hot_size > self.hot_bytes:
+            _, old = self._hot.popitem(last=False)
+            self._hot_size -= len(old)
+
+    def _scan(self):
+        """([(mtime, size, path), ...], total bytes) for every stored file"""
+        files = []
+        for entry in os.scandir(self.root):
+            if not entry.is_dir():
+                continue
+            for item in os.scandir(entry.path):
+                if item.name.endswith('.png'):
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+        return files, sum(size for _, size, _ in files)
+
+    def prune(self):
+        """Delete the least recently used files until the store is at 90% of its limit"""
+        files, total = self._scan()
+        files.sort()
+        target = self.max_bytes * 9 // 10
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+        self._disk_size = total
+
+    def stats(self):
+        """Entry count and bytes on disk, plus this instance's hit counts"""
+        files, total = self._scan() if os.path.isdir(self.root) else ([], 0)
+        return {'files': len(files), 'bytes': total, 'hot_entries': len(self._hot),
+                'hot_bytes': self._hot_size, 'hits': self.hits, 'misses': self.misses}
+
+@lru_cache(maxsize=None)
+def default_cache():
+    """The process-wide cache renderers use unless given one"""
+    return RenderCache()
+
+def main(root=CACHE_DIR, max_bytes=None):
+    cache = RenderCache(root, max_bytes=max_bytes or MAX_BYTES)
+    print(f"Asset bundle version: {bundle_version()}, rendering code: {code_version()}")
+    if max_bytes and os.path.isdir(root):
+        cache.prune()
+        print(f"Pruned to {max_bytes / 1024 / 1024:.0f} MB")
+    stats = cache.stats()
+    print(f"{root}: {stats['files']} renders, {stats['bytes'] / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Inspect or prune the render cache')
+    parser.add_argument('--root', default=CACHE_DIR)
+    parser.add_argument('--prune', type=int, metavar='MB', default=None,
+                        help='evict least recently used renders down to MB')
+    args = parser.parse_args()
+    main(args.root, max_bytes=args.prune and args.prune * 1024 * 1024)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+HTTP render service
+A small asyncio HTTP/1.1 server on the stdlib:
+
+  GET /render?traits={"base": ..., "eyes": ...}&size=256
+  GET /render/seed/<n>?size=256
+
+Compositing and PNG encoding run on a thread pool; decoded layers, seed
+lookups and rendered PNGs stay in memory. Every response carries a strong
+ETag derived from the trait hash and render version, so clients and
+CDNs revalidate with If-None-Match and get a 304 without a render
+"""
+
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+
+from generate_random_punks import SIZE, pick_traits, render_pngs
+from lazy_import import lazy_import
+from multires import check_size
+from render_cache import render_key, render_version
+from render_worker import Renderer, traits_metadata
+
+argparse = lazy_import('argparse')
+futures = lazy_import('concurrent.futures')
+
+HOST = '127.0.0.1'
+PORT = 8077
+
+# Seeds whose traits are remembered, so repeat requests skip pick_traits
+SEED_CACHE = 65536
+
+# Renders depend on the asset bundle, which the URL does not name
+CACHE_CONTROL = 'public, max-age=3600'
+
+# Longest request line or header accepted
+MAX_LINE = 8 * 1024
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+def etag_matches(header, etag):
+    """Whether an If-None-Match header names etag (weak comparison, as RFC 9110 says)"""
+    if header is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return '*' in tags or etag in tags
+
+class RenderService:
+    """Routes requests to the renderer; CPU work goes to an executor"""
+
+    def __init__(self, renderer=None, threads=None):
+        self.renderer = renderer or Renderer()
+        self.executor = futures.ThreadPoolExecutor(threads or os.cpu_count())
+        self._seeds = OrderedDict()
+        self._seeds_lock = threading.Lock()
+        # Set by serve() off the event loop; hashing the assets reads every layer PNG
+        self.version = None
+
+    def seed_metadata(self, seed):
+        """Punk metadata for a seed, without rendering it"""
+        with self._seeds_lock:
+            metadata = self._seeds.get(seed)
+            if metadata is not None:
+                self._seeds.move_to_end(seed)
+                return metadata
+        metadata = pick_traits(source=self.renderer.source, rng=random.Random(seed))
+        with self._seeds_lock:
+            self._seeds[seed] = metadata
+            if len(self._seeds) > SEED_CACHE:
+                self._seeds.popitem(last=False)
+        return metadata
+
+    def render(self, metadata, size):
+        return render_pngs(metadata, (size,), self.renderer.source, self.renderer.cache)[size]
+
+    async def respond(self, method, target, headers):
+        """(status, headers, body) for one request"""
+        if method not in ('GET', 'HEAD'):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        try:
+            size = int(query.get('size', [SIZE])[0])
+            check_size(size)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+
+        loop = asyncio.get_running_loop()
+        if url.path == '/render':
+            try:
+                traits = json.loads(query['traits'][0])
+                metadata = traits_metadata(traits, self.renderer.source)
+            except (KeyError, ValueError, TypeError, AttributeError) as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f'bad traits: {e}')
+        elif url.path.startswith('/render/seed/'):
+            try:
+                seed = int(unquote(url.path.removeprefix('/render/seed/')))
+            except ValueError:
+                raise HTTPError(HTTPStatus.NOT_FOUND)
+            metadata = await loop.run_in_executor(self.executor, self.seed_metadata, seed)
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+
+        etag = f'"{render_key(metadata, size, self.version)}"'
+        response_headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
+        if etag_matches(headers.get('if-none-match'), etag):
+            return HTTPStatus.NOT_MODIFIED, response_headers, b''
+        body = await loop.run_in_executor(self.executor, self.render, metadata, size)
+        response_headers['Content-Type'] = 'image/png'
+        return HTTPStatus.OK, response_headers, body
+
+    async def handle(self, reader, writer):
+        """Serve one connection, keeping it open between requests unless asked not to"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self.send(writer, 'HEAD', HTTPStatus.BAD_REQUEST, {}, b'')
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if 'content-length' in headers:
+                    await reader.readexactly(int(headers['content-length']))
+
+                try:
+                    status, response_headers, body = await self.respond(method, target, headers)
+                except HTTPError as e:
+                    status, response_headers = e.status, {'Content-Type': 'text/plain; charset=utf-8'}
+                    body = f'{e}\n'.encode()
+                except Exception as e:
+                    print(f"render_server: {method} {target}: {e!r}", file=sys.stderr)
+                    status, response_headers = HTTPStatus.INTERNAL_SERVER_ERROR, {}
+                    body = b''
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                if not keep_alive:
+                    response_headers['Connection'] = 'close'
+                await self.send(writer, method, status, response_headers, body)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, method, status, headers, body):
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        lines.append(f'Content-Length: {len(body)}')
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        writer.write(head if method == 'HEAD' else head + body)
+        await writer.drain()
+
+async def serve(host=HOST, port=PORT, threads=None):
+    service = RenderService(threads=threads)
+    service.version = await asyncio.get_running_loop().run_in_executor(service.executor, render_version)
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_LINE, backlog=1024)
+    address = server.sockets[0].getsockname()
+    print(f"Render server on http://{address[0]}:{address[1]}", file=sys.stderr, flush=True)
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve avatar renders over HTTP')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--threads', type=int, default=None, help='render threads (default: CPU count)')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.threads))
+    except KeyboardInterrupt:
+        pass
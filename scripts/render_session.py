@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Incremental re-rendering for interactive previews
+A RenderSession keeps the canvas as it stood after each layer was painted.
+Swapping one trait repaints only that layer and the ones above it, and only
+inside the area covered by the old or the new version of the layer, so a
+"try a different hat" preview costs a few small pastes instead of a full
+composite
+"""
+
+import random
+import statistics
+import time
+
+from generate_random_punks import (
+    ASSETS_DIR,
+    BACKGROUNDS,
+    LAYER_ORDER,
+    SIZE,
+    composite_layers,
+    create_canvas,
+    generate_punk,
+    load_catalog,
+    load_layer,
+)
+from layer_store import LayerCache
+from lazy_import import lazy_import
+
+argparse = lazy_import('argparse')
+
+# Every layer slot above the background, bottom to top
+SLOTS = ['base'] + LAYER_ORDER
+
+def layer_box(layer):
+    """Canvas rectangle covered by the visible pixels of a (image, (x, y)) layer, or None"""
+    if layer is None:
+        return None
+    img, (x, y) = layer
+    bbox = img.getbbox()
+    if bbox is None:
+        return None
+    return (max(0, x + bbox[0]), max(0, y + bbox[1]),
+            min(SIZE, x + bbox[2]), min(SIZE, y + bbox[3]))
+
+def union(a, b):
+    """Smallest rectangle containing both boxes (either may be None)"""
+    if a is None or b is None:
+        return a or b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+class RenderSession:
+    """One punk being edited a trait at a time
+
+    image always matches what composite_layers would produce for the
+    current traits. Unlike composite_layers, layers hidden by later ones are
+    still painted, since a later swap can uncover them. Only slots holding a
+    layer keep an up-to-date canvas; an empty slot's canvas is refreshed
+    when a trait is put there.
+    """
+
+    def __init__(self, base, layers, bg_filename=None, bg_color='cream', source=None):
+        if source is None:
+            source = LayerCache.load(ASSETS_DIR, load_catalog())
+        self.source = source
+        self._traits = {'base': base}
+        self._traits.update({category: layers.get(category) for category in LAYER_ORDER})
+        self._layers = [self._load(category) for category in SLOTS]
+        self._boxes = [layer_box(layer) for layer in self._layers]
+        self.set_background(bg_filename, bg_color)
+
+    @classmethod
+    def from_metadata(cls, metadata, source=None):
+        """Session for a punk as recorded by generate_punk"""
+        background = metadata['background']
+        # Legacy punks record a color name instead of a background file
+        bg_filename, bg_color = (None, background) if background in BACKGROUNDS else (background, None)
+        return cls(metadata['base'], metadata['traits'], bg_filename=bg_filename,
+                   bg_color=bg_color, source=source)
+
+    @property
+    def image(self):
+        """The current render; shared with the session, so callers must only read from it"""
+        return self._below(len(SLOTS))
+
+    @property
+    def traits(self):
+        """Current trait filenames by category (the base under 'base')"""
+        return {category: filename for category, filename in self._traits.items() if filename}
+
+    def _load(self, category):
+        filename = self._traits[category]
+        return load_layer(category, filename, self.source) if filename else None
+
+    def set_background(self, bg_filename=None, bg_color='cream'):
+        """Change the background; everything is repainted since it fills the canvas"""
+        self.background = (bg_filename, bg_color)
+        self._canvas = create_canvas(bg_filename, bg_color, self.source).convert('RGBA')
+        self._canvases = [self._canvas.copy() if layer else None for layer in self._layers]
+        self._repaint(0, (0, 0, SIZE, SIZE))
+
+    def set_trait(self, category, filename):
+        """Swap one trait (filename None removes it) and update the render
+
+        Returns the repainted rectangle, or None if nothing could change.
+        """
+        if category not in self._traits:
+            raise ValueError(f'Unknown trait category: {category}')
+        if category == 'base' and not filename:
+            raise ValueError('A punk needs a base')
+        k = SLOTS.index(category)
+        old_box = self._boxes[k]
+        self._traits[category] = filename
+        layer = self._load(category)
+        if layer and not self._layers[k]:
+            self._canvases[k] = self._below(k).copy()
+        self._layers[k] = layer
+        self._boxes[k] = layer_box(layer)
+        region = union(old_box, self._boxes[k])
+        if region is not None:
+            self._repaint(k, region)
+        return region
+
+    def _below(self, k):
+        """Canvas as it stands under slot k: that of the nearest filled slot below"""
+        for i in range(k - 1, -1, -1):
+            if self._layers[i]:
+                return self._canvases[i]
+        return self._canvas
+
+    def _repaint(self, k, region):
+        """Recomposite slots k..end inside region, starting from the canvas below slot k"""
+        rx, ry, rx1, ry1 = region
+        patch = self._below(k).crop(region)
+        for i in range(k, len(SLOTS)):
+            layer = self._layers[i]
+            if not layer:
+                continue
+            box = self._boxes[i]
+            if box and box[0] < rx1 and box[2] > rx and box[1] < ry1 and box[3] > ry:
+                img, (x, y) = layer
+                patch.paste(img, (x - rx, y - ry), img)
+            self._canvases[i].paste(patch, region)
+
+def main(swaps=200, category='headwear', seed=None):
+    source = LayerCache.load(ASSETS_DIR, load_catalog())
+    rng = random.Random(seed)
+    _, metadata = generate_punk(source=source, rng=rng)
+    session = RenderSession.from_metadata(metadata, source)
+    options = [trait['filename'] for trait in source.traits(category)]
+    if category != 'base':
+        options.append(None)
+
+    print(f"Swapping {category} {swaps} times on punk with {', '.join(session.traits.values())}...")
+    incremental = []
+    full = []
+    for _ in range(swaps):
+        filename = rng.choice(options)
+        start = time.perf_counter()
+        session.set_trait(category, filename)
+        incremental.append(time.perf_counter() - start)
+
+        traits = session.traits
+        bg_filename, bg_color = session.background
+        start = time.perf_counter()
+        expected = composite_layers(traits.pop('base'), traits, bg_filename=bg_filename,
+                                    bg_color=bg_color, source=source)
+        full.append(time.perf_counter() - start)
+        if session.image.tobytes() != expected.convert('RGBA').tobytes():
+            raise SystemExit(f"Mismatch after setting {category} to {filename}")
+
+    inc_us = statistics.median(incremental) * 1e6
+    full_us = statistics.median(full) * 1e6
+    print(f"  incremental: {inc_us:.0f} µs (median)")
+    print(f"  full composite: {full_us:.0f} µs (median), {full_us / inc_us:.1f}x slower")
+    print("  every incremental render matched the full composite")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark incremental single-trait re-rendering')
+    parser.add_argument('swaps', nargs='?', type=int, default=200)
+    parser.add_argument('--category', choices=['base'] + LAYER_ORDER, default='headwear')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    main(args.swaps, category=args.category, seed=args.seed)
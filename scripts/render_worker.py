@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Long-lived render worker with a framed binary protocol
+Started once, it keeps the decoded layers and the render cache warm and
+renders avatars on request over stdin/stdout or a Unix socket, so callers
+never pay interpreter and PIL startup per render.
+
+Request:  4-byte big-endian length, then a JSON object, either
+          {"traits": {"base": ..., "background": ..., "eyes": ...}, "size": 256}
+          or {"seed": 42, "size": 256}
+Response: 4-byte big-endian length, then a status byte (0 ok, 1 error) and
+          the PNG bytes or a UTF-8 error message
+
+Requests are rendered concurrently and answered in the order they
+arrived, so a client can keep many in flight and match responses to
+requests by position. By default they run on a thread pool; on a regular
+(GIL) build that only overlaps PNG encoding and PIL compositing, so cold
+renders run at a few hundred per second whatever the thread count, and
+only cached renders reach thousands per second. With --processes they
+run on a process pool whose workers attach to one shared copy of the
+decoded layers, so cold renders scale with the cores given to it
+"""
+
+import json
+import os
+import queue
+import random
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from background_engine import is_spec, parse_spec
+from generate_random_punks import (
+    ASSETS_DIR,
+    BACKGROUNDS,
+    LAYER_ORDER,
+    SIZE,
+    load_catalog,
+    pick_traits,
+    render_pngs,
+)
+from layer_store import LayerCache, SharedLayerStore
+from lazy_import import lazy_import
+from multires import check_size
+from render_cache import default_cache
+
+argparse = lazy_import('argparse')
+futures = lazy_import('concurrent.futures')
+
+HEADER = struct.Struct('>I')
+
+OK = 0
+ERROR = 1
+
+# Largest request accepted; anything bigger is a framing error
+MAX_REQUEST = 64 * 1024
+
+# Requests read ahead of the oldest unanswered one
+PIPELINE_DEPTH = 1024
+
+def read_frame(stream, limit=None):
+    """Next frame's payload, or None at a clean end of stream
+
+    Frames longer than limit are rejected from their header, before any of
+    the payload is read.
+    """
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise EOFError('truncated frame header')
+    (length,) = HEADER.unpack(header)
+    if limit is not None and length > limit:
+        raise ValueError(f'frame of {length} bytes is over the {limit} limit')
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise EOFError('truncated frame')
+    return payload
+
+def write_frame(stream, payload):
+    stream.write(HEADER.pack(len(payload)) + payload)
+
+def traits_metadata(traits, source):
+    """Punk metadata for flat traits as server.js stores them, checked against source
+
+    Raises ValueError for unknown categories, trait files or background
+    specs that could not be rendered.
+    """
+    traits = dict(traits)
+    base = traits.pop('base', None)
+    background = traits.pop('background', 'cream')
+    if base not in {trait['filename'] for trait in source.traits('base')}:
+        raise ValueError(f'unknown base: {base}')
+    backgrounds = {trait['filename'] for trait in source.traits('backgrounds')}
+    if background not in backgrounds and background not in BACKGROUNDS:
+        if not is_spec(background):
+            raise ValueError(f'unknown background: {background}')
+        # Checked here so a bad spec fails the request instead of the render
+        parse_spec(background)
+    for category, filename in traits.items():
+        if category not in LAYER_ORDER:
+            raise ValueError(f'unknown trait category: {category}')
+        if filename and filename not in {trait['filename'] for trait in source.traits(category)}:
+            raise ValueError(f'unknown {category}: {filename}')
+    return {'base': base, 'background': background,
+            'traits': {category: filename for category, filename in traits.items() if filename}}
+
+class Renderer:
+    """Turns request payloads into response payloads; safe to call from many threads"""
+
+    def __init__(self, source=None, cache=None):
+        self.source = source if source is not None else LayerCache.load(ASSETS_DIR, load_catalog())
+        self.cache = cache or default_cache()
+
+    def render(self, request):
+        """PNG bytes for a decoded request"""
+        size = int(request.get('size', SIZE))
+        check_size(size)
+        if 'seed' in request:
+            # Picking traits is cheap; the cache is checked before anything is composited
+            metadata = pick_traits(source=self.source, rng=random.Random(request['seed']))
+        else:
+            metadata = traits_metadata(request['traits'], self.source)
+        return render_pngs(metadata, (size,), self.source, self.cache)[size]
+
+    def respond(self, payload):
+        try:
+            return bytes([OK]) + self.render(json.loads(payload))
+        except Exception as e:
+            return bytes([ERROR]) + f'{type(e).__name__}: {e}'.encode()
+
+# Renderer of a pool worker process, built once by _init_process
+_process_renderer = None
+
+def _init_process(store_handle):
+    """Process pool initializer: render from the parent's shared layer store"""
+    global _process_renderer
+    _process_renderer = Renderer(SharedLayerStore.attach(store_handle))
+
+def _respond_in_process(payload):
+    return _process_renderer.respond(payload)
+
+def serve(respond, executor, rfile, wfile):
+    """Answer framed requests from rfile on wfile until the stream ends
+
+    respond turns a request payload into a response payload on executor
+    (a picklable function when that is a process pool). The reading side
+    submits every request as soon as it arrives; a writer
+    thread sends results in arrival order, flushing whenever it catches up.
+    If the writer fails (e.g. the peer stopped reading) the reader stops
+    too, raising ConnectionError, instead of blocking on a full pipeline.
+    """
+    pending = queue.Queue(maxsize=PIPELINE_DEPTH)
+    failure = []
+
+    def write_responses():
+        try:
+            while True:
+                future = pending.get()
+                if future is None:
+                    break
+                write_frame(wfile, future.result())
+                if pending.empty():
+                    wfile.flush()
+            wfile.flush()
+        except Exception as e:
+            failure.append(e)
+
+    def put(item):
+        """Queue item for the writer; False once the writer has stopped"""
+        while writer.is_alive():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    writer = threading.Thread(target=write_responses, daemon=True)
+    writer.start()
+    try:
+        while True:
+            payload = read_frame(rfile, MAX_REQUEST)
+            if payload is None:
+                break
+            if not put(executor.submit(respond, payload)):
+                break
+    finally:
+        put(None)
+        writer.join()
+    if failure:
+        raise ConnectionError(f'writing responses failed: {failure[0]}') from failure[0]
+
+class _Handler(socketserver.StreamRequestHandler):
+    wbufsize = 64 * 1024
+
+    def handle(self):
+        try:
+            serve(self.server.respond, self.server.executor, self.rfile, self.wfile)
+        except (EOFError, ValueError, ConnectionError) as e:
+            print(f"render_worker: dropping connection: {e}", file=sys.stderr)
+
+class RenderClient:
+    """Drives a worker over a pair of byte streams, keeping requests in flight"""
+
+    def __init__(self, wfile, rfile):
+        self.wfile = wfile
+        self.rfile = rfile
+
+    @classmethod
+    def spawn(cls, *args):
+        """Start a worker subprocess talking over its stdin and stdout"""
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__), *args],
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        client = cls(process.stdin, process.stdout)
+        client.process = process
+        return client
+
+    def render_many(self, requests):
+        """Send every request while reading responses; yields (ok, body) in order"""
+        requests = list(requests)
+
+        def send():
+            for request in requests:
+                write_frame(self.wfile, json.dumps(request).encode())
+            self.wfile.flush()
+
+        sender = threading.Thread(target=send, daemon=True)
+        sender.start()
+        for _ in requests:
+            payload = read_frame(self.rfile)
+            if payload is None:
+                raise EOFError('worker closed the stream')
+            yield payload[0] == OK, payload[1:]
+        sender.join()
+
+    def close(self):
+        self.wfile.close()
+        if hasattr(self, 'process'):
+            self.process.wait()
+
+def bench(count, threads, processes=None):
+    """Pipeline count seed renders through a worker subprocess, cold then cached"""
+    if processes:
+        print(f"Worker on {processes} processes")
+        client = RenderClient.spawn('--processes', str(processes))
+    else:
+        print(f"Worker on {threads} threads")
+        client = RenderClient.spawn('--threads', str(threads))
+    first = random.getrandbits(32)
+    requests = [{'seed': first + i} for i in range(count)]
+    for label in ('cold', 'cached'):
+        start = time.perf_counter()
+        errors = sum(not ok for ok, _ in client.render_many(requests))
+        elapsed = time.perf_counter() - start
+        print(f"  {label}: {count} renders in {elapsed:.2f}s ({count / elapsed:.0f}/s), {errors} errors")
+    client.close()
+
+def main(socket_path=None, threads=None, processes=None):
+    store = None
+    if processes:
+        store = SharedLayerStore.create(ASSETS_DIR, load_catalog())
+        executor = futures.ProcessPoolExecutor(processes, initializer=_init_process,
+                                               initargs=(store.handle,))
+        respond = _respond_in_process
+    else:
+        executor = futures.ThreadPoolExecutor(threads or os.cpu_count())
+        respond = Renderer().respond
+    try:
+        if socket_path is None:
+            # stdout carries frames only, so anything printed must go elsewhere
+            sys.stdout = sys.stderr
+            serve(respond, executor, sys.stdin.buffer, sys.__stdout__.buffer)
+            return
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        with socketserver.ThreadingUnixStreamServer(socket_path, _Handler) as server:
+            server.respond = respond
+            server.executor = executor
+            print(f"Render worker listening on {socket_path}", file=sys.stderr)
+            server.serve_forever()
+    finally:
+        executor.shutdown()
+        if store:
+            store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Render avatars for framed requests on stdin or a Unix socket')
+    parser.add_argument('--socket', metavar='PATH', default=None,
+                        help='listen on a Unix socket instead of stdin/stdout')
+    parser.add_argument('--threads', type=int, default=None, help='render threads (default: CPU count)')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='render on this many processes instead of threads (scales cold renders on GIL builds)')
+    parser.add_argument('--bench', type=int, metavar='N', default=None,
+                        help='benchmark N pipelined renders through a worker subprocess')
+    args = parser.parse_args()
+    if args.bench:
+        bench(args.bench, args.threads or os.cpu_count(), args.processes)
+    else:
+        main(args.socket, args.threads, args.processes)
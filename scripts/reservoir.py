@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Pre-rendered avatar reservoir for minting
+A long-running process keeps a spool directory topped up with ready
+avatars, each a PNG plus a JSON entry with its traits and fingerprint, so
+minting only has to claim one instead of compositing it. Every avatar is
+checked against the fingerprints of all the avatars ever spooled.
+
+Layout: ready/<id>.png is written first and ready/<id>.json last, so an
+entry only exists once both files are complete. A consumer claims an entry
+by renaming its JSON into claimed/; the rename succeeds for exactly one of
+several competing consumers (server.js and Reservoir.pop do the same)
+"""
+
+from contextlib import suppress
+import io
+import json
+import os
+import time
+import uuid
+
+from fingerprint import FingerprintSet
+from generate_random_punks import ASSETS_DIR, OUTPUT_DIR, generate_unique_punk, load_catalog
+from layer_store import LayerCache
+from lazy_import import lazy_import
+
+argparse = lazy_import('argparse')
+
+RESERVOIR_DIR = os.environ.get('RESERVOIR_DIR', os.path.join(OUTPUT_DIR, 'reservoir'))
+
+CAPACITY = 500
+
+# Seconds between checks of the reservoir level
+POLL_INTERVAL = 0.5
+
+# Partial writes and claims older than this are left over from a crash
+STALE_AFTER = 60
+
+# Seconds between saves of the seen fingerprints while filling
+SAVE_INTERVAL = 5
+
+def write_atomic(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def mint_traits(metadata):
+    """Traits in the flat shape server.js stores: background and base beside the layers"""
+    return {'background': metadata['background'], 'base': metadata['base'], **metadata['traits']}
+
+class Reservoir:
+    """A spool directory of ready-to-mint avatars"""
+
+    def __init__(self, root=RESERVOIR_DIR):
+        self.root = root
+        self.ready_dir = os.path.join(root, 'ready')
+        self.claimed_dir = os.path.join(root, 'claimed')
+        self.seen_path = os.path.join(root, 'seen.npy')
+        os.makedirs(self.ready_dir, exist_ok=True)
+        os.makedirs(self.claimed_dir, exist_ok=True)
+        # IDs listed from ready/, re-read once used up (as server.js does)
+        self._queue = []
+
+    def entries(self):
+        """IDs of the avatars ready to claim"""
+        return [name[:-5] for name in os.listdir(self.ready_dir) if name.endswith('.json')]
+
+    def __len__(self):
+        return len(self.entries())
+
+    def put(self, png, traits, fingerprint):
+        """Spool one rendered avatar"""
+        avatar_id = uuid.uuid4().hex
+        write_atomic(os.path.join(self.ready_dir, f'{avatar_id}.png'), png)
+        entry = {'traits': traits, 'fingerprint': fingerprint}
+        write_atomic(os.path.join(self.ready_dir, f'{avatar_id}.json'), json.dumps(entry).encode())
+        return avatar_id
+
+    def pop(self):
+        """Claim a ready avatar as (png bytes, entry), or None if the reservoir is empty
+
+        The directory is listed only when the IDs from the last listing are
+        used up, so a pop does not cost a listdir of the whole reservoir.
+        """
+        if not self._queue:
+            self._queue = self.entries()
+        while self._queue:
+            avatar_id = self._queue.pop()
+            claimed = os.path.join(self.claimed_dir, f'{avatar_id}.json')
+            try:
+                os.rename(os.path.join(self.ready_dir, f'{avatar_id}.json'), claimed)
+            except FileNotFoundError:
+                # Another consumer claimed it first
+                continue
+            png_path = os.path.join(self.ready_dir, f'{avatar_id}.png')
+            try:
+                with open(claimed) as f:
+                    entry = json.load(f)
+                with open(png_path, 'rb') as f:
+                    return f.read(), entry
+            finally:
+                # Suppressed so a missing file does not hide why the read failed
+                with suppress(FileNotFoundError):
+                    os.remove(claimed)
+                with suppress(FileNotFoundError):
+                    os.remove(png_path)
+        return None
+
+    def sweep(self, max_age=STALE_AFTER):
+        """Remove files left behind by producers or consumers that died mid-write"""
+        now = time.time()
+        ready = set(self.entries())
+        for directory in (self.ready_dir, self.claimed_dir):
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                orphan = directory == self.claimed_dir or name.endswith('.tmp') or \
+                    (name.endswith('.png') and name[:-4] not in ready)
+                if orphan and now - os.path.getmtime(path) > max_age:
+                    os.remove(path)
+
+    def fill(self, capacity, source, seen, save_interval=SAVE_INTERVAL):
+        """Render avatars until capacity are ready; returns how many were added
+
+        The seen fingerprints are saved every save_interval seconds and when
+        the fill ends, even by an exception, so an interrupted fill keeps
+        the fingerprints of what it spooled.
+        """
+        added = saved = 0
+        last_save = time.monotonic()
+        try:
+            for _ in range(capacity - len(self)):
+                punk_img, metadata = generate_unique_punk(seen, source=source)
+                buf = io.BytesIO()
+                punk_img.save(buf, format='PNG')
+                self.put(buf.getvalue(), mint_traits(metadata), metadata['fingerprint'])
+                added += 1
+                if time.monotonic() - last_save >= save_interval:
+                    seen.save(self.seen_path)
+                    saved, last_save = added, time.monotonic()
+        finally:
+            if added > saved:
+                seen.save(self.seen_path)
+        return added
+
+def main(capacity=CAPACITY, root=RESERVOIR_DIR, once=False, interval=POLL_INTERVAL):
+    reservoir = Reservoir(root)
+    source = LayerCache.load(ASSETS_DIR, load_catalog())
+    seen = FingerprintSet.load(reservoir.seen_path)
+    print(f"Keeping {capacity} avatars ready in {root} ({len(seen)} fingerprints seen)")
+    while True:
+        reservoir.sweep()
+        start = time.perf_counter()
+        added = reservoir.fill(capacity, source, seen)
+        if added:
+            elapsed = time.perf_counter() - start
+            print(f"  + {added} avatars in {elapsed:.2f}s ({added / elapsed:.0f}/s)")
+        if once:
+            break
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Keep a spool of pre-rendered avatars for minting')
+    parser.add_argument('--capacity', type=int, default=CAPACITY,
+                        help='number of avatars to keep ready')
+    parser.add_argument('--dir', default=RESERVOIR_DIR, help='spool directory (or set RESERVOIR_DIR)')
+    parser.add_argument('--once', action='store_true', help='fill the reservoir once and exit')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help='seconds between refills')
+    args = parser.parse_args()
+    main(args.capacity, root=args.dir, once=args.once, interval=args.interval)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+In-memory trait sprite registry
+Maps every trait to the generator function and arguments that draw it and
+renders sprites lazily on first use, so punks can be composited straight
+from generator code without writing or reading any PNG files
+"""
+
+import importlib
+import os
+
+from build_assets import GENERATORS
+from coverage import cell_masks
+from layer_store import OPAQUE_CATEGORIES, LayerCache
+from rasterizer import Grid
+
+# Same weights as generate_random_punks.RARITY_WEIGHTS
+RARITY_WEIGHTS = {
+    'common': 60,
+    'uncommon': 25,
+    'rare': 12,
+    'legendary': 3,
+}
+
+def trait_info(filename):
+    """Trait dict for a filename, same shape as get_traits() entries"""
+    parts = filename.replace('.png', '').split('_')
+    rarity = parts[-1] if parts[-1] in RARITY_WEIGHTS else 'common'
+    return {
+        'filename': filename,
+        'rarity': rarity,
+        'weight': RARITY_WEIGHTS.get(rarity, 60),
+    }
+
+def trait_key(filename):
+    """Filename without extension or rarity suffix, e.g. 'hair_mohawk_black'"""
+    stem = filename.replace('.png', '')
+    head, _, rarity = stem.rpartition('_')
+    return head if head and rarity in RARITY_WEIGHTS else stem
+
+class SpriteRegistry:
+    """Layer source that draws traits from generator code on demand
+
+    Implements the same traits()/sprite() interface as LayerCache, so it can
+    be passed anywhere a layer source is accepted. Sprites are rendered the
+    first time they are asked for and then kept; two threads racing on the
+    same sprite both render it and one result wins, which is harmless.
+    """
+
+    def __init__(self, generators=GENERATORS):
+        self._jobs = {}
+        self._catalog = {}
+        self._sprites = {}
+        self._masks = {}
+        for module_name in generators:
+            module = importlib.import_module(module_name)
+            category = os.path.basename(module.OUTPUT_DIR)
+            for filename, func, args in module.jobs():
+                self._jobs[(category, filename)] = (func, args)
+                self._catalog.setdefault(category, []).append(trait_info(filename))
+        for traits in self._catalog.values():
+            traits.sort(key=lambda t: t['filename'])
+
+    @property
+    def nbytes(self):
+        return sum(img.width * img.height * 4 for img, _ in self._sprites.values() if img is not None)
+
+    def traits(self, category):
+        """Traits in a category, same shape as get_traits()"""
+        return self._catalog.get(category, [])
+
+    def find(self, category, name, color=None):
+        """Filename of a trait by name and optional color, e.g. ('hair', 'mohawk', 'black')"""
+        key = f'{name}_{color}' if color else name
+        for trait in self.traits(category):
+            stem = trait_key(trait['filename'])
+            if stem == key or stem.endswith(f'_{key}'):
+                return trait['filename']
+        raise KeyError(f'no {category} trait named {key!r}')
+
+    def draw(self, category, filename):
+        """Run a trait's draw function (a Grid for traits, an image for backgrounds)"""
+        func, args = self._jobs[(category, filename)]
+        return func(*args)
+
+    def render(self, category, filename):
+        """Render a trait to a full 256x256 RGBA image"""
+        img = self.draw(category, filename)
+        if isinstance(img, Grid):
+            return img.to_image()
+        return img.convert('RGBA')
+
+    def sprite(self, category, filename):
+        """Return (image, (x, y)) for a layer, or None if it has no pixels
+
+        The image is shared; callers must only read from it.
+        """
+        key = (category, filename)
+        if key not in self._sprites:
+            if key not in self._jobs:
+                return None
+            img = self.render(category, filename)
+            if category in OPAQUE_CATEGORIES:
+                self._sprites[key] = (img, (0, 0))
+            else:
+                bbox = img.getbbox()
+                self._sprites[key] = (img.crop(bbox), bbox[:2]) if bbox else (None, None)
+        img, origin = self._sprites[key]
+        return (img, origin) if img is not None else None
+
+    def masks(self, category, filename):
+        """(visible, opaque) coverage bitmasks of a layer, measured on first use; (0, 0) if empty"""
+        key = (category, filename)
+        if key not in self._masks:
+            layer = self.sprite(category, filename)
+            self._masks[key] = cell_masks(*layer) if layer else (0, 0)
+        return self._masks[key]
+
+    def snapshot(self):
+        """Render every sprite now and return them as an immutable LayerCache
+
+        Use this instead of sharing the registry between threads, whose
+        sprite dict is filled on demand.
+        """
+        sprites = {}
+        for category, filename in self._jobs:
+            layer = self.sprite(category, filename)
+            if layer is not None:
+                sprites[(category, filename)] = layer
+        return LayerCache(self._catalog, sprites)
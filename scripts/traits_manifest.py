@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Precompiled trait manifest for the API layer
+One versioned JSON file lists every trait with its category, display name,
+rarity, weight, rarity score, bounding box on the canvas, content hash and
+image URL, so server.js can list traits and score avatars without touching
+the asset directories or parsing filenames per request
+"""
+
+import hashlib
+import io
+import json
+import os
+
+from generate_random_punks import ASSETS_DIR, RARITY_WEIGHTS
+from lazy_import import lazy_import
+from render_cache import bundle_version
+
+argparse = lazy_import('argparse')
+Image = lazy_import('PIL.Image')
+
+MANIFEST_PATH = os.path.join(ASSETS_DIR, 'traits_manifest.json')
+MANIFEST_VERSION = 1
+
+# Categories served by /api/traits, in its order
+CATEGORIES = ['backgrounds', 'base', 'eyes', 'mouth', 'hair', 'eyewear', 'headwear', 'accessories']
+
+# Score per trait for display (higher = rarer), as server.js calculateRarityScore
+RARITY_SCORES = {
+    'common': 1,
+    'uncommon': 3,
+    'rare': 8,
+    'legendary': 25,
+}
+
+# Rarest first, as /api/traits lists them
+RARITY_ORDER = ['legendary', 'rare', 'uncommon', 'common']
+
+def display_name(category, filename):
+    """Human-readable trait name, derived the way /api/traits always has"""
+    parts = filename.removesuffix('.png').split('_')
+    name = ' '.join(parts[:-1]).replace(category + ' ', '', 1)
+    return name or filename.removesuffix('.png')
+
+def trait_entry(category, filename, data):
+    """Manifest entry for one trait PNG given its bytes"""
+    parts = filename.removesuffix('.png').split('_')
+    rarity = parts[-1] if parts[-1] in RARITY_WEIGHTS else 'common'
+    with Image.open(io.BytesIO(data)) as img:
+        bbox = img.convert('RGBA').getbbox()
+    return {
+        'filename': filename,
+        'category': category,
+        'name': display_name(category, filename),
+        'rarity': rarity,
+        'weight': RARITY_WEIGHTS[rarity],
+        'rarity_score': RARITY_SCORES[rarity],
+        'bbox': list(bbox) if bbox else None,
+        'hash': hashlib.sha256(data).hexdigest()[:16],
+        'image_url': f'/assets/{category}/{filename}',
+    }
+
+def build_manifest(assets_dir=ASSETS_DIR, categories=CATEGORIES):
+    """The manifest dict for every trait PNG under assets_dir"""
+    traits = {}
+    for category in categories:
+        category_dir = os.path.join(assets_dir, category)
+        if not os.path.isdir(category_dir):
+            continue
+        entries = []
+        for filename in os.listdir(category_dir):
+            if not filename.endswith('.png'):
+                continue
+            with open(os.path.join(category_dir, filename), 'rb') as f:
+                entries.append(trait_entry(category, filename, f.read()))
+        entries.sort(key=lambda e: (RARITY_ORDER.index(e['rarity']), e['filename']))
+        traits[category] = entries
+    return {
+        'version': MANIFEST_VERSION,
+        'bundle': bundle_version(assets_dir),
+        'rarity_scores': RARITY_SCORES,
+        'traits': traits,
+    }
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest atomically, so a server reloading it never sees half a file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+def main(path=MANIFEST_PATH):
+    print("Building traits manifest...")
+    manifest = build_manifest()
+    save_manifest(manifest, path)
+    for category, entries in manifest['traits'].items():
+        print(f"  {category}: {len(entries)} traits")
+    print(f"\nDone! Manifest for bundle {manifest['bundle']} saved to {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Write the precompiled traits manifest for the API')
+    parser.add_argument('--out', default=MANIFEST_PATH, help='manifest path')
+    args = parser.parse_args()
+    main(args.out)
@@ -12,6 +12,8 @@ const { Pool } = pg;
 const __dirname = path.dirname(fileURLToPath(import.meta.url));
 const ASSETS_DIR = path.join(__dirname, 'assets', 'faces');
 const GENERATED_DIR = path.join(__dirname, 'generated');
+// Spool kept full of pre-rendered avatars by scripts/reservoir.py
+const RESERVOIR_DIR = process.env.RESERVOIR_DIR || path.join(GENERATED_DIR, 'reservoir');
 const BASE_URL = process.env.BASE_URL || 'https://avatars.unabotter.xyz';
 
 // Ensure directories exist
@@ -70,12 +72,88 @@ async function initDB() {
       ALTER TABLE avatars ADD COLUMN IF NOT EXISTS image_data TEXT
     `).catch(() => {});
     
+    // Rendered-pixel fingerprint for visual duplicate checks (migration)
+    await client.query(`
+      ALTER TABLE avatars ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(16)
+    `).catch(() => {});
+    // Set once the backfill has dealt with a row that has no fingerprint
+    // (a known duplicate or an image that cannot be decoded), so it is skipped
+    await client.query(`
+      ALTER TABLE avatars ADD COLUMN IF NOT EXISTS fingerprint_checked BOOLEAN NOT NULL DEFAULT FALSE
+    `).catch(() => {});
+    // Unique, so the database rejects a second avatar that looks the same; rows
+    // with no fingerprint (NULL) never conflict. Earlier duplicates keep theirs
+    // only on the oldest row.
+    await client.query(`DROP INDEX IF EXISTS avatars_fingerprint_idx`).catch(() => {});
+    await client.query(`
+      UPDATE avatars a SET fingerprint = NULL, fingerprint_checked = TRUE
+      WHERE fingerprint IS NOT NULL AND EXISTS (
+        SELECT 1 FROM avatars b WHERE b.fingerprint = a.fingerprint
+          AND (b.created_at, b.id) < (a.created_at, a.id)
+      )
+    `).catch(() => {});
+    await client.query(`
+      CREATE UNIQUE INDEX IF NOT EXISTS avatars_fingerprint_key ON avatars (fingerprint)
+    `).catch(err => console.error('Failed to create fingerprint index:', err.message));
+    
     console.log('Database initialized');
   } finally {
     client.release();
   }
 }
 
+// Rows fetched per backfill query, so image_data is never all in memory
+const BACKFILL_BATCH = 100;
+
+// Fingerprint avatars stored before fingerprints existed, so new mints are deduped
+// against them too. Runs in the background after startup. A row that looks like one
+// already fingerprinted, or whose image cannot be decoded, stays NULL and is marked
+// checked; a row that hits any other error is left for the next startup.
+async function backfillFingerprints() {
+  const markChecked = id => pool.query('UPDATE avatars SET fingerprint_checked = TRUE WHERE id = $1', [id]);
+  let filled = 0;
+  let skipped = 0;
+  // Oldest first, so of several rows that look alike the oldest keeps the fingerprint.
+  // The cursor's created_at stays text: a JS Date would drop the microseconds.
+  let after = null;
+  for (;;) {
+    const { rows } = await pool.query(
+      `SELECT id, created_at::text AS created, image_data FROM avatars
+       WHERE fingerprint IS NULL AND NOT fingerprint_checked AND image_data IS NOT NULL
+         AND ($1::timestamp IS NULL OR (created_at, id) > ($1::timestamp, $2::uuid))
+       ORDER BY created_at, id LIMIT ${BACKFILL_BATCH}`,
+      after ? [after.created, after.id] : [null, null]
+    );
+    if (!rows.length) break;
+    after = rows[rows.length - 1];
+    for (const row of rows) {
+      let fp;
+      try {
+        fp = await fingerprint(Buffer.from(row.image_data, 'base64'));
+      } catch (err) {
+        console.error(`Cannot fingerprint avatar ${row.id}:`, err.message);
+        await markChecked(row.id);
+        skipped++;
+        continue;
+      }
+      try {
+        await pool.query('UPDATE avatars SET fingerprint = $1, fingerprint_checked = TRUE WHERE id = $2', [fp, row.id]);
+        filled++;
+      } catch (err) {
+        if (err.code !== UNIQUE_VIOLATION) {
+          console.error(`Failed to fingerprint avatar ${row.id}:`, err.message);
+          continue;
+        }
+        await markChecked(row.id);
+        skipped++;
+      }
+    }
+  }
+  if (filled || skipped) {
+    console.log(`Fingerprinted ${filled} existing avatars (${skipped} duplicates or undecodable)`);
+  }
+}
+
 const app = express();
 app.use(express.json());
 
@@ -174,10 +252,79 @@ const RARITY_WEIGHTS = { common: 60, uncommon: 25, rare: 12, legendary: 3 };
 // Rarity scores (for display - higher = rarer)
 const RARITY_SCORES = { common: 1, uncommon: 3, rare: 8, legendary: 25 };
 
+// Sprite-sheet atlas index built by scripts/atlas.py, keyed by category then filename.
+// Loaded once and reloaded when the file changes; null when there is no atlas.
+const ATLAS_INDEX = path.join(ASSETS_DIR, 'atlas.json');
+let atlasSprites = null;
+
+function loadAtlas() {
+  try {
+    const index = JSON.parse(fs.readFileSync(ATLAS_INDEX, 'utf8'));
+    const sprites = {};
+    for (const [category, entries] of Object.entries(index.sprites || {})) {
+      sprites[category] = {};
+      for (const entry of entries) {
+        if (entry.rect) sprites[category][entry.filename] = entry;
+      }
+    }
+    atlasSprites = { imageUrl: `/assets/${index.image}`, sprites };
+  } catch (err) {
+    if (err.code !== 'ENOENT') console.error('Failed to read atlas index:', err.message);
+    atlasSprites = null;
+  }
+}
+
+loadAtlas();
+fs.watchFile(ATLAS_INDEX, { interval: 5000 }, () => {
+  loadAtlas();
+  // The prebuilt /api/traits body embeds atlas rects
+  if (traitsManifest) loadTraitsManifest();
+});
+
+// Precompiled by scripts/traits_manifest.py; reloaded when the file changes.
+// null when there is no manifest, in which case traits come from the asset directories.
+const TRAITS_MANIFEST = path.join(ASSETS_DIR, 'traits_manifest.json');
+let traitsManifest = null;
+
+function loadTraitsManifest() {
+  try {
+    const manifest = JSON.parse(fs.readFileSync(TRAITS_MANIFEST, 'utf8'));
+    if (manifest.version !== 1) throw new Error(`unsupported version ${manifest.version}`);
+    const scores = {};
+    const response = {};
+    const atlas = atlasSprites;
+    for (const [category, traits] of Object.entries(manifest.traits)) {
+      scores[category] = new Map(traits.map(trait => [trait.filename, trait.rarity_score]));
+      // /api/traits body, built once per manifest instead of once per request
+      response[category] = traits.map(trait => {
+        const sprite = atlas?.sprites[category]?.[trait.filename];
+        if (!sprite) return trait;
+        return { ...trait, atlas: { image_url: atlas.imageUrl, rect: sprite.rect, offset: sprite.offset } };
+      });
+    }
+    traitsManifest = { traits: manifest.traits, scores, response };
+    console.log(`Traits manifest loaded (bundle ${manifest.bundle})`);
+  } catch (err) {
+    if (err.code !== 'ENOENT') console.error('Failed to read traits manifest:', err.message);
+    traitsManifest = null;
+  }
+}
+
+loadTraitsManifest();
+fs.watchFile(TRAITS_MANIFEST, { interval: 5000 }, loadTraitsManifest);
+
+// Avatar trait keys that differ from their manifest category
+const MANIFEST_CATEGORIES = { background: 'backgrounds' };
+
 function calculateRarityScore(traits) {
   let score = 0;
   for (const [category, filename] of Object.entries(traits)) {
     if (!filename) continue;
+    const known = traitsManifest?.scores[MANIFEST_CATEGORIES[category] || category]?.get(filename);
+    if (known !== undefined) {
+      score += known;
+      continue;
+    }
     const parts = filename.replace('.png', '').split('_');
     const rarity = ['common', 'uncommon', 'rare', 'legendary'].includes(parts[parts.length - 1]) 
       ? parts[parts.length - 1] 
@@ -188,6 +335,7 @@ function calculateRarityScore(traits) {
 }
 
 function getTraits(category) {
+  if (traitsManifest?.traits[category]) return traitsManifest.traits[category];
   const dir = path.join(ASSETS_DIR, category);
   if (!fs.existsSync(dir)) return [];
   return fs.readdirSync(dir)
@@ -211,7 +359,27 @@ function weightedChoice(traits, noneChance = 0) {
   return traits[traits.length - 1];
 }
 
-async function generateAvatar() {
+// Same as scripts/fingerprint.py: first 8 bytes of SHA-256 over the RGBA
+// pixel at the corner of every 10px block
+const FINGERPRINT_BLOCK = 10;
+const MAX_REROLLS = 100;
+
+// PostgreSQL error code for a unique index violation
+const UNIQUE_VIOLATION = '23505';
+
+async function fingerprint(imageBuffer) {
+  const { data, info } = await sharp(imageBuffer).ensureAlpha().raw().toBuffer({ resolveWithObject: true });
+  const cells = [];
+  for (let y = 0; y < info.height; y += FINGERPRINT_BLOCK) {
+    for (let x = 0; x < info.width; x += FINGERPRINT_BLOCK) {
+      const offset = (y * info.width + x) * 4;
+      cells.push(data.subarray(offset, offset + 4));
+    }
+  }
+  return crypto.createHash('sha256').update(Buffer.concat(cells)).digest('hex').slice(0, 16);
+}
+
+async function renderAvatar() {
   const traits = {
     background: weightedChoice(getTraits('backgrounds'))?.filename || 'solid_cream_common.png',
     base: weightedChoice(getTraits('base'))?.filename,
@@ -238,24 +406,100 @@ async function generateAvatar() {
   
   if (layers.length > 0) composite = composite.composite(layers);
   
-  const avatarId = uuidv4();
-  const filename = `avatar_${avatarId}.png`;
-  
-  // Generate image buffer and base64
   const imageBuffer = await composite.png().toBuffer();
-  const imageBase64 = imageBuffer.toString('base64');
-  
-  // Also save to disk (for local dev)
-  await composite.png().toFile(path.join(GENERATED_DIR, filename)).catch(() => {});
-  
   return {
-    id: avatarId,
-    filename,
-    image_data: imageBase64,
+    imageBuffer,
     traits: Object.fromEntries(Object.entries(traits).filter(([_, v]) => v != null))
   };
 }
 
+// Entry IDs listed from the reservoir, re-read once used up
+let reservoirQueue = [];
+
+// Claim a pre-rendered avatar; null when the reservoir is empty or not running.
+// Renaming the entry into claimed/ succeeds for exactly one claimant.
+async function popReservoir() {
+  const readyDir = path.join(RESERVOIR_DIR, 'ready');
+  if (!reservoirQueue.length) {
+    const names = await fs.promises.readdir(readyDir).catch(() => []);
+    reservoirQueue = names.filter(name => name.endsWith('.json')).map(name => name.slice(0, -5));
+  }
+  while (reservoirQueue.length) {
+    const id = reservoirQueue.pop();
+    const claimed = path.join(RESERVOIR_DIR, 'claimed', `${id}.json`);
+    const pngPath = path.join(readyDir, `${id}.png`);
+    try {
+      await fs.promises.rename(path.join(readyDir, `${id}.json`), claimed);
+    } catch {
+      continue;
+    }
+    try {
+      const entry = JSON.parse(await fs.promises.readFile(claimed, 'utf8'));
+      const imageBuffer = await fs.promises.readFile(pngPath);
+      return { imageBuffer, traits: entry.traits, fingerprint: entry.fingerprint };
+    } catch {
+      continue;
+    } finally {
+      await fs.promises.rm(claimed, { force: true });
+      await fs.promises.rm(pngPath, { force: true });
+    }
+  }
+  return null;
+}
+
+// Take a ready avatar from the reservoir if there is one, else render one now
+async function nextAvatar() {
+  const ready = await popReservoir();
+  if (ready) return ready;
+  const { imageBuffer, traits } = await renderAvatar();
+  return { imageBuffer, traits, fingerprint: await fingerprint(imageBuffer) };
+}
+
+// Render avatars until one does not look exactly like an existing one
+// (different traits can render the same, e.g. when headwear hides the hair)
+async function generateAvatar() {
+  for (let attempt = 0; attempt < MAX_REROLLS; attempt++) {
+    const { imageBuffer, traits, fingerprint: fp } = await nextAvatar();
+    const duplicate = await pool.query('SELECT 1 FROM avatars WHERE fingerprint = $1 LIMIT 1', [fp]);
+    if (duplicate.rows.length > 0) continue;
+    
+    const avatarId = uuidv4();
+    const filename = `avatar_${avatarId}.png`;
+    
+    // Also save to disk (for local dev)
+    await fs.promises.writeFile(path.join(GENERATED_DIR, filename), imageBuffer).catch(() => {});
+    
+    return {
+      id: avatarId,
+      filename,
+      image_data: imageBuffer.toString('base64'),
+      fingerprint: fp,
+      traits
+    };
+  }
+  throw new Error(`No visually unique avatar after ${MAX_REROLLS} attempts`);
+}
+
+// Generate an avatar and store it for agent. The SELECT in generateAvatar skips
+// most duplicates early; the unique fingerprint index settles races between
+// concurrent mints, and the loser renders again.
+async function mintAvatar(agent) {
+  for (let attempt = 0; attempt < MAX_REROLLS; attempt++) {
+    const avatar = await generateAvatar();
+    try {
+      await pool.query(
+        `INSERT INTO avatars (id, agent_id, agent_name, filename, traits, image_data, fingerprint) VALUES ($1, $2, $3, $4, $5, $6, $7)`,
+        [avatar.id, agent.id, agent.name, avatar.filename, avatar.traits, avatar.image_data, avatar.fingerprint]
+      );
+      return avatar;
+    } catch (err) {
+      if (err.code !== UNIQUE_VIOLATION || err.constraint !== 'avatars_fingerprint_key') throw err;
+      await fs.promises.rm(path.join(GENERATED_DIR, avatar.filename), { force: true });
+    }
+  }
+  throw new Error(`No visually unique avatar after ${MAX_REROLLS} attempts`);
+}
+
 // === API ROUTES ===
 
 app.get('/', (req, res) => {
@@ -500,11 +744,7 @@ app.post('/api/claim/:token/mint', async (req, res) => {
     }
     
     // Generate and save avatar
-    const avatar = await generateAvatar();
-    await pool.query(
-      `INSERT INTO avatars (id, agent_id, agent_name, filename, traits, image_data) VALUES ($1, $2, $3, $4, $5, $6)`,
-      [avatar.id, agent.id, agent.name, avatar.filename, avatar.traits, avatar.image_data]
-    );
+    const avatar = await mintAvatar(agent);
     
     res.json({
       success: true,
@@ -550,13 +790,8 @@ app.post('/api/mint', authMiddleware, async (req, res) => {
       });
     }
     
-    // Generate avatar
-    const avatar = await generateAvatar();
-    
-    await pool.query(
-      `INSERT INTO avatars (id, agent_id, agent_name, filename, traits, image_data) VALUES ($1, $2, $3, $4, $5, $6)`,
-      [avatar.id, agent.id, agent.name, avatar.filename, avatar.traits, avatar.image_data]
-    );
+    // Generate and save avatar
+    const avatar = await mintAvatar(agent);
     
     res.json({
       success: true,
@@ -622,8 +857,11 @@ app.use('/assets', express.static(ASSETS_DIR));
 
 // List all traits with images
 app.get('/api/traits', (req, res) => {
+  if (traitsManifest) return res.json(traitsManifest.response);
+  
   const categories = ['backgrounds', 'base', 'eyes', 'mouth', 'hair', 'eyewear', 'headwear', 'accessories'];
   const traits = {};
+  const atlas = atlasSprites;
   
   for (const category of categories) {
     const dir = path.join(ASSETS_DIR, category);
@@ -638,12 +876,18 @@ app.get('/api/traits', (req, res) => {
           ? rarityPart 
           : 'common';
         const name = parts.slice(0, -1).join(' ').replace(category + ' ', '');
-        return {
+        const trait = {
           filename,
           name: name || filename.replace('.png', ''),
           rarity,
           image_url: `/assets/${category}/${filename}`
         };
+        // Where the trait sits in the atlas, so clients can fetch one image
+        const sprite = atlas?.sprites[category]?.[filename];
+        if (sprite) {
+          trait.atlas = { image_url: atlas.imageUrl, rect: sprite.rect, offset: sprite.offset };
+        }
+        return trait;
       })
       .sort((a, b) => {
         const order = { legendary: 0, rare: 1, uncommon: 2, common: 3 };
@@ -725,6 +969,7 @@ const PORT = process.env.PORT || 3000;
 initDB().then(() => {
   app.listen(PORT, () => {
     console.log(`Agent Avatars API running on port ${PORT}`);
+    backfillFingerprints().catch(err => console.error('Fingerprint backfill stopped:', err.message));
   });
 }).catch(err => {
   console.error('Failed to initialize database:', err);